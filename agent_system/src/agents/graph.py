@@ -1,9 +1,10 @@
 """LangGraph StateGraph definition and configuration - Fixed END handling."""
 
 import os
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Optional
 from langgraph.graph import StateGraph, END
 
+from src.config import settings
 from src.schemas.state import GraphState
 from src.agents.nodes import (
     search_top_posts,
@@ -13,14 +14,32 @@ from src.agents.nodes import (
     evaluate_seo,
     react_agent,
 )
-from langgraph.checkpoint.memory import MemorySaver
 from src.agents.nodes.react_agent import decide_next_action
 from src.memory.checkpointer import get_memory_saver
+from src.memory.raw_html_store import get_raw_html_store
 from src.utils.logger import get_logger
+from src.utils.run_context import current_run, run_scope
 
 logger = get_logger(__name__)
 
 
+# Times a failed node is retried from the last checkpoint before the run fails;
+# LLM nodes get fewer retries than the cheap local ones
+NODE_RETRY_LIMITS: Dict[str, int] = {
+    "search": 2,
+    "scrape": 1,
+    "clean": 2,
+    "generate": 1,
+    "evaluate": 2,
+}
+DEFAULT_NODE_RETRY_LIMIT = 1
+
+# Steps reported as node events when a run is streamed
+STREAMED_NODES = ("search", "scrape", "clean", "generate", "evaluate")
+
+EventCallback = Callable[[str, Dict[str, Any]], None]
+
+
 def check_search_results(state: GraphState) -> str:
     """Check if search found results or failed."""
     if getattr(state, "search_failed", False) or not getattr(state, "top_posts", []):
@@ -96,8 +115,8 @@ class BlogGenerationGraph:
         # Get memory saver
         memory_saver = await get_memory_saver()
 
-        # Compile the workflow
-        self.app = self.workflow.compile(checkpointer=MemorySaver())
+        # Compile the workflow with the bounded, TTL-evicting checkpointer
+        self.app = self.workflow.compile(checkpointer=memory_saver)
 
         # # NEW – compile **without** any check-pointer
         # self.app = self.workflow.compile()
@@ -111,8 +130,21 @@ class BlogGenerationGraph:
         max_attempts: int = 3,
         seo_threshold: float = 75.0,
         thread_id: str = "default",
+        resume: bool = False,
+        checkpoint_id: Optional[str] = None,
+        time_budget: Optional[float] = None,
+        on_event: Optional[EventCallback] = None,
     ) -> Dict[str, Any]:
-        """Run the complete blog generation workflow."""
+        """Run the complete blog generation workflow.
+
+        With ``resume`` the run continues from the thread's checkpoint (or
+        from ``checkpoint_id``) instead of starting from a fresh state.
+        ``time_budget`` (default ``RUN_TIME_BUDGET`` seconds) sets the run's
+        deadline; LLM calls do not retry past it. With ``on_event`` the run
+        is streamed: it is called with ("node", {"node", "status"}) when a
+        step starts or completes and with ("token", {"text", "attempt"})
+        for every chunk of a blog draft.
+        """
         if not self.app:
             await self.compile_app()
 
@@ -129,6 +161,9 @@ class BlogGenerationGraph:
             "recursion_limit": 15,
             "max_concurrency": 4,
         }
+        if checkpoint_id:
+            config["configurable"]["checkpoint_id"] = checkpoint_id
+        graph_input = None if resume else initial_state
 
         ### skipping the meory saver for now ( To be changes very important)
 
@@ -138,6 +173,10 @@ class BlogGenerationGraph:
         #     "max_concurrency": 4,
         # }
 
+        retried_nodes: Dict[str, int] = {}
+        if time_budget is None:
+            time_budget = settings.RUN_TIME_BUDGET
+
         logger.info(
             "Starting blog generation workflow",
             keyword=keyword,
@@ -145,48 +184,29 @@ class BlogGenerationGraph:
             seo_threshold=seo_threshold,
             thread_id=thread_id,
             recursion_limit=config["recursion_limit"],
+            resume=resume,
+            time_budget=time_budget,
         )
 
         try:
-            # Execute the workflow with proper configuration
-            final_state = None
-
-            # Use ainvoke as primary method
-            try:
-                final_state = await self.app.ainvoke(initial_state, config=config)
-                logger.info(
-                    "Workflow completed via ainvoke",
-                    keyword=keyword,
-                    thread_id=thread_id,
-                )
-
-            except Exception as invoke_error:
-                logger.warning(
-                    "ainvoke failed, falling back to astream", error=str(invoke_error)
+            # Execute the workflow; failed nodes resume from the last checkpoint.
+            # Resumed runs already spent LLM calls; the Gemini rate governor
+            # serves them before new runs
+            with run_scope(
+                thread_id,
+                in_progress=resume,
+                time_budget=time_budget,
+                stream_tokens=on_event is not None,
+            ):
+                final_state = await self._invoke_with_resume(
+                    graph_input, config, retried_nodes, on_event
                 )
-
-                # Fallback to astream if ainvoke fails
-                step_count = 0
-                max_steps = 20
-
-                async for state in self.app.astream(initial_state, config=config):
-                    final_state = state
-                    step_count += 1
-
-                    if step_count > max_steps:
-                        logger.error("Emergency stop: Too many workflow steps")
-                        break
-
-                    # Log intermediate progress
-                    if isinstance(state, dict) and len(state) == 1:
-                        node_name = list(state.keys())[0]
-                        logger.info(
-                            "Workflow node completed",
-                            node=node_name,
-                            keyword=keyword,
-                            thread_id=thread_id,
-                            step=step_count,
-                        )
+            logger.info(
+                "Workflow completed via ainvoke",
+                keyword=keyword,
+                thread_id=thread_id,
+                retried_nodes=retried_nodes,
+            )
 
             if final_state is None:
                 raise Exception("Workflow execution failed - no final state")
@@ -295,6 +315,7 @@ class BlogGenerationGraph:
                 "attempts": final_graph_state.attempts,
                 "keyword": keyword,
                 "thread_id": thread_id,
+                "retried_nodes": retried_nodes,
             }
 
         except Exception as e:
@@ -304,6 +325,7 @@ class BlogGenerationGraph:
                 thread_id=thread_id,
                 error=str(e),
                 error_type=type(e).__name__,
+                retried_nodes=retried_nodes,
             )
 
             return {
@@ -314,10 +336,149 @@ class BlogGenerationGraph:
                 "attempts": 1,
                 "keyword": keyword,
                 "thread_id": thread_id,
+                "retried_nodes": retried_nodes,
                 "error": str(e),
                 "reason": "workflow_error",
             }
 
+    async def _invoke_with_resume(
+        self,
+        graph_input: Optional[GraphState],
+        config: Dict[str, Any],
+        retried_nodes: Dict[str, int],
+        on_event: Optional[EventCallback] = None,
+    ) -> Dict[str, Any]:
+        """Invoke the app, resuming from the last checkpoint when a node fails.
+
+        Nodes that completed before the failure are not executed again; the
+        failed node is retried up to its limit in ``NODE_RETRY_LIMITS`` while
+        the run's time budget lasts.
+
+        Args:
+            graph_input: Initial state, or None to continue from a checkpoint
+            config: Run config with the thread ID
+            retried_nodes: Filled with node name -> number of retries
+            on_event: Receives node and token events when streaming
+
+        Returns:
+            Final graph state values
+
+        Raises:
+            Exception: The node's error once it has no retries or time left
+        """
+        latest = {"configurable": {"thread_id": config["configurable"]["thread_id"]}}
+        while True:
+            try:
+                if on_event is None:
+                    return await self.app.ainvoke(graph_input, config=config)
+                await self._stream(graph_input, config, on_event)
+                return (await self.app.aget_state(latest)).values
+            except Exception as invoke_error:
+                snapshot = await self.app.aget_state(latest)
+                failed = list(snapshot.next)
+                if not failed or any(
+                    retried_nodes.get(node, 0)
+                    >= NODE_RETRY_LIMITS.get(node, DEFAULT_NODE_RETRY_LIMIT)
+                    for node in failed
+                ):
+                    raise
+                run = current_run()
+                if run is not None and run.remaining() == 0:
+                    logger.warning(
+                        "Workflow node failed, no time budget left to resume",
+                        nodes=failed,
+                        thread_id=latest["configurable"]["thread_id"],
+                        error=str(invoke_error),
+                    )
+                    raise
+                for node in failed:
+                    retried_nodes[node] = retried_nodes.get(node, 0) + 1
+                logger.warning(
+                    "Workflow node failed, resuming from last checkpoint",
+                    nodes=failed,
+                    thread_id=latest["configurable"]["thread_id"],
+                    retries=retried_nodes,
+                    error=str(invoke_error),
+                )
+                graph_input = None
+                config = {
+                    **config,
+                    "configurable": {
+                        k: v
+                        for k, v in config["configurable"].items()
+                        if k != "checkpoint_id"
+                    },
+                }
+
+    async def _stream(
+        self,
+        graph_input: Optional[GraphState],
+        config: Dict[str, Any],
+        on_event: EventCallback,
+    ) -> None:
+        """Run the app in streaming mode, forwarding node and token events."""
+        async for mode, chunk in self.app.astream(
+            graph_input, config=config, stream_mode=["tasks", "custom"]
+        ):
+            if mode == "custom":
+                event = dict(chunk)
+                on_event(event.pop("event", "custom"), event)
+            elif chunk["name"] in STREAMED_NODES:
+                status = "completed" if "result" in chunk else "started"
+                if chunk.get("error"):
+                    status = "failed"
+                on_event("node", {"node": chunk["name"], "status": status})
+
+    async def resume_blog_generation(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        """Resume an interrupted run from its last completed node.
+
+        Nodes that finished before the interruption are not executed again.
+        Raw HTML is only held in the memory of the worker that scraped it, so
+        a run interrupted between scraping and cleaning resumes from the
+        scrape step, which is then served by the HTML cache.
+
+        Args:
+            thread_id: Run ID of the interrupted generation
+
+        Returns:
+            The same result as ``run_blog_generation``, or None if the thread
+            has no checkpoint
+        """
+        if not self.app:
+            await self.compile_app()
+
+        config = {"configurable": {"thread_id": thread_id}}
+        snapshot = await self.app.aget_state(config)
+        if not snapshot.values:
+            return None
+
+        values = snapshot.values
+        checkpoint_id = None
+        if (
+            "clean" in snapshot.next
+            and not values.get("cleaned_posts")
+            and not get_raw_html_store().has(values.get("raw_html_ref"))
+        ):
+            async for earlier in self.app.aget_state_history(config):
+                if "scrape" in earlier.next:
+                    checkpoint_id = earlier.config["configurable"]["checkpoint_id"]
+                    break
+
+        logger.info(
+            "Resuming blog generation workflow",
+            thread_id=thread_id,
+            next_nodes=list(snapshot.next),
+            from_checkpoint=checkpoint_id,
+        )
+        return await self.run_blog_generation(
+            keyword=values["keyword"],
+            max_attempts=values["max_attempts"],
+            seo_threshold=values["seo_threshold"],
+            thread_id=thread_id,
+            resume=True,
+            checkpoint_id=checkpoint_id,
+        )
+
 
 # Singleton instance
 _blog_graph: Optional[BlogGenerationGraph] = None
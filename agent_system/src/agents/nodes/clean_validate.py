@@ -1,9 +1,11 @@
 """Clean and validate scraped content node implementation."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, ValidationError
+from src.memory.raw_html_store import get_raw_html_store
 from src.schemas.state import GraphState
-from src.tools.scraper import create_scraper
+from src.tools.clean_pool import clean_html_off_loop
+from src.tools.scraper import is_quality_post
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -20,72 +22,93 @@ class CleanedPostSchema(BaseModel):
     word_count: int
 
 
+async def clean_post(html: str, url: str) -> Optional[Dict[str, Any]]:
+    """Clean one scraped page off the event loop and validate it.
+
+    Args:
+        html: Raw HTML content
+        url: Source URL
+
+    Returns:
+        Validated post dictionary or None if cleaning or validation fails
+    """
+    try:
+        # Clean HTML content in the shared worker pool
+        cleaned_content = await clean_html_off_loop(html, url)
+
+        if not cleaned_content:
+            logger.warning("Failed to clean content", url=url)
+            return None
+
+        # Validate against schema
+        validated_post = CleanedPostSchema(**cleaned_content)
+
+        logger.debug(
+            "Successfully cleaned and validated post",
+            url=url,
+            word_count=validated_post.word_count,
+            headings_count=len(validated_post.headings),
+            paragraphs_count=len(validated_post.paragraphs),
+        )
+
+        return validated_post.model_dump()
+
+    except ValidationError as e:
+        logger.warning("Content validation failed", url=url, validation_errors=str(e))
+        return None
+    except Exception as e:
+        logger.error("Unexpected error during content cleaning", url=url, error=str(e))
+        return None
+
+
 async def clean_validate(state: GraphState) -> Dict[str, Any]:
     """Clean and validate scraped HTML content.
 
+    The raw HTML referenced by ``raw_html_ref`` is released from the side
+    store here, whichever path is taken.
+
     Args:
-        state: Current graph state containing raw_html_content
+        state: Current graph state containing raw_html_ref
 
     Returns:
-        Updated state with cleaned_posts
+        Updated state with cleaned_posts and the raw HTML reference cleared
     """
-    raw_html_content = getattr(state, "raw_html_content", {})
+    store = get_raw_html_store()
+    if state.posts_cleaned:
+        # The streaming scrape pipeline already cleaned pages as they arrived;
+        # an empty result means none was good enough, not that none was cleaned
+        store.release(state.raw_html_ref)
+        logger.info(
+            "Posts already cleaned during scraping",
+            quality_filtered=len(state.cleaned_posts),
+        )
+        return {"cleaned_posts": state.cleaned_posts, "raw_html_ref": None}
+
+    raw_html_content = store.pop(state.raw_html_ref)
 
     if not raw_html_content:
         logger.warning("No raw HTML content to clean")
-        return {"cleaned_posts": []}
+        return {"cleaned_posts": [], "raw_html_ref": None}
 
     logger.info(
         "Starting content cleaning and validation", content_count=len(raw_html_content)
     )
 
     cleaned_posts = []
-    scraper = create_scraper()
 
     for url, html in raw_html_content.items():
         if not html:
             logger.debug("Skipping empty HTML content", url=url)
             continue
 
-        try:
-            # Clean HTML content using scraper utility
-            cleaned_content = scraper.clean_html_content(html, url)
-
-            if not cleaned_content:
-                logger.warning("Failed to clean content", url=url)
-                continue
-
-            # Validate against schema
-            validated_post = CleanedPostSchema(**cleaned_content)
-            cleaned_posts.append(validated_post.model_dump())
-
-            logger.debug(
-                "Successfully cleaned and validated post",
-                url=url,
-                word_count=validated_post.word_count,
-                headings_count=len(validated_post.headings),
-                paragraphs_count=len(validated_post.paragraphs),
-            )
-
-        except ValidationError as e:
-            logger.warning(
-                "Content validation failed", url=url, validation_errors=str(e)
-            )
-            continue
-        except Exception as e:
-            logger.error(
-                "Unexpected error during content cleaning", url=url, error=str(e)
-            )
-            continue
+        post = await clean_post(html, url)
+        if post:
+            cleaned_posts.append(post)
 
     # Filter posts with insufficient content
     quality_posts = []
     for post in cleaned_posts:
-        if (
-            post["word_count"] >= 300
-            and len(post["paragraphs"]) >= 3
-            and post["title"].strip()
-        ):
+        if is_quality_post(post):
             quality_posts.append(post)
         else:
             logger.debug(
@@ -102,4 +125,4 @@ async def clean_validate(state: GraphState) -> Dict[str, Any]:
         quality_filtered=len(quality_posts),
     )
 
-    return {"cleaned_posts": quality_posts}
+    return {"cleaned_posts": quality_posts, "raw_html_ref": None}
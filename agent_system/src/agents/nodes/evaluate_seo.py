@@ -1,8 +1,8 @@
 """SEO evaluation node implementation - Fixed JSON parsing."""
 
-import json
 import re
 from typing import Dict, Any
+from src.schemas.llm import SEOEvaluation
 from src.schemas.state import GraphState
 from src.tools.gemini_client import get_gemini_client
 from src.utils.logger import get_logger
@@ -51,12 +51,12 @@ async def evaluate_seo(state: GraphState) -> Dict[str, Any]:
             Respond with ONLY the JSON object, no additional text.
             """
 
-            evaluation_response = await gemini_client.generate_content(
-                prompt=seo_prompt, temperature=0.1
+            evaluation = await gemini_client.generate_content(
+                prompt=seo_prompt, temperature=0.1, response_schema=SEOEvaluation
             )
 
-            # Parse AI evaluation
-            ai_scores = _parse_seo_evaluation(evaluation_response)
+            # Clamp AI evaluation scores
+            ai_scores = _sanitize_seo_scores(evaluation.model_dump())
 
         except Exception as e:
             logger.warning(
@@ -89,62 +89,11 @@ async def evaluate_seo(state: GraphState) -> Dict[str, Any]:
         return {"seo_scores": {"final_score": basic_score}, "final_score": basic_score}
 
 
-def _parse_seo_evaluation(response: str) -> Dict[str, Any]:
-    """Parse SEO evaluation response from Gemini."""
-    try:
-        # Clean the response
-        cleaned_response = response.strip()
-
-        # Look for JSON content between ```json blocks
-        json_match = re.search(
-            r"```json\s*(\{.*?\})\s*```", cleaned_response, re.DOTALL
-        )
-        if json_match:
-            json_content = json_match.group(1)
-        else:
-            # Look for direct JSON object
-            json_match = re.search(
-                r'\{[^}]*"final_score"[^}]*\}', cleaned_response, re.DOTALL
-            )
-            if json_match:
-                json_content = json_match.group(0)
-            else:
-                # Try to parse the entire response as JSON
-                json_content = cleaned_response
-
-        # Parse JSON
-        scores = json.loads(json_content)
-
-        # Validate and sanitize scores
-        required_fields = [
-            "title_score",
-            "meta_description_score",
-            "keyword_optimization_score",
-            "content_structure_score",
-            "readability_score",
-            "content_quality_score",
-            "technical_seo_score",
-            "final_score",
-        ]
-
-        for field in required_fields:
-            if field not in scores:
-                scores[field] = 0.0
-            else:
-                # Ensure numeric and within bounds
-                try:
-                    scores[field] = max(0.0, min(100.0, float(scores[field])))
-                except (ValueError, TypeError):
-                    scores[field] = 0.0
-
-        return scores
-
-    except json.JSONDecodeError as e:
-        logger.warning("Failed to parse JSON from SEO evaluation", error=str(e))
-        return {}
-    except Exception as e:
-        logger.error("Unexpected error parsing SEO evaluation", error=str(e))
-        return {}
+def _sanitize_seo_scores(scores: Dict[str, Any]) -> Dict[str, Any]:
+    """Clamp the SEO scores returned by Gemini to 0-100."""
+    return {
+        field: max(0.0, min(100.0, float(value))) for field, value in scores.items()
+    }
 
 
 def _evaluate_with_rules(content: str, keyword: str) -> Dict[str, Any]:
@@ -1,9 +1,11 @@
 """Generate blog content node implementation - Fixed version."""
 
 from typing import Dict, Any
+from langgraph.config import get_stream_writer
 from src.schemas.state import GraphState
 from src.tools.gemini_client import get_gemini_client
 from src.utils.logger import get_logger
+from src.utils.run_context import current_run
 
 logger = get_logger(__name__)
 
@@ -51,11 +53,8 @@ async def generate_blog(state: GraphState) -> Dict[str, Any]:
             Format as HTML with proper tags.
             """
 
-            draft_blog = await gemini_client.generate_content(
-                prompt=fallback_prompt,
-                use_search=False,  # Don't use search for fallback
-                temperature=0.7,
-                max_output_tokens=4000,
+            draft_blog = await _generate_draft(
+                gemini_client, fallback_prompt, attempts + 1
             )
 
             if draft_blog and len(draft_blog.strip()) >= 500:
@@ -122,12 +121,7 @@ async def generate_blog(state: GraphState) -> Dict[str, Any]:
         # Generate content using Gemini
         gemini_client = await get_gemini_client()
 
-        draft_blog = await gemini_client.generate_content(
-            prompt=blog_prompt,
-            use_search=False,  # Don't use search for content generation
-            temperature=0.7,
-            max_output_tokens=4000,
-        )
+        draft_blog = await _generate_draft(gemini_client, blog_prompt, attempts + 1)
 
         if not draft_blog or len(draft_blog.strip()) < 500:
             raise ValueError("Generated blog content is too short or empty")
@@ -153,6 +147,31 @@ async def generate_blog(state: GraphState) -> Dict[str, Any]:
         return {"draft_blog": "", "attempts": attempts + 1}
 
 
+async def _generate_draft(gemini_client: Any, prompt: str, attempt: int) -> str:
+    """Generate a draft, streaming its tokens when the run is streamed.
+
+    Streamed chunks are sent to the graph's "custom" stream as ``token``
+    events tagged with the attempt, so clients can tell revisions apart.
+    """
+    run = current_run()
+    if run is None or not run.stream_tokens:
+        return await gemini_client.generate_content(
+            prompt=prompt,
+            use_search=False,  # Don't use search for content generation
+            temperature=0.7,
+            max_output_tokens=4000,
+        )
+
+    writer = get_stream_writer()
+    chunks = []
+    async for text in gemini_client.generate_content_stream(
+        prompt, temperature=0.7, max_output_tokens=4000
+    ):
+        chunks.append(text)
+        writer({"event": "token", "text": text, "attempt": attempt})
+    return "".join(chunks)
+
+
 def _prepare_reference_posts(cleaned_posts: list[Dict[str, Any]]) -> str:
     """Prepare reference posts summary for prompt."""
     reference_sections = []
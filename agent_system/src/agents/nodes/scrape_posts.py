@@ -1,33 +1,77 @@
-from typing import Dict, Any
+from contextlib import aclosing
+from typing import Any, Dict, List, Tuple
+from src.config import settings
+from src.memory.raw_html_store import get_raw_html_store
 from src.schemas.state import GraphState
-from src.tools.scraper import create_scraper
+from src.tools.scraper import create_scraper, is_quality_post
+from src.tools.single_flight import get_single_flight
+from src.agents.nodes.clean_validate import clean_post
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
 async def scrape_posts(state: GraphState) -> Dict[str, Any]:
-    """Scrape content from the top posts URLs."""
+    """Scrape the top posts URLs, cleaning each page as soon as it arrives.
+
+    Once ``SCRAPE_QUORUM`` quality posts are collected the remaining fetches
+    are cancelled instead of waiting for the slowest URL. The raw HTML is
+    kept in the raw HTML side store; only its reference enters the state.
+    Concurrent runs scraping the same URLs share one scrape.
+    """
     top_posts = state.top_posts or []
     urls = [p["url"] for p in top_posts if p.get("url")]
     if not urls:
         logger.warning("No URLs to scrape")
-        return {"raw_html_content": {}}
+        return {"raw_html_ref": None}
+
+    successful, quality_posts = await get_single_flight("scrape").do(
+        (tuple(urls), settings.SCRAPE_QUORUM), lambda: _scrape(urls)
+    )
+    # Each run gets its own reference since clean_validate pops it
+    return {
+        "raw_html_ref": (
+            get_raw_html_store().put(dict(successful)) if successful else None
+        ),
+        "cleaned_posts": list(quality_posts),
+        # Every fetched page was cleaned, even when none passed the filter
+        "posts_cleaned": True,
+    }
 
-    logger.info("Starting to scrape posts", url_count=len(urls))
+
+async def _scrape(urls: List[str]) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+    """Fetch and clean the URLs; returns (raw HTML by URL, quality posts)."""
+    quorum = settings.SCRAPE_QUORUM
+    logger.info("Starting to scrape posts", url_count=len(urls), quorum=quorum)
     scraper = create_scraper()
 
+    successful = {}
+    quality_posts = []
     try:
-        raw_html = await scraper.scrape_multiple(urls)
-        successful = {u: h for u, h in raw_html.items() if h}
+        async with aclosing(scraper.scrape_stream(urls)) as stream:
+            async for url, html in stream:
+                if not html:
+                    continue
+                successful[url] = html
+
+                post = await clean_post(html, url)
+                if is_quality_post(post):
+                    quality_posts.append(post)
+                    if quorum and len(quality_posts) >= quorum:
+                        logger.info(
+                            "Quality quorum reached, cancelling remaining fetches",
+                            quorum=quorum,
+                        )
+                        break
+
         logger.info(
             "Scraping completed",
             total=len(urls),
             successful=len(successful),
+            quality=len(quality_posts),
             failed=len(urls) - len(successful),
         )
-        return {"raw_html_content": successful}
-
     except Exception as e:
         logger.error("Scraping failed", error=str(e))
-        return {"raw_html_content": {}}
+
+    return successful, quality_posts
@@ -1,10 +1,15 @@
 import re
 import asyncio
-import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from src.schemas.state import GraphState
+from src.schemas.llm import SearchResultItem
 from src.tools.gemini_client import get_gemini_client
+from src.tools.structured_output import StructuredOutputError
 from src.tools.search_client import create_search_client, SearchError
+from src.tools.search_cache import get_search_cache, normalize_keyword
+from src.tools.hedged_search import hedged_search
+from src.tools.single_flight import get_single_flight
+from src.config import settings
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -33,6 +38,56 @@ async def search_top_posts(state: GraphState) -> Dict[str, Any]:
     keyword = state.keyword
     logger.info("Starting search for top posts", keyword=keyword)
 
+    # Runs searching the same keyword at once share one search
+    top_posts = await get_single_flight("search").do(
+        normalize_keyword(keyword), lambda: _search_cached(keyword)
+    )
+    if top_posts:
+        return {"top_posts": top_posts}
+
+    # 3️⃣ No results found - return safe response that signals workflow to end
+    logger.error("All search methods failed - no results found", keyword=keyword)
+    return {
+        "top_posts": [],
+        "search_failed": True,
+        "error_message": f"No blog posts found for keyword: '{keyword}'",
+        "workflow_status": "search_failed",
+    }
+
+
+async def _search_cached(keyword: str) -> Optional[List[Dict[str, Any]]]:
+    cache = get_search_cache()
+    if cache is None:
+        return await _search_upstream(keyword)
+    return await cache.get_or_fetch(keyword, lambda: _search_upstream(keyword))
+
+
+async def _search_upstream(keyword: str) -> Optional[List[Dict[str, Any]]]:
+    """Search Gemini grounding and Custom Search; None if both fail.
+
+    In "hedged" mode Custom Search starts ``SEARCH_HEDGE_DELAY`` seconds
+    after grounding (or as soon as grounding fails) and the first valid
+    result set wins; in "sequential" mode it only runs after grounding
+    failed.
+    """
+    if settings.SEARCH_MODE == "hedged":
+        _, posts = await hedged_search(
+            ("gemini_grounding", lambda: _search_gemini(keyword)),
+            ("custom_search", lambda: _search_custom(keyword)),
+            delay=settings.SEARCH_HEDGE_DELAY,
+        )
+        return posts
+
+    posts = await _search_gemini(keyword)
+    if posts:
+        return posts
+    logger.info("Falling back to Custom Search API", keyword=keyword)
+    return await _search_custom(keyword)
+
+
+async def _search_gemini(keyword: str) -> Optional[List[Dict[str, Any]]]:
+    """Ask Gemini grounding for the top posts; None unless it returns 5+."""
+
     # url sanitization helper
     def _sanitize_url(url: str) -> str:
         """Strips <url …> wrapper if present."""
@@ -45,50 +100,36 @@ async def search_top_posts(state: GraphState) -> Dict[str, Any]:
         prompt = GPT_JSON_PROMPT.format(keyword=keyword)
         logger.info("Gemini grounding with JSON prompt", prompt=prompt[:60] + "…")
 
-        raw = await client.generate_content(prompt=prompt, temperature=0.3)
-
-        print(f"Raw Gemini response: {raw[:1000]}...")  # Debug print
-
-        text = raw.strip()
-
-        # Parse JSON safely
-        try:
-            top_posts = json.loads(text)
-
-        except json.JSONDecodeError:
-            # try to extract a JSON array or object via regex
-            match = re.search(r"(\[.*\]|\{.*\})", text, re.DOTALL)
-            if match:
-                try:
-                    top_posts = json.loads(match.group(1))
-                except json.JSONDecodeError:
-                    top_posts = []
-            else:
-                top_posts = []
+        results = await client.generate_content(
+            prompt=prompt, temperature=0.3, response_schema=list[SearchResultItem]
+        )
 
-        if isinstance(top_posts, list) and len(top_posts) >= 5:
-            for p in top_posts:
-                p["url"] = _sanitize_url(p["url"])
+        if len(results) >= 5:
+            return [
+                {**item.model_dump(), "url": _sanitize_url(item.url)}
+                for item in results
+            ]
+        logger.warning("Gemini grounding returned too few posts", count=len(results))
 
-            return {"top_posts": top_posts}
-
-    except json.JSONDecodeError as je:
-        logger.warning("Failed to parse Gemini JSON", error=str(je))
-
-        # fixing json decoding error
+    except StructuredOutputError as se:
+        logger.warning("Failed to parse Gemini JSON", error=str(se))
 
     except Exception as e:
         logger.error("Gemini grounding error", error=str(e), exc_info=True)
 
+    return None
+
+
+async def _search_custom(keyword: str) -> Optional[List[Dict[str, Any]]]:
+    """Search the Custom Search API; None if it fails or finds nothing."""
     # 2️⃣ Fallback to Custom Search API
     try:
         search_client = create_search_client()
-        logger.info("Falling back to Custom Search API", keyword=keyword)
 
         posts = await search_client.search_top_posts(keyword, num_results=10)
         if posts:
             logger.info("Custom Search returned results", count=len(posts))
-            return {"top_posts": posts}
+            return posts
     except SearchError as se:
         logger.warning("Custom Search failed", error=str(se))
     except Exception as e:
@@ -98,14 +139,7 @@ async def search_top_posts(state: GraphState) -> Dict[str, Any]:
     # logger.warning("Using mock results for testing", keyword=keyword)
     # return {"top_posts": _generate_mock_results(keyword)}
 
-    # 3️⃣ No results found - return safe response that signals workflow to end
-    logger.error("All search methods failed - no results found", keyword=keyword)
-    return {
-        "top_posts": [],
-        "search_failed": True,
-        "error_message": f"No blog posts found for keyword: '{keyword}'",
-        "workflow_status": "search_failed",
-    }
+    return None
 
 
 # def _generate_mock_results(keyword: str) -> List[Dict[str, Any]]:
@@ -2,6 +2,7 @@
 
 import os
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from typing import AsyncGenerator
 from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
@@ -16,6 +17,14 @@ from src.api.routes.blog import router as blog_router
 from src.api.middleware import RateLimitMiddleware, RequestLoggingMiddleware
 from src.api.auth import verify_api_key
 from src.utils.logger import configure_logging, get_logger
+from src.utils.metrics import collect_stats
+from src.tools.browser_pool import get_browser_pool
+from src.tools.http_fetcher import get_static_fetcher
+from src.tools.clean_pool import shutdown_clean_pool
+from src.tools.html_cache import close_html_cache
+from src.tools.llm_cache import close_llm_cache
+from src.tools.search_client import close_search_client
+from src.memory.checkpointer import close_memory_saver
 from src.schemas.models import ErrorDetail
 from langsmith import Client as LangSmithClient
 from fastapi.encoders import jsonable_encoder
@@ -60,6 +69,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error("Failed to pre-compile blog generation graph", error=str(e))
 
+    # Warm up the shared Playwright browser pool
+    browser_pool = await get_browser_pool()
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        logger.warning(
+            "Failed to start browser pool, will retry on first scrape", error=str(e)
+        )
+
     # Initialize usage tracking
     app.state.usage_stats = {
         "total_requests": 0,
@@ -73,6 +91,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Shutdown
     logger.info("Shutting down Enhanced Gemini Blog Agent service")
+
+    # Close pooled browsers
+    try:
+        await browser_pool.stop()
+    except Exception as e:
+        logger.warning("Failed to stop browser pool", error=str(e))
+    await (await get_static_fetcher()).close()
+    await close_search_client()
+    shutdown_clean_pool()
+    close_html_cache()
+    close_llm_cache()
+    close_memory_saver()
     
     # Log final statistics
     if hasattr(app.state, 'usage_stats'):
@@ -188,6 +218,17 @@ def create_app() -> FastAPI:
             "environment": os.getenv("ENVIRONMENT", "development")
         }
 
+    # Add component metrics endpoint (no auth required)
+    @app.get("/api/v1/metrics", tags=["monitoring"])
+    async def get_metrics():
+        """Runtime metrics of the scraping and generation components."""
+        return {
+            "service": "gemini-blog-agent",
+            "version": "1.0.0",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "components": collect_stats(),
+        }
+
     # Add API statistics endpoint (requires auth)
     @app.get("/api/v1/stats", tags=["monitoring"])
     async def get_api_stats(authorized: bool = Depends(verify_api_key)):
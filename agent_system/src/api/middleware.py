@@ -62,7 +62,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         """Process request through rate limiting."""
         # Skip rate limiting for health checks
-        if request.url.path in ["/health", "/api/v1/health", "/docs", "/redoc", "/openapi.json"]:
+        if request.url.path in ["/health", "/api/v1/health", "/api/v1/metrics", "/docs", "/redoc", "/openapi.json"]:
             return await call_next(request)
         
         client_id = self._get_client_id(request)
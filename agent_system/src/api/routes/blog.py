@@ -1,10 +1,13 @@
 """Enhanced blog generation API routes with security and better customization."""
 
+import asyncio
+import json
 import uuid
 import time
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from src.schemas.models import (
     EnhancedBlogGenerationRequest,
@@ -22,6 +25,10 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["blog"])
 
+# Seconds without events before a keep-alive comment is sent on a stream
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
 @router.post(
     "/generate-blog",
     response_model=EnhancedBlogGenerationResponse,
@@ -92,54 +99,10 @@ async def generate_enhanced_blog(
 
         processing_time = time.time() - start_time
 
-        # Calculate additional metrics
-        word_count = len(result["final_blog"].split()) if result["final_blog"] else 0
-        reading_time = max(1, word_count // 200)  # ~200 words per minute
-        
-        # Determine content quality grade based on SEO score
+        response = build_blog_response(result, run_id, processing_time, customization)
         final_score = result["final_score"]
-        if final_score >= 90:
-            quality_grade = "A"
-        elif final_score >= 80:
-            quality_grade = "B"
-        elif final_score >= 70:
-            quality_grade = "C"
-        elif final_score >= 60:
-            quality_grade = "D"
-        else:
-            quality_grade = "F"
-
-        # Create enhanced SEO scores
-        seo_scores = SEOScoreDetails(
-            **result["seo_scores"],
-            word_count=word_count,
-            reading_time_minutes=reading_time,
-            keyword_density=result.get("keyword_density", 0.0)
-        )
-
-        # Create metadata
-        metadata = ContentMetadata(
-            sources_used=result.get("sources_used", []),
-            processing_time_seconds=round(processing_time, 2),
-            model_used=result.get("model_used", "gemini-2.0-flash"),
-            content_language="en",
-            # generated_at=datetime.utcnow()
-        )
-
-        # Create enhanced response
-        response = EnhancedBlogGenerationResponse(
-            run_id=run_id,
-            final_blog=result["final_blog"],
-            seo_scores=seo_scores,
-            attempts=result["attempts"],
-            success=result["success"],
-            metadata=metadata,
-            customization_applied=customization,
-            status="completed",
-            progress_percentage=100,
-            estimated_reading_time=reading_time,
-            content_quality_grade=quality_grade
-        )
+        word_count = response.seo_scores.word_count
+        quality_grade = response.content_quality_grade
 
         # Update usage statistics
         if hasattr(fastapi_request.app.state, 'usage_stats'):
@@ -195,6 +158,242 @@ async def generate_enhanced_blog(
             detail=f"Blog generation failed: {str(e)}"
         )
 
+
+@router.post(
+    "/generate-blog/{run_id}/resume",
+    response_model=EnhancedBlogGenerationResponse,
+    summary="Resume an interrupted blog generation",
+    description="Continue a run that was interrupted (e.g. by a worker restart) from its last completed node",
+)
+async def resume_blog_generation(
+    run_id: str,
+    authorized: bool = Depends(verify_api_key),
+) -> EnhancedBlogGenerationResponse:
+    """Resume an interrupted blog generation from its checkpoint.
+
+    Search, scrape and generation steps that completed before the
+    interruption are not repeated.
+
+    Args:
+        run_id: Run ID returned (or logged) when the generation was started
+        authorized: API key verification result
+
+    Returns:
+        EnhancedBlogGenerationResponse for the completed run
+
+    Raises:
+        HTTPException: 404 if the run has no checkpoint, 500 if resuming fails
+    """
+    start_time = time.time()
+    logger.info("Blog generation resume requested", run_id=run_id)
+
+    try:
+        blog_graph = await get_blog_generation_graph()
+        result = await blog_graph.resume_blog_generation(run_id)
+    except Exception as e:
+        logger.error(
+            "Blog generation resume failed",
+            run_id=run_id,
+            error=str(e),
+            error_type=type(e).__name__,
+        )
+        raise HTTPException(
+            status_code=500, detail=f"Blog generation resume failed: {str(e)}"
+        )
+
+    if result is None:
+        raise HTTPException(
+            status_code=404, detail=f"No checkpoint found for run {run_id}"
+        )
+
+    return build_blog_response(
+        result, run_id, time.time() - start_time, BlogCustomization()
+    )
+
+
+@router.post(
+    "/generate-blog/stream",
+    summary="Generate blog content as a Server-Sent Events stream",
+    description="Stream step transitions and draft tokens while the blog is generated, ending with the SEO scores",
+)
+async def stream_blog_generation(
+    request: EnhancedBlogGenerationRequest,
+    authorized: bool = Depends(verify_api_key),
+    fastapi_request: Request = None,
+) -> StreamingResponse:
+    """Generate blog content, streaming progress as Server-Sent Events.
+
+    Events, each with a JSON ``data`` payload:
+    - ``run``: the run ID, sent first
+    - ``node``: a step (search, scrape, clean, generate, evaluate) started,
+      completed or failed
+    - ``token``: a chunk of the blog draft; ``attempt`` increases when the
+      draft is revised
+    - ``complete``: the closing event, with the same body as
+      ``/generate-blog`` including the final SEO scores
+    - ``error``: the closing event if the run failed
+
+    The run is cancelled if the client disconnects.
+
+    Args:
+        request: Blog generation request
+        authorized: API key verification result
+        fastapi_request: FastAPI request object for tracking
+
+    Returns:
+        StreamingResponse of ``text/event-stream``
+    """
+    start_time = time.time()
+    run_id = str(uuid.uuid4())
+    customization = request.customization or BlogCustomization()
+
+    if hasattr(fastapi_request.app.state, "usage_stats"):
+        fastapi_request.app.state.usage_stats["total_requests"] += 1
+
+    logger.info(
+        "Streaming blog generation request received",
+        run_id=run_id,
+        keyword=request.keyword,
+    )
+
+    async def events() -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue()
+        blog_graph = await get_blog_generation_graph()
+        run = asyncio.create_task(
+            blog_graph.run_blog_generation(
+                keyword=request.keyword.strip(),
+                max_attempts=request.max_attempts or 3,
+                seo_threshold=request.seo_threshold or 75.0,
+                thread_id=run_id,
+                on_event=lambda name, data: queue.put_nowait((name, data)),
+            )
+        )
+        run.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            yield sse_event("run", {"run_id": run_id, "keyword": request.keyword})
+            while True:
+                try:
+                    item = await asyncio.wait_for(
+                        queue.get(), timeout=SSE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Keep proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    break
+                yield sse_event(*item)
+
+            result = run.result()
+            if result.get("error"):
+                closing = sse_event(
+                    "error", {"run_id": run_id, "detail": result["error"]}
+                )
+            else:
+                response = build_blog_response(
+                    result, run_id, time.time() - start_time, customization
+                )
+                closing = sse_event("complete", jsonable_encoder(response))
+
+            if hasattr(fastapi_request.app.state, "usage_stats"):
+                counter = (
+                    "successful_requests" if result["success"] else "failed_requests"
+                )
+                fastapi_request.app.state.usage_stats[counter] += 1
+            logger.info(
+                "Streaming blog generation completed",
+                run_id=run_id,
+                success=result["success"],
+                final_score=result["final_score"],
+                processing_time=round(time.time() - start_time, 2),
+            )
+            yield closing
+        except Exception as e:
+            logger.error(
+                "Streaming blog generation failed",
+                run_id=run_id,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            yield sse_event("error", {"run_id": run_id, "detail": str(e)})
+        finally:
+            if not run.done():
+                logger.info("Client disconnected, cancelling run", run_id=run_id)
+                run.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def sse_event(name: str, data: Any) -> str:
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+def build_blog_response(
+    result: Dict[str, Any],
+    run_id: str,
+    processing_time: float,
+    customization: BlogCustomization,
+) -> EnhancedBlogGenerationResponse:
+    """Build the API response, with reading metrics and grade, from a graph result."""
+    # Calculate additional metrics
+    word_count = len(result["final_blog"].split()) if result["final_blog"] else 0
+    reading_time = max(1, word_count // 200)  # ~200 words per minute
+
+    # Determine content quality grade based on SEO score
+    final_score = result["final_score"]
+    if final_score >= 90:
+        quality_grade = "A"
+    elif final_score >= 80:
+        quality_grade = "B"
+    elif final_score >= 70:
+        quality_grade = "C"
+    elif final_score >= 60:
+        quality_grade = "D"
+    else:
+        quality_grade = "F"
+
+    # Create enhanced SEO scores
+    seo_scores = SEOScoreDetails(
+        **result["seo_scores"],
+        word_count=word_count,
+        reading_time_minutes=reading_time,
+        keyword_density=result.get("keyword_density", 0.0),
+    )
+
+    # Create metadata
+    metadata = ContentMetadata(
+        sources_used=result.get("sources_used", []),
+        processing_time_seconds=round(processing_time, 2),
+        model_used=result.get("model_used", "gemini-2.0-flash"),
+        content_language="en",
+        retried_nodes=result.get("retried_nodes", {}),
+        # generated_at=datetime.utcnow()
+    )
+
+    # Create enhanced response
+    response = EnhancedBlogGenerationResponse(
+        run_id=run_id,
+        final_blog=result["final_blog"],
+        seo_scores=seo_scores,
+        attempts=result["attempts"],
+        success=result["success"],
+        metadata=metadata,
+        customization_applied=customization,
+        status="completed",
+        progress_percentage=100,
+        estimated_reading_time=reading_time,
+        content_quality_grade=quality_grade,
+    )
+
+    return response
+
+
 async def send_webhook_notification(callback_url: str, response_data: dict, run_id: str):
     """Send webhook notification for async processing."""
     try:
@@ -38,5 +38,95 @@ GOOGLE_SEARCH_ENGINE_ID = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 API_KEY=os.getenv("API_KEY")
 
+# Browser pool: recycle the shared Chromium after N pages or above a memory ceiling
+BROWSER_POOL_MAX_PAGES = int(os.getenv("BROWSER_POOL_MAX_PAGES", "200"))
+BROWSER_POOL_MAX_MEMORY_MB = int(os.getenv("BROWSER_POOL_MAX_MEMORY_MB", "1024"))
+BROWSER_POOL_HEALTH_INTERVAL = float(os.getenv("BROWSER_POOL_HEALTH_INTERVAL", "30"))
+
+# Tiered fetching: try plain HTTP before escalating a URL to Playwright
+STATIC_FETCH_ENABLED = os.getenv("STATIC_FETCH_ENABLED", "true").lower() == "true"
+STATIC_FETCH_TIMEOUT = float(os.getenv("STATIC_FETCH_TIMEOUT", "10"))
+
+# Stop scraping once this many quality posts are cleaned (0 waits for every URL)
+SCRAPE_QUORUM = int(os.getenv("SCRAPE_QUORUM", "5"))
+
+# HTML cleaning workers: "process", "thread" or "inline" (on the event loop)
+CLEAN_POOL_MODE = os.getenv("CLEAN_POOL_MODE", "process")
+CLEAN_POOL_WORKERS = int(
+    os.getenv("CLEAN_POOL_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+
+# Content extraction engine: "lxml" (single parse) or "bs4" (reference engine)
+EXTRACTION_ENGINE = os.getenv("EXTRACTION_ENGINE", "lxml")
+
+# Politeness: concurrent fetches per domain across all runs, and their minimum spacing (s)
+DOMAIN_MAX_CONCURRENCY = int(os.getenv("DOMAIN_MAX_CONCURRENCY", "2"))
+DOMAIN_MIN_INTERVAL = float(os.getenv("DOMAIN_MIN_INTERVAL", "1.0"))
+
+# Failure cool-down (s) doubling per consecutive failure; domains trip after N failures
+FAILURE_BASE_COOLDOWN = float(os.getenv("FAILURE_BASE_COOLDOWN", "300"))
+FAILURE_MAX_COOLDOWN = float(os.getenv("FAILURE_MAX_COOLDOWN", "21600"))
+DOMAIN_FAILURE_THRESHOLD = int(os.getenv("DOMAIN_FAILURE_THRESHOLD", "3"))
+
+# Page readiness: poll for stable article content instead of waiting for networkidle
+READINESS_PROBE_ENABLED = os.getenv("READINESS_PROBE_ENABLED", "true").lower() == "true"
+READINESS_PROBE_TIMEOUT = float(os.getenv("READINESS_PROBE_TIMEOUT", "5"))
+
+# Browser HTML capture: "stripped" drops scripts/styles/comments in-page and caps
+# the UTF-8 size (0 = no cap); "full" returns page.content() unchanged
+HTML_CAPTURE_MODE = os.getenv("HTML_CAPTURE_MODE", "stripped")
+HTML_CAPTURE_MAX_BYTES = int(os.getenv("HTML_CAPTURE_MAX_BYTES", str(2 * 1024 * 1024)))
+
+# On-disk HTML cache shared by all workers on the host (TTL in seconds)
+HTML_CACHE_ENABLED = os.getenv("HTML_CACHE_ENABLED", "true").lower() == "true"
+HTML_CACHE_PATH = os.getenv("HTML_CACHE_PATH", ".cache/html_cache.sqlite3")
+HTML_CACHE_TTL = float(os.getenv("HTML_CACHE_TTL", "86400"))
+HTML_CACHE_MAX_MB = int(os.getenv("HTML_CACHE_MAX_MB", "512"))
+
+# Keyword search result cache: fresh TTL and stale-while-revalidate window (s)
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", str(6 * 3600)))
+SEARCH_CACHE_STALE_TTL = float(os.getenv("SEARCH_CACHE_STALE_TTL", str(7 * 86400)))
+
+# Pooled Custom Search client: request timeout (s) and concurrent searches
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", "10"))
+SEARCH_MAX_CONCURRENCY = int(os.getenv("SEARCH_MAX_CONCURRENCY", "5"))
+
+# Search providers: "hedged" starts Custom Search after SEARCH_HEDGE_DELAY seconds
+# (0 = together with Gemini grounding), "sequential" only after grounding failed
+SEARCH_MODE = os.getenv("SEARCH_MODE", "hedged")
+SEARCH_HEDGE_DELAY = float(os.getenv("SEARCH_HEDGE_DELAY", "3.0"))
+
+# Gemini response cache: "deterministic" caches calls at or below
+# LLM_CACHE_MAX_TEMPERATURE, "all" caches every call, "off" disables it
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "deterministic")
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.2"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+LLM_CACHE_DISK_ENABLED = os.getenv("LLM_CACHE_DISK_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+
+# Gemini rate governor: requests and tokens per minute (0 = unlimited); after
+# 429s the rate is halved down to GEMINI_RATE_MIN_FACTOR of the configured one
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "60"))
+GEMINI_TPM = float(os.getenv("GEMINI_TPM", "1000000"))
+GEMINI_RATE_MIN_FACTOR = float(os.getenv("GEMINI_RATE_MIN_FACTOR", "0.1"))
+
+# Gemini retries of transient errors, rate limits and empty responses:
+# jittered exponential backoff, never past the run's time budget (seconds)
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+GEMINI_RETRY_BASE_DELAY = float(os.getenv("GEMINI_RETRY_BASE_DELAY", "1.0"))
+GEMINI_RETRY_MAX_DELAY = float(os.getenv("GEMINI_RETRY_MAX_DELAY", "20.0"))
+RUN_TIME_BUDGET = float(os.getenv("RUN_TIME_BUDGET", "300"))
+
+# In-memory checkpointer bounds: idle thread TTL (s) and total serialized size
+CHECKPOINT_TTL = float(os.getenv("CHECKPOINT_TTL", "3600"))
+CHECKPOINT_MAX_MB = int(os.getenv("CHECKPOINT_MAX_MB", "256"))
+
+# Checkpoint storage: "sqlite" survives restarts and lets runs resume, "memory" does not
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "sqlite")
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", ".cache/checkpoints.sqlite3")
+CHECKPOINT_RETENTION = float(os.getenv("CHECKPOINT_RETENTION", str(7 * 86400)))
+
 # Debug print
 print(f"Config loaded - google api key set: {bool(GOOGLE_API_KEY)}, ")
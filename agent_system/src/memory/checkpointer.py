@@ -123,25 +123,135 @@
 
 # from langgraph.checkpoint.base import RunnableConfig, Checkpoint, CheckpointMetadata
 import asyncio
-from typing import Optional, Dict, Any
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    RunnableConfig,
+)
 from langgraph.checkpoint.memory import MemorySaver
+
+from src.config import settings
+from src.memory.sqlite_checkpointer import SqliteCheckpointSaver
 from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
 
 logger = get_logger(__name__)
-from langgraph.checkpoint.base import RunnableConfig, Checkpoint, CheckpointMetadata
+
+
+@dataclass
+class _ThreadUsage:
+    bytes: int = 0
+    checkpoints: int = 0
+    last_access: float = field(default_factory=time.monotonic)
 
 
 class EnhancedMemorySaver(MemorySaver):
-    async def aput(
+    """In-memory checkpointer bounded by per-thread TTL and total size.
+
+    Every API run uses its own ``thread_id``, so an unbounded ``MemorySaver``
+    keeps every checkpoint of every run forever. This saver tracks the
+    serialized size of each thread's checkpoints, blobs and writes. After
+    each write, threads idle for longer than ``ttl`` seconds are dropped,
+    then the least recently used threads are evicted until the total fits
+    in ``max_bytes`` and at most ``max_threads`` remain. The thread being
+    written is never evicted.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_threads: int = 1000,
+    ):
+        super().__init__()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_threads = max_threads
+        self._usage: "OrderedDict[str, _ThreadUsage]" = OrderedDict()
+        self._total_bytes = 0
+        self._evictions = {"ttl": 0, "size": 0, "threads": 0}
+        logger.info(
+            "Enhanced memory saver initialized",
+            ttl=ttl,
+            max_bytes=max_bytes,
+            max_threads=max_threads,
+        )
+
+    def _touch(self, thread_id: str) -> _ThreadUsage:
+        usage = self._usage.get(thread_id)
+        if usage is None:
+            usage = self._usage[thread_id] = _ThreadUsage()
+        usage.last_access = time.monotonic()
+        self._usage.move_to_end(thread_id)
+        return usage
+
+    def _account(self, thread_id: str, added_bytes: int, checkpoints: int = 0) -> None:
+        usage = self._touch(thread_id)
+        usage.bytes += added_bytes
+        usage.checkpoints += checkpoints
+        self._total_bytes += added_bytes
+        self._evict(protect=thread_id)
+
+    def put(
         self,
         config: RunnableConfig,
         checkpoint: Checkpoint,
         metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint and evict expired or excess threads."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        stored = self.storage[thread_id][checkpoint_ns].get(checkpoint["id"])
+        result = super().put(config, checkpoint, metadata, new_versions)
+
+        entry = self.storage[thread_id][checkpoint_ns][checkpoint["id"]]
+        added = len(entry[0][1]) + len(entry[1][1])
+        if stored is not None:
+            added -= len(stored[0][1]) + len(stored[1][1])
+        for channel, version in new_versions.items():
+            added += len(self.blobs[(thread_id, checkpoint_ns, channel, version)][1])
+        logger.debug("Saving checkpoint", thread_id=thread_id, bytes=added)
+        self._account(thread_id, added, checkpoints=0 if stored else 1)
+        return result
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
     ) -> None:
-        """Persist checkpoint – 100 % LangGraph 0.5.x compatible."""
-        tid = config.get("configurable", {}).get("thread_id", "unknown")
-        logger.debug("Saving checkpoint", thread_id=tid)
-        await super().aput(config, checkpoint, metadata)  # ← keyword-only call
+        """Save pending writes and account for their size."""
+        thread_id = config["configurable"]["thread_id"]
+        outer_key = (
+            thread_id,
+            config["configurable"].get("checkpoint_ns", ""),
+            config["configurable"]["checkpoint_id"],
+        )
+        before = self._writes_size(outer_key, task_id)
+        super().put_writes(config, writes, task_id, task_path)
+        self._account(thread_id, self._writes_size(outer_key, task_id) - before)
+
+    def _writes_size(self, outer_key: Tuple[str, str, str], task_id: str) -> int:
+        entries = self.writes.get(outer_key)
+        if not entries:
+            return 0
+        return sum(len(w[2][1]) for w in entries.values() if w[0] == task_id)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get a checkpoint tuple, marking its thread as recently used."""
+        thread_id = config["configurable"]["thread_id"]
+        if thread_id in self._usage:
+            self._touch(thread_id)
+        return super().get_tuple(config)
 
     async def aget(self, config: RunnableConfig) -> Optional[Checkpoint]:
         tid = config.get("configurable", {}).get("thread_id", "unknown")
@@ -149,16 +259,80 @@ class EnhancedMemorySaver(MemorySaver):
         logger.debug("Checkpoint retrieved", thread_id=tid, found=bool(chk))
         return chk
 
-
-# Singleton
-_memory_saver: Optional[EnhancedMemorySaver] = None
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete a thread's checkpoints and release its accounted size."""
+        super().delete_thread(thread_id)
+        usage = self._usage.pop(thread_id, None)
+        if usage is not None:
+            self._total_bytes -= usage.bytes
+
+    def _evict(self, protect: Optional[str] = None) -> None:
+        """Drop expired threads, then least recently used ones over budget."""
+        cutoff = time.monotonic() - self.ttl
+        for thread_id, usage in list(self._usage.items()):
+            if usage.last_access >= cutoff:
+                break  # LRU order: every later thread is more recent
+            if thread_id != protect:
+                self._evict_thread(thread_id, "ttl")
+
+        for thread_id in list(self._usage):
+            if thread_id == protect:
+                continue
+            if self._total_bytes > self.max_bytes:
+                self._evict_thread(thread_id, "size")
+            elif len(self._usage) > self.max_threads:
+                self._evict_thread(thread_id, "threads")
+            else:
+                break
+
+    def _evict_thread(self, thread_id: str, reason: str) -> None:
+        usage = self._usage.get(thread_id)
+        self.delete_thread(thread_id)
+        self._evictions[reason] += 1
+        logger.debug(
+            "Evicted checkpoint thread",
+            thread_id=thread_id,
+            reason=reason,
+            bytes=usage.bytes if usage else 0,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry counts and sizes for the metrics endpoint."""
+        return {
+            "threads": len(self._usage),
+            "checkpoints": sum(u.checkpoints for u in self._usage.values()),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "evictions": dict(self._evictions),
+        }
+
+
+_memory_saver: Optional[Union[EnhancedMemorySaver, SqliteCheckpointSaver]] = None
 _lock = asyncio.Lock()
 
 
-async def get_memory_saver() -> EnhancedMemorySaver:
+async def get_memory_saver() -> Union[EnhancedMemorySaver, SqliteCheckpointSaver]:
+    """Get the process-wide checkpointer selected by ``CHECKPOINT_BACKEND``."""
     global _memory_saver
     if _memory_saver is None:
         async with _lock:
             if _memory_saver is None:
-                _memory_saver = EnhancedMemorySaver()
+                if settings.CHECKPOINT_BACKEND == "sqlite":
+                    _memory_saver = SqliteCheckpointSaver(
+                        settings.CHECKPOINT_DB_PATH,
+                        retention=settings.CHECKPOINT_RETENTION,
+                    )
+                else:
+                    _memory_saver = EnhancedMemorySaver(
+                        ttl=settings.CHECKPOINT_TTL,
+                        max_bytes=settings.CHECKPOINT_MAX_MB * 1024 * 1024,
+                    )
+                register_stats_provider("checkpointer", _memory_saver.stats)
     return _memory_saver
+
+
+def close_memory_saver() -> None:
+    """Commit queued checkpoint writes and close the database, if any."""
+    if isinstance(_memory_saver, SqliteCheckpointSaver):
+        _memory_saver.close()
@@ -0,0 +1,85 @@
+"""Side store that keeps scraped raw HTML out of the checkpointed graph state."""
+
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+
+class RawHtmlStore:
+    """Holds each run's raw HTML by reference until it has been cleaned.
+
+    ``scrape_posts`` stores the pages and puts only the returned reference in
+    ``GraphState``, so checkpoints never copy the HTML. ``clean_validate``
+    takes the pages out again, which releases them. Entries of runs that
+    fail before cleaning are dropped after ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl: float = 900.0):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        self._stats = {"stored": 0, "released": 0, "expired": 0}
+
+    def put(self, pages: Dict[str, str]) -> str:
+        """Store a run's pages and return the reference to keep in the state."""
+        self._expire()
+        ref = uuid.uuid4().hex
+        self._entries[ref] = (time.monotonic(), pages)
+        self._stats["stored"] += 1
+        return ref
+
+    def pop(self, ref: Optional[str]) -> Dict[str, str]:
+        """Take a run's pages out of the store (empty if unknown or expired)."""
+        if ref is None:
+            return {}
+        entry = self._entries.pop(ref, None)
+        if entry is None:
+            logger.warning("Raw HTML reference not found", ref=ref)
+            return {}
+        self._stats["released"] += 1
+        return entry[1]
+
+    def has(self, ref: Optional[str]) -> bool:
+        """Return whether the pages behind a reference are held by this process."""
+        return ref is not None and ref in self._entries
+
+    def release(self, ref: Optional[str]) -> None:
+        """Drop a run's pages without reading them."""
+        if ref is not None and self._entries.pop(ref, None) is not None:
+            self._stats["released"] += 1
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        for ref in [r for r, (stored, _) in self._entries.items() if stored < cutoff]:
+            del self._entries[ref]
+            self._stats["expired"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return live entry counts and sizes for the metrics endpoint."""
+        return {
+            **self._stats,
+            "live_refs": len(self._entries),
+            "live_pages": sum(len(pages) for _, pages in self._entries.values()),
+            "live_chars": sum(
+                len(html or "")
+                for _, pages in self._entries.values()
+                for html in pages.values()
+            ),
+        }
+
+
+# Singleton
+_raw_html_store: Optional[RawHtmlStore] = None
+
+
+def get_raw_html_store() -> RawHtmlStore:
+    """Get the process-wide raw HTML store."""
+    global _raw_html_store
+    if _raw_html_store is None:
+        _raw_html_store = RawHtmlStore()
+        register_stats_provider("raw_html_store", _raw_html_store.stats)
+    return _raw_html_store
@@ -0,0 +1,544 @@
+"""Durable LangGraph checkpointer stored in a local SQLite file."""
+
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    RunnableConfig,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Serialized values at least this large are stored zlib-compressed
+_COMPRESS_MIN_BYTES = 1024
+_COMPRESSED_SUFFIX = "+zlib"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE INDEX IF NOT EXISTS checkpoints_created_at ON checkpoints (created_at);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    data BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    data BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """Checkpointer that survives worker restarts.
+
+    Checkpoints, channel blobs and pending writes are serialized with the
+    saver's msgpack serializer, compressed with zlib when large, and stored
+    in a SQLite database running in WAL mode so every worker on the host
+    can share the file. Pending writes are queued in memory and committed
+    together with the next checkpoint in a single transaction (or once
+    ``batch_size`` rows are queued), so each superstep costs one commit.
+    Writes still queued when a worker dies only belong to the node that
+    was running, which is re-executed on resume anyway.
+
+    Threads whose newest checkpoint is older than ``retention`` seconds are
+    pruned when the database is opened and periodically afterwards.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        retention: float = 7 * 86400.0,
+        batch_size: int = 64,
+        prune_every: int = 500,
+    ):
+        super().__init__()
+        self.path = path
+        self.retention = retention
+        self.batch_size = batch_size
+        self.prune_every = prune_every
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._queued_writes: List[Tuple[Any, ...]] = []
+        self._puts_since_prune = 0
+        self._stats = {
+            "checkpoints_saved": 0,
+            "writes_saved": 0,
+            "commits": 0,
+            "bytes_written": 0,
+            "threads_pruned": 0,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the shared connection; callers must hold ``self._lock``."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._prune(conn)
+            logger.info("SQLite checkpointer opened", path=self.path)
+        return self._conn
+
+    def _dump(self, value: Any) -> Tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(value)
+        if len(data) >= _COMPRESS_MIN_BYTES:
+            return type_ + _COMPRESSED_SUFFIX, zlib.compress(data, 6)
+        return type_, data
+
+    def _load(self, type_: str, data: Optional[bytes]) -> Any:
+        if type_.endswith(_COMPRESSED_SUFFIX):
+            type_ = type_[: -len(_COMPRESSED_SUFFIX)]
+            data = zlib.decompress(data)
+        return self.serde.loads_typed((type_, data or b""))
+
+    # Write path
+
+    def _flush(self, conn: sqlite3.Connection) -> None:
+        """Write queued pending writes; callers must be inside a transaction."""
+        if not self._queued_writes:
+            return
+        for row in self._queued_writes:
+            # Indexed special writes (errors, interrupts) replace older ones,
+            # regular task writes are never overwritten once stored
+            verb = "INSERT OR REPLACE" if row[4] < 0 else "INSERT OR IGNORE"
+            conn.execute(
+                f"{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, "
+                "task_id, idx, channel, type, data, task_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+        self._stats["writes_saved"] += len(self._queued_writes)
+        self._queued_writes.clear()
+
+    def _commit(self, fn, *args) -> Any:
+        """Run ``fn(conn, *args)`` and flush queued writes in one transaction."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn, *args) if fn is not None else None
+            self._flush(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._stats["commits"] += 1
+        return result
+
+    def _flush_queued(self) -> None:
+        """Commit queued writes so reads observe them; callers hold the lock."""
+        if self._queued_writes:
+            self._commit(None)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Persist a checkpoint, its new channel values and queued writes."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        stored = checkpoint.copy()
+        values: Dict[str, Any] = stored.pop("channel_values")  # type: ignore[misc]
+        blobs = [
+            (
+                thread_id,
+                checkpoint_ns,
+                channel,
+                str(version),
+                *(
+                    self._dump(values[channel])
+                    if channel in values
+                    else ("empty", None)
+                ),
+            )
+            for channel, version in new_versions.items()
+        ]
+        checkpoint_type, checkpoint_data = self._dump(stored)
+        metadata_type, metadata_data = self._dump(
+            get_checkpoint_metadata(config, metadata)
+        )
+        row = (
+            thread_id,
+            checkpoint_ns,
+            checkpoint["id"],
+            config["configurable"].get("checkpoint_id"),
+            checkpoint_type,
+            checkpoint_data,
+            metadata_type,
+            metadata_data,
+            time.time(),
+        )
+
+        def write(conn: sqlite3.Connection) -> None:
+            conn.executemany(
+                "INSERT OR REPLACE INTO blobs (thread_id, checkpoint_ns, channel, "
+                "version, type, data) VALUES (?, ?, ?, ?, ?, ?)",
+                blobs,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, "
+                "checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                "metadata_type, metadata, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+
+        with self._lock:
+            self._commit(write)
+            self._stats["checkpoints_saved"] += 1
+            self._stats["bytes_written"] += (
+                len(checkpoint_data)
+                + len(metadata_data)
+                + sum(len(blob[5] or b"") for blob in blobs)
+            )
+            self._puts_since_prune += 1
+            if self.prune_every and self._puts_since_prune >= self.prune_every:
+                self._prune(self._connect())
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Queue a task's writes; they are committed with the next checkpoint."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = [
+            (
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self._dump(value),
+                task_path,
+            )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        with self._lock:
+            self._queued_writes.extend(rows)
+            if len(self._queued_writes) >= self.batch_size:
+                self._commit(None)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint, blob and write of a thread."""
+        with self._lock:
+            self._queued_writes = [
+                row for row in self._queued_writes if row[0] != thread_id
+            ]
+            self._commit(self._delete_threads, [thread_id])
+
+    @staticmethod
+    def _delete_threads(conn: sqlite3.Connection, thread_ids: List[str]) -> None:
+        params = [(thread_id,) for thread_id in thread_ids]
+        for table in ("checkpoints", "blobs", "writes"):
+            conn.executemany(f"DELETE FROM {table} WHERE thread_id = ?", params)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Delete threads whose newest checkpoint is older than ``retention``."""
+        self._puts_since_prune = 0
+        if not self.retention:
+            return
+        expired = [
+            row[0]
+            for row in conn.execute(
+                "SELECT thread_id FROM checkpoints GROUP BY thread_id "
+                "HAVING MAX(created_at) < ?",
+                (time.time() - self.retention,),
+            )
+        ]
+        if not expired:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._delete_threads(conn, expired)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._stats["threads_pruned"] += len(expired)
+        logger.info("Pruned expired checkpoint threads", threads=len(expired))
+
+    # Read path
+
+    def _tuple(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint_id: str,
+        parent_checkpoint_id: Optional[str],
+        checkpoint: Dict[str, Any],
+        metadata: CheckpointMetadata,
+    ) -> CheckpointTuple:
+        channel_values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            row = conn.execute(
+                "SELECT type, data FROM blobs WHERE thread_id = ? "
+                "AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if row is not None and row[0] != "empty":
+                channel_values[channel] = self._load(*row)
+        writes = conn.execute(
+            "SELECT task_id, channel, type, data FROM writes WHERE thread_id = ? "
+            "AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=metadata,
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self._load(type_, data))
+                for task_id, channel, type_, data in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get the requested checkpoint, or the thread's latest one."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            self._flush_queued()
+            conn = self._connect()
+            query = (
+                "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                "metadata_type, metadata FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ?"
+            )
+            if checkpoint_id:
+                row = conn.execute(
+                    query + " AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    query + " ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._tuple(
+                conn,
+                thread_id,
+                checkpoint_ns,
+                row[0],
+                row[1],
+                self._load(row[2], row[3]),
+                self._load(row[4], row[5]),
+            )
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints, newest first, matching the config and filters."""
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        results = []
+        with self._lock:
+            self._flush_queued()
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, "
+                "parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+                f"FROM checkpoints{where} ORDER BY checkpoint_id DESC",
+                params,
+            ).fetchall()
+            for row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                metadata = self._load(row[6], row[7])
+                if filter and not all(
+                    metadata.get(key) == value for key, value in filter.items()
+                ):
+                    continue
+                results.append(
+                    self._tuple(
+                        conn,
+                        row[0],
+                        row[1],
+                        row[2],
+                        row[3],
+                        self._load(row[4], row[5]),
+                        metadata,
+                    )
+                )
+        yield from results
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        """Return a sortable string version, as the in-memory saver does."""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # Async API, run in a worker thread
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        results = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in results:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def close(self) -> None:
+        """Commit queued writes and close the database."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._flush_queued()
+                finally:
+                    self._conn.close()
+                    self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return write counters and database size for the metrics endpoint."""
+        with self._lock:
+            conn = self._connect()
+            threads, checkpoints = conn.execute(
+                "SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM checkpoints"
+            ).fetchone()
+            queued = len(self._queued_writes)
+        return {
+            **self._stats,
+            "backend": "sqlite",
+            "threads": threads,
+            "checkpoints": checkpoints,
+            "queued_writes": queued,
+            "file_bytes": (
+                os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            ),
+        }
@@ -0,0 +1,32 @@
+"""Response schemas for structured Gemini output."""
+
+from pydantic import BaseModel, Field
+
+
+class SearchResultItem(BaseModel):
+    """A blog post suggested by Gemini grounding."""
+
+    url: str = Field(..., description="Absolute URL of the post")
+    title: str = Field(..., description="Title of the post")
+    snippet: str = Field(..., description="One or two sentence summary")
+
+
+class SEOEvaluation(BaseModel):
+    """SEO scores (0-100) assigned to a blog draft by the model."""
+
+    title_score: float = Field(..., description="Title quality, 0-100")
+    meta_description_score: float = Field(
+        ..., description="Meta description quality, 0-100"
+    )
+    keyword_optimization_score: float = Field(
+        ..., description="Keyword usage and placement, 0-100"
+    )
+    content_structure_score: float = Field(
+        ..., description="Heading and paragraph structure, 0-100"
+    )
+    readability_score: float = Field(..., description="Readability, 0-100")
+    content_quality_score: float = Field(
+        ..., description="Depth and usefulness of the content, 0-100"
+    )
+    technical_seo_score: float = Field(..., description="Technical SEO, 0-100")
+    final_score: float = Field(..., description="Overall SEO score, 0-100")
@@ -159,6 +159,7 @@ class ContentMetadata(BaseModel):
     content_language: str = Field(default="en", description="Content language")
     # generated_at=datetime.utcnow().isoformat()
     generated_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat(), description="ISO timestamp of generation")
+    retried_nodes: Dict[str, int] = Field(default_factory=dict, description="Workflow nodes retried from a checkpoint, with retry counts")
     
 class EnhancedBlogGenerationResponse(BaseModel):
     """Enhanced response schema with detailed information."""
@@ -18,6 +18,10 @@ class GraphState(BaseModel):
     cleaned_posts: List[Dict[str, Any]] = Field(
         default_factory=list, description="Cleaned and validated post content"
     )
+    posts_cleaned: bool = Field(
+        default=False,
+        description="Whether scraping already cleaned every scraped page",
+    )
     draft_blog: str = Field(default="", description="Generated blog content draft")
     seo_scores: Dict[str, float] = Field(
         default_factory=dict, description="SEO evaluation scores breakdown"
@@ -32,7 +36,8 @@ class GraphState(BaseModel):
     )
     final_blog: str = Field(default="", description="Final optimized blog content")
 
-    # Add raw_html_content field for scraping results
-    raw_html_content: Optional[Dict[str, str]] = Field(
-        default_factory=dict, description="Raw HTML content from scraped URLs"
+    # Raw HTML lives in the raw HTML side store so checkpoints never copy it
+    raw_html_ref: Optional[str] = Field(
+        default=None,
+        description="Raw HTML side store reference for scraped pages, None once cleaned",
     )
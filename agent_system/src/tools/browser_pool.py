@@ -0,0 +1,343 @@
+"""Process-wide pool of warm Playwright browsers shared by all scrape runs."""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+
+from src.config import settings
+from src.tools.request_blocking import CHROMIUM_BLOCKING_ARGS, RequestBlocker
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+# Viewport of pages opened in shared contexts
+_VIEWPORT = {"width": 1280, "height": 800}
+
+# Process names Chromium uses for its browser, renderer and helper processes
+_CHROMIUM_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+
+@dataclass
+class _BrowserSlot:
+    """A launched browser together with its usage counters."""
+
+    browser: Browser
+    generation: int
+    launched_at: float = field(default_factory=time.monotonic)
+    pages_served: int = 0
+    active_leases: int = 0
+    retired: bool = False
+    # One context per user agent, created with the request blocklist installed
+    contexts: Dict[str, BrowserContext] = field(default_factory=dict)
+    context_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class BrowserLease:
+    """Handle on a pooled browser, valid for the duration of one scrape run."""
+
+    def __init__(self, slot: _BrowserSlot, blocker: Optional[RequestBlocker] = None):
+        self._slot = slot
+        self._blocker = blocker
+
+    @property
+    def browser(self) -> Browser:
+        return self._slot.browser
+
+    async def new_page(self, **kwargs: Any) -> Page:
+        """Open a page on the leased browser and count it towards recycling."""
+        self._slot.pages_served += 1
+        return await self._slot.browser.new_page(**kwargs)
+
+    async def new_context_page(self, user_agent: str) -> Page:
+        """Open a page in the browser's shared context for ``user_agent``.
+
+        The context, and its request blocking rules, are created on first
+        use and reused by every later page with the same user agent.
+        """
+        slot = self._slot
+        context = slot.contexts.get(user_agent)
+        if context is None:
+            async with slot.context_lock:
+                context = slot.contexts.get(user_agent)
+                if context is None:
+                    context = await slot.browser.new_context(
+                        user_agent=user_agent, viewport=_VIEWPORT
+                    )
+                    if self._blocker is not None:
+                        await self._blocker.install(context)
+                    slot.contexts[user_agent] = context
+        slot.pages_served += 1
+        return await context.new_page()
+
+
+class BrowserPool:
+    """Long-lived Chromium instance leased to scrape runs.
+
+    The browser is launched once and reused by every run. It is recycled
+    after serving ``max_pages`` pages, when the Chromium process tree grows
+    beyond ``max_memory_mb``, or when it disconnects. Recycling never
+    interrupts a run: the old browser is retired and closed once its last
+    lease is returned, while new leases get a freshly launched browser.
+    """
+
+    def __init__(
+        self,
+        headless: bool = True,
+        max_pages: int = 200,
+        max_memory_mb: int = 1024,
+        health_check_interval: float = 30.0,
+        blocker: Optional[RequestBlocker] = None,
+    ):
+        self.headless = headless
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.health_check_interval = health_check_interval
+        self.blocker = blocker
+
+        self._playwright: Optional[Playwright] = None
+        self._current: Optional[_BrowserSlot] = None
+        self._retired: List[_BrowserSlot] = []
+        self._lock = asyncio.Lock()
+        self._health_task: Optional[asyncio.Task] = None
+        self._generation = 0
+        self._stats = {
+            "launches": 0,
+            "recycles": 0,
+            "recycle_reasons": {},
+            "leases": 0,
+            "health_checks": 0,
+            "last_rss_mb": None,
+        }
+
+    @property
+    def started(self) -> bool:
+        return self._playwright is not None
+
+    async def start(self) -> None:
+        """Start Playwright, launch the first browser and the health checker."""
+        async with self._lock:
+            await self._ensure_browser()
+        logger.info(
+            "Browser pool started",
+            max_pages=self.max_pages,
+            max_memory_mb=self.max_memory_mb,
+        )
+
+    async def stop(self) -> None:
+        """Close every browser and shut Playwright down."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+        async with self._lock:
+            slots = self._retired + ([self._current] if self._current else [])
+            self._current = None
+            self._retired = []
+            for slot in slots:
+                await self._close_slot(slot)
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+        logger.info("Browser pool stopped", **self.stats())
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[BrowserLease]:
+        """Lease the warm browser for one run, starting the pool if needed."""
+        async with self._lock:
+            slot = await self._ensure_browser()
+            slot.active_leases += 1
+            self._stats["leases"] += 1
+        try:
+            yield BrowserLease(slot, self.blocker)
+        finally:
+            async with self._lock:
+                slot.active_leases -= 1
+                if (
+                    slot is self._current
+                    and self.max_pages
+                    and slot.pages_served >= self.max_pages
+                ):
+                    self._retire_current("max_pages")
+                await self._close_drained()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool counters for the metrics endpoint."""
+        current = self._current
+        return {
+            **self._stats,
+            "recycle_reasons": dict(self._stats["recycle_reasons"]),
+            "generation": self._generation,
+            "active_leases": current.active_leases if current else 0,
+            "pages_served": current.pages_served if current else 0,
+            "retired_browsers": len(self._retired),
+            "contexts": len(current.contexts) if current else 0,
+            **(self.blocker.stats() if self.blocker else {}),
+        }
+
+    async def _ensure_browser(self) -> _BrowserSlot:
+        """Return a healthy current browser, launching one if needed.
+
+        Must be called with ``self._lock`` held.
+        """
+        if self._current is not None and not self._current.browser.is_connected():
+            self._retire_current("disconnected")
+
+        if self._current is None:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            if self._health_task is None and self.health_check_interval > 0:
+                self._health_task = asyncio.create_task(self._health_loop())
+            browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                args=list(CHROMIUM_BLOCKING_ARGS) if self.blocker else [],
+            )
+            self._generation += 1
+            self._current = _BrowserSlot(browser=browser, generation=self._generation)
+            self._stats["launches"] += 1
+            logger.info("Launched pooled browser", generation=self._generation)
+
+        return self._current
+
+    def _retire_current(self, reason: str) -> None:
+        """Move the current browser to the retired list.
+
+        Must be called with ``self._lock`` held.
+        """
+        slot = self._current
+        if slot is None:
+            return
+        slot.retired = True
+        self._retired.append(slot)
+        self._current = None
+        self._stats["recycles"] += 1
+        reasons = self._stats["recycle_reasons"]
+        reasons[reason] = reasons.get(reason, 0) + 1
+        logger.info(
+            "Recycling pooled browser",
+            generation=slot.generation,
+            reason=reason,
+            pages_served=slot.pages_served,
+        )
+
+    async def _close_drained(self) -> None:
+        """Close retired browsers that no longer have active leases."""
+        still_leased = []
+        for slot in self._retired:
+            if slot.active_leases > 0:
+                still_leased.append(slot)
+            else:
+                await self._close_slot(slot)
+        self._retired = still_leased
+
+    async def _close_slot(self, slot: _BrowserSlot) -> None:
+        try:
+            await slot.browser.close()
+        except Exception as e:
+            logger.warning(
+                "Error closing pooled browser", generation=slot.generation, error=str(e)
+            )
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.warning("Browser pool health check failed", error=str(e))
+
+    async def check_health(self) -> None:
+        """Recycle the browser if it disconnected or exceeds the memory ceiling."""
+        rss_mb = await asyncio.to_thread(_chromium_rss_mb)
+        async with self._lock:
+            self._stats["health_checks"] += 1
+            self._stats["last_rss_mb"] = rss_mb
+            if self._current is None:
+                return
+            if not self._current.browser.is_connected():
+                self._retire_current("disconnected")
+            elif (
+                rss_mb is not None
+                and self.max_memory_mb
+                and rss_mb > self.max_memory_mb
+            ):
+                self._retire_current("memory")
+            await self._close_drained()
+
+
+def _chromium_rss_mb() -> Optional[float]:
+    """Sum the resident memory of Chromium processes descended from this process.
+
+    Reads ``/proc`` directly; returns None on platforms without it.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+
+    children: Dict[int, List[int]] = {}
+    names: Dict[int, str] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Format: pid (comm) state ppid ...; comm may contain spaces
+        comm = stat[stat.find("(") + 1 : stat.rfind(")")]
+        ppid = int(stat[stat.rfind(")") + 2 :].split()[1])
+        pid = int(entry)
+        names[pid] = comm.lower()
+        children.setdefault(ppid, []).append(pid)
+
+    total_kb = 0
+    stack = list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        if not any(name in names.get(pid, "") for name in _CHROMIUM_PROCESS_NAMES):
+            continue
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+
+    return total_kb / 1024
+
+
+# Singleton
+_browser_pool: Optional[BrowserPool] = None
+
+
+async def get_browser_pool() -> BrowserPool:
+    """Get the process-wide browser pool (not started until first use)."""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool(
+            headless=os.getenv("PLAYWRIGHT_HEADLESS", "true").lower() == "true",
+            max_pages=settings.BROWSER_POOL_MAX_PAGES,
+            max_memory_mb=settings.BROWSER_POOL_MAX_MEMORY_MB,
+            health_check_interval=settings.BROWSER_POOL_HEALTH_INTERVAL,
+            blocker=RequestBlocker(),
+        )
+        register_stats_provider("browser_pool", _browser_pool.stats)
+    return _browser_pool
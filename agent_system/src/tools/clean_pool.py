@@ -0,0 +1,142 @@
+"""Bounded worker pool that runs HTML cleaning off the event loop."""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from src.config import settings
+from src.tools.extraction import ENGINES, clean_html_content, extractor_id
+from src.tools.html_cache import get_html_cache
+from src.utils.logger import configure_logging, get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+
+class CleanPool:
+    """Runs ``clean_html_content`` in worker processes or threads.
+
+    ``mode`` is "process" (parsing is CPU-bound and mostly holds the GIL),
+    "thread" (cheaper, useful with the lxml engine whose parser releases the
+    GIL) or "inline" (runs on the event loop, as before). At most ``2 * workers`` documents are queued
+    at once so large pages are not piled up in the pool's pipe.
+    """
+
+    def __init__(self, mode: str = "process", workers: int = 2, engine: str = "bs4"):
+        if mode not in ("process", "thread", "inline"):
+            raise ValueError(f"Unknown clean pool mode: {mode}")
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown extraction engine: {engine}")
+        self.mode = mode
+        self.engine = engine
+        self.workers = max(1, workers)
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats = {"submitted": 0, "in_flight": 0, "inline_fallbacks": 0}
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=configure_logging,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="clean"
+                )
+            logger.info("Clean pool started", mode=self.mode, workers=self.workers)
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.workers * 2)
+            self._loop = loop
+        return self._semaphore
+
+    async def clean(self, html: str, url: str) -> Optional[Dict[str, Any]]:
+        """Clean one page without blocking the event loop."""
+        if self.mode == "inline":
+            return clean_html_content(html, url, self.engine)
+
+        async with self._get_semaphore():
+            self._stats["submitted"] += 1
+            self._stats["in_flight"] += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._get_executor(), clean_html_content, html, url, self.engine
+                )
+            except BrokenProcessPool as e:
+                logger.error(
+                    "Clean pool broken, cleaning inline", url=url, error=str(e)
+                )
+                self._stats["inline_fallbacks"] += 1
+                self.shutdown(wait=False)
+                return clean_html_content(html, url, self.engine)
+            finally:
+                self._stats["in_flight"] -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "engine": self.engine,
+            **self._stats,
+        }
+
+
+# Singleton
+_clean_pool: Optional[CleanPool] = None
+
+
+def get_clean_pool() -> CleanPool:
+    """Get the process-wide clean pool."""
+    global _clean_pool
+    if _clean_pool is None:
+        _clean_pool = CleanPool(
+            mode=settings.CLEAN_POOL_MODE,
+            workers=settings.CLEAN_POOL_WORKERS,
+            engine=settings.EXTRACTION_ENGINE,
+        )
+        register_stats_provider("clean_pool", _clean_pool.stats)
+    return _clean_pool
+
+
+async def clean_html_off_loop(html: str, url: str) -> Optional[Dict[str, Any]]:
+    """Clean and extract content from HTML in the shared clean pool.
+
+    Results are cached by (URL, HTML digest, extractor id), so pages that
+    have not changed since they were last cleaned are never parsed again.
+    """
+    pool = get_clean_pool()
+    cache = get_html_cache()
+    extractor = extractor_id(pool.engine)
+    if cache is not None:
+        hit, post = await cache.get_post(url, html, extractor)
+        if hit:
+            logger.debug("Cleaned post served from cache", url=url)
+            return post
+
+    started = time.perf_counter()
+    post = await pool.clean(html, url)
+    if cache is not None:
+        await cache.put_post(url, html, extractor, post, time.perf_counter() - started)
+    return post
+
+
+def shutdown_clean_pool() -> None:
+    """Stop the clean pool workers (called from the app lifespan)."""
+    if _clean_pool is not None:
+        _clean_pool.shutdown()
@@ -0,0 +1,142 @@
+"""Process-wide per-domain concurrency and politeness limits for fetches."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional
+
+from src.config import settings
+from src.tools.http_fetcher import domain_of
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _DomainState:
+    semaphore: asyncio.Semaphore
+    spacing_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_start: float = 0.0
+    queued: int = 0
+    active: int = 0
+    fetches: int = 0
+    wait_seconds: float = 0.0
+
+
+class DomainScheduler:
+    """Gates fetches so no domain sees more than ``max_per_domain`` at once.
+
+    Consecutive fetches to the same domain also start at least
+    ``min_interval`` seconds apart. State is shared by every scrape run in
+    the process, so concurrent API requests hitting the same popular site
+    queue behind each other while fetches to other domains proceed freely.
+    """
+
+    def __init__(
+        self,
+        max_per_domain: int = 2,
+        min_interval: float = 1.0,
+        max_idle_domains: int = 1000,
+    ):
+        self.max_per_domain = max(1, max_per_domain)
+        self.min_interval = min_interval
+        self.max_idle_domains = max_idle_domains
+        self._domains: Dict[str, _DomainState] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _state(self, domain: str) -> _DomainState:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # asyncio primitives are bound to the loop they were first used on
+            self._domains = {}
+            self._loop = loop
+        state = self._domains.get(domain)
+        if state is None:
+            if len(self._domains) >= self.max_idle_domains:
+                self._prune()
+            state = _DomainState(semaphore=asyncio.Semaphore(self.max_per_domain))
+            self._domains[domain] = state
+        return state
+
+    def _prune(self) -> None:
+        """Forget domains with no queued or active fetches and no pending spacing."""
+        now = time.monotonic()
+        for domain, state in list(self._domains.items()):
+            if (
+                not state.queued
+                and not state.active
+                and now - state.last_start >= self.min_interval
+            ):
+                del self._domains[domain]
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Wait for a fetch slot on the URL's domain and hold it for the block."""
+        domain = domain_of(url)
+        state = self._state(domain)
+        queued_at = time.monotonic()
+        state.queued += 1
+        try:
+            await state.semaphore.acquire()
+        finally:
+            state.queued -= 1
+        try:
+            async with state.spacing_lock:
+                delay = state.last_start + self.min_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                state.last_start = time.monotonic()
+        except BaseException:
+            state.semaphore.release()
+            raise
+
+        waited = time.monotonic() - queued_at
+        state.wait_seconds += waited
+        state.fetches += 1
+        state.active += 1
+        if waited > self.min_interval:
+            logger.debug(
+                "Waited for domain slot", domain=domain, waited=round(waited, 2)
+            )
+        try:
+            yield
+        finally:
+            state.active -= 1
+            state.semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-domain queue depth and wait times for the metrics endpoint."""
+        return {
+            "max_per_domain": self.max_per_domain,
+            "min_interval": self.min_interval,
+            "queued_total": sum(s.queued for s in self._domains.values()),
+            "domains": {
+                domain: {
+                    "queued": s.queued,
+                    "active": s.active,
+                    "fetches": s.fetches,
+                    "avg_wait_seconds": (
+                        round(s.wait_seconds / s.fetches, 3) if s.fetches else 0.0
+                    ),
+                }
+                for domain, s in self._domains.items()
+            },
+        }
+
+
+# Singleton
+_domain_scheduler: Optional[DomainScheduler] = None
+
+
+def get_domain_scheduler() -> DomainScheduler:
+    """Get the process-wide domain scheduler."""
+    global _domain_scheduler
+    if _domain_scheduler is None:
+        _domain_scheduler = DomainScheduler(
+            max_per_domain=settings.DOMAIN_MAX_CONCURRENCY,
+            min_interval=settings.DOMAIN_MIN_INTERVAL,
+        )
+        register_stats_provider("domain_scheduler", _domain_scheduler.stats)
+    return _domain_scheduler
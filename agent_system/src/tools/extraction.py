@@ -0,0 +1,283 @@
+"""HTML content extraction used to turn scraped pages into cleaned posts.
+
+Kept free of Playwright and event-loop dependencies so it can run in
+worker processes.
+"""
+
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import trafilatura
+from bs4 import BeautifulSoup
+from trafilatura.utils import HTML_PARSER, load_html
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Tags whose content is never part of the article (removed by both engines)
+_EXCLUDED_TAGS = frozenset(["script", "style", "nav", "footer", "aside", "header"])
+_HEADING_TAGS = frozenset(["h1", "h2", "h3", "h4", "h5", "h6"])
+# Tags whose text differs between the engines when libxml2 closes them
+# implicitly (html.parser only closes a tag at its end tag)
+_NESTING_TAGS = _EXCLUDED_TAGS | _HEADING_TAGS | {"p", "title"}
+_IMPLIED_TAGS = frozenset(["html", "head", "body"])
+_VOID_TAGS = frozenset(
+    "area base br col embed hr img input link meta param source track wbr".split()
+)
+_TOKEN_RE = re.compile(
+    r"<!--.*?-->|<(?:script|style)\b[^>]*>(?P<raw>.*?)</(?:script|style)\s*>"
+    r"|<(?P<closing>/?)(?P<name>[a-zA-Z][a-zA-Z0-9]*)\b[^>]*?(?P<empty>/?)>",
+    re.DOTALL | re.IGNORECASE,
+)
+_MISMATCH_RE = re.compile(r"end tag : (\w+)|mismatch: (\w+) and (\w+)")
+_UNKNOWN_TAG_RE = re.compile(r"^Tag \w+ invalid")
+# trafilatura parses with one shared parser; its error log is read right after
+_parse_lock = threading.Lock()
+
+ENGINES = ("bs4", "lxml")
+
+# Bump whenever extraction output changes so cached cleaned posts are invalidated
+EXTRACTOR_VERSION = 2
+
+
+def extractor_id(engine: str) -> str:
+    """Identify the extraction logic that produced a cleaned post."""
+    return f"{engine}-v{EXTRACTOR_VERSION}"
+
+
+def clean_html_content(
+    html: str, url: str, engine: str = "bs4"
+) -> Optional[Dict[str, Any]]:
+    """Clean and extract content from HTML.
+
+    Args:
+        html: Raw HTML content
+        url: Source URL
+        engine: "bs4" (reference BeautifulSoup engine) or "lxml" (single-parse engine)
+
+    Returns:
+        Cleaned content dictionary or None if extraction fails
+    """
+    try:
+        if engine == "lxml":
+            title, meta_desc, headings, paragraphs = _extract_lxml(html)
+        elif engine == "bs4":
+            title, meta_desc, headings, paragraphs = _extract_bs4(html)
+        else:
+            raise ValueError(f"Unknown extraction engine: {engine}")
+
+        # Calculate word count
+        all_text = " ".join(paragraphs)
+        word_count = len(all_text.split())
+
+        if word_count < 100:  # Skip articles that are too short
+            logger.warning("Article too short", url=url, word_count=word_count)
+            return None
+
+        cleaned_content = {
+            "url": url,
+            "title": title,
+            "meta_description": meta_desc,
+            "headings": headings,
+            "paragraphs": paragraphs,
+            "word_count": word_count,
+        }
+
+        logger.debug(
+            "Content cleaned successfully",
+            url=url,
+            engine=engine,
+            word_count=word_count,
+            paragraphs=len(paragraphs),
+            headings=len(headings),
+        )
+
+        return cleaned_content
+
+    except Exception as e:
+        logger.error("Failed to clean HTML content", url=url, error=str(e))
+        return None
+
+
+def _split_extracted_text(extracted_text: Optional[str]) -> Optional[List[str]]:
+    """Split trafilatura output into paragraphs."""
+    if not extracted_text:
+        return None
+    return [p.strip() for p in extracted_text.split("\n\n") if p.strip()]
+
+
+def _extract_bs4(html: str) -> Tuple[str, str, List[str], List[str]]:
+    """Reference engine: BeautifulSoup with a trafilatura re-parse fallback."""
+    # Try BeautifulSoup first
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Remove unwanted elements
+    for element in soup(list(_EXCLUDED_TAGS)):
+        element.decompose()
+
+    # Extract title
+    title = ""
+    title_tag = soup.find("title")
+    if title_tag:
+        title = title_tag.get_text().strip()
+
+    # Extract meta description
+    meta_desc = ""
+    meta_tag = soup.find("meta", attrs={"name": "description"})
+    if meta_tag and meta_tag.get("content"):
+        meta_desc = meta_tag.get("content").strip()
+
+    # Extract headings
+    headings = []
+    for heading in soup.find_all(list(_HEADING_TAGS)):
+        text = heading.get_text().strip()
+        if text:
+            headings.append(text)
+
+    # Extract paragraphs
+    paragraphs = []
+    for p in soup.find_all("p"):
+        text = p.get_text().strip()
+        if text and len(text) > 20:  # Filter out short paragraphs
+            paragraphs.append(text)
+
+    # If BeautifulSoup didn't get enough content, try trafilatura
+    if len(paragraphs) < 3:
+        paragraphs = _split_extracted_text(trafilatura.extract(html)) or paragraphs
+
+    return title, meta_desc, headings, paragraphs
+
+
+def _extract_lxml(html: str) -> Tuple[str, str, List[str], List[str]]:
+    """Single-parse engine: one lxml tree feeds both passes.
+
+    The document is parsed once with trafilatura's own loader, read without
+    modification, and the same tree is handed to trafilatura when too few
+    paragraphs are found, so the fallback never re-parses the HTML.
+
+    libxml2 closes unclosed paragraphs and headings at the next block
+    element, while html.parser nests everything up to their end tag. Pages
+    where that happens are handed to the reference engine so both engines
+    always agree.
+    """
+    with _parse_lock:
+        tree = load_html(html)
+        errors = [entry.message for entry in HTML_PARSER.error_log]
+    if tree is None:
+        return "", "", [], []
+    if not _nested_as_written(html, errors):
+        logger.debug("Malformed nesting, using the reference engine")
+        return _extract_bs4(html)
+
+    title: Optional[str] = None
+    meta_desc = ""
+    meta_found = False
+    headings: List[str] = []
+    paragraphs: List[str] = []
+
+    # Depth-first walk in document order, skipping excluded subtrees
+    stack = [tree]
+    while stack:
+        element = stack.pop()
+        tag = element.tag
+        if not isinstance(tag, str) or tag in _EXCLUDED_TAGS:
+            continue
+
+        if tag in _HEADING_TAGS:
+            text = _element_text(element).strip()
+            if text:
+                headings.append(text)
+        elif tag == "p":
+            text = _element_text(element).strip()
+            if text and len(text) > 20:  # Filter out short paragraphs
+                paragraphs.append(text)
+        elif tag == "title" and title is None:
+            title = _element_text(element).strip()
+        elif tag == "meta" and not meta_found and element.get("name") == "description":
+            meta_found = True
+            content = element.get("content")
+            if content:
+                meta_desc = content.strip()
+
+        stack.extend(reversed(element))
+
+    # Not enough paragraphs: let trafilatura work on the already parsed tree
+    if len(paragraphs) < 3:
+        paragraphs = _split_extracted_text(trafilatura.extract(tree)) or paragraphs
+
+    return title or "", meta_desc, headings, paragraphs
+
+
+def _nested_as_written(html: str, parse_errors: List[str]) -> bool:
+    """Return whether both parsers build the same tree for the extracted tags.
+
+    The tags are replayed the way html.parser nests them. Paragraphs,
+    headings and excluded tags must be closed explicitly, and only by their
+    own end tag, and libxml2 must not have met an end tag for an element it
+    had already closed on its own (stray end tags are ignored by both).
+    """
+    stack: List[str] = []
+    stray: Counter = Counter()
+    for match in _TOKEN_RE.finditer(html):
+        raw, closing, name, self_closing = match.group(
+            "raw", "closing", "name", "empty"
+        )
+        if raw is not None and "</" in raw:
+            return False  # libxml2 ends scripts at the first end tag inside
+        if name is None:
+            continue  # comment, script or style block
+        name = name.lower()
+        if name in _IMPLIED_TAGS or name in _VOID_TAGS:
+            continue
+        if not closing:
+            if self_closing:
+                return False  # html.parser closes it at once, libxml2 does not
+            stack.append(name)
+        elif name not in stack:
+            stray[name] += 1
+        else:
+            while True:
+                open_name = stack.pop()
+                if open_name == name:
+                    break
+                if open_name in _NESTING_TAGS:
+                    return False
+    if any(name in _NESTING_TAGS for name in stack):
+        return False
+
+    unexpected: Counter = Counter()
+    for message in parse_errors:
+        if _UNKNOWN_TAG_RE.search(message):
+            continue  # HTML5 elements libxml2 does not know, parsed as written
+        match = _MISMATCH_RE.search(message)
+        if match is None:
+            return False
+        if match.group(1):
+            unexpected[match.group(1).lower()] += 1
+        elif any(name.lower() in _NESTING_TAGS for name in match.group(2, 3)):
+            return False
+    return all(count <= stray[name] for name, count in unexpected.items())
+
+
+def _element_text(element: Any) -> str:
+    """Concatenate an element's text, skipping excluded subtrees and comments."""
+    parts = [element.text or ""]
+    stack = list(reversed(element))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            parts.append(node)
+            continue
+        if isinstance(node.tag, str) and node.tag not in _EXCLUDED_TAGS:
+            parts.append(node.text or "")
+            # Push the tail first so it is emitted after the children
+            if node.tail:
+                stack.append(node.tail)
+            stack.extend(reversed(node))
+        elif node.tail:
+            parts.append(node.tail)
+    return "".join(parts)
@@ -0,0 +1,181 @@
+"""Negative cache of failing URLs and circuit breaker for failing domains."""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.tools.http_fetcher import domain_of
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _FailureRecord:
+    consecutive: int = 0
+    last_kind: str = ""
+    open_until: float = 0.0
+
+
+class FailureTracker:
+    """Remembers recent fetch failures and cools failing sources down.
+
+    A URL that fails (timeout, HTTP error, bot wall) is skipped for
+    ``base_cooldown`` seconds, doubling with every consecutive failure up
+    to ``max_cooldown``. A domain trips its breaker after
+    ``domain_threshold`` consecutive failures across any of its URLs and is
+    then skipped with the same exponential cool-down. Once a cool-down
+    expires fetches are let through again; a success resets the counters,
+    another failure re-opens the circuit for twice as long. Domains with
+    failures that have not tripped the breaker are scheduled after healthy
+    ones.
+    """
+
+    def __init__(
+        self,
+        base_cooldown: float = 300.0,
+        max_cooldown: float = 6 * 3600.0,
+        domain_threshold: int = 3,
+        max_entries: int = 5000,
+    ):
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.domain_threshold = max(1, domain_threshold)
+        self.max_entries = max_entries
+        self._urls: "OrderedDict[str, _FailureRecord]" = OrderedDict()
+        self._domains: "OrderedDict[str, _FailureRecord]" = OrderedDict()
+        self._stats = {"failures": {}, "skipped_urls": 0, "skipped_domains": 0}
+
+    def _cooldown(self, strikes: int) -> float:
+        return min(self.max_cooldown, self.base_cooldown * 2 ** max(0, strikes - 1))
+
+    def _record(
+        self, table: "OrderedDict[str, _FailureRecord]", key: str
+    ) -> _FailureRecord:
+        record = table.get(key)
+        if record is None:
+            record = table[key] = _FailureRecord()
+            if len(table) > self.max_entries:
+                table.popitem(last=False)
+        table.move_to_end(key)
+        return record
+
+    def record_failure(self, url: str, kind: str) -> None:
+        """Record a failed fetch.
+
+        Args:
+            url: URL that failed
+            kind: Failure class, e.g. "timeout", "http_503", "bot_wall", "error"
+        """
+        now = time.monotonic()
+        failures = self._stats["failures"]
+        failures[kind] = failures.get(kind, 0) + 1
+
+        url_record = self._record(self._urls, url)
+        url_record.consecutive += 1
+        url_record.last_kind = kind
+        url_record.open_until = now + self._cooldown(url_record.consecutive)
+
+        domain = domain_of(url)
+        domain_record = self._record(self._domains, domain)
+        domain_record.consecutive += 1
+        domain_record.last_kind = kind
+        strikes = domain_record.consecutive - self.domain_threshold + 1
+        if strikes > 0:
+            domain_record.open_until = now + self._cooldown(strikes)
+            logger.info(
+                "Domain circuit opened",
+                domain=domain,
+                failures=domain_record.consecutive,
+                kind=kind,
+                cooldown=self._cooldown(strikes),
+            )
+
+    def record_success(self, url: str) -> None:
+        """Clear the failure history of a URL and its domain."""
+        self._urls.pop(url, None)
+        self._domains.pop(domain_of(url), None)
+
+    def skip_reason(self, url: str) -> Optional[str]:
+        """Return why the URL should not be fetched now, or None."""
+        now = time.monotonic()
+        domain_record = self._domains.get(domain_of(url))
+        if domain_record is not None and domain_record.open_until > now:
+            return f"domain_cooldown:{domain_record.last_kind}"
+        url_record = self._urls.get(url)
+        if url_record is not None and url_record.open_until > now:
+            return f"url_cooldown:{url_record.last_kind}"
+        return None
+
+    def triage(self, urls: List[str]) -> Tuple[List[str], Dict[str, str]]:
+        """Split URLs into those worth fetching and those in cool-down.
+
+        Returns:
+            Tuple of (URLs to fetch with healthy domains first, skipped URL -> reason)
+        """
+        to_fetch, skipped = [], {}
+        for url in urls:
+            reason = self.skip_reason(url)
+            if reason is None:
+                to_fetch.append(url)
+            else:
+                skipped[url] = reason
+                key = (
+                    "skipped_domains" if reason.startswith("domain") else "skipped_urls"
+                )
+                self._stats[key] += 1
+
+        def recent_failures(url: str) -> int:
+            record = self._domains.get(domain_of(url))
+            return record.consecutive if record else 0
+
+        # list.sort is stable, so healthy URLs keep their search ranking order
+        to_fetch.sort(key=recent_failures)
+        if skipped:
+            logger.info(
+                "Skipping URLs in failure cool-down",
+                skipped=len(skipped),
+                remaining=len(to_fetch),
+            )
+        return to_fetch, skipped
+
+    def stats(self) -> Dict[str, Any]:
+        """Return failure counters and open circuits for the metrics endpoint."""
+        now = time.monotonic()
+        return {
+            "failures": dict(self._stats["failures"]),
+            "skipped_urls": self._stats["skipped_urls"],
+            "skipped_domains": self._stats["skipped_domains"],
+            "urls_cooling_down": sum(
+                1 for r in self._urls.values() if r.open_until > now
+            ),
+            "open_domains": {
+                domain: {
+                    "failures": r.consecutive,
+                    "last_kind": r.last_kind,
+                    "retry_in": round(r.open_until - now, 1),
+                }
+                for domain, r in self._domains.items()
+                if r.open_until > now
+            },
+        }
+
+
+# Singleton
+_failure_tracker: Optional[FailureTracker] = None
+
+
+def get_failure_tracker() -> FailureTracker:
+    """Get the process-wide failure tracker."""
+    global _failure_tracker
+    if _failure_tracker is None:
+        _failure_tracker = FailureTracker(
+            base_cooldown=settings.FAILURE_BASE_COOLDOWN,
+            max_cooldown=settings.FAILURE_MAX_COOLDOWN,
+            domain_threshold=settings.DOMAIN_FAILURE_THRESHOLD,
+        )
+        register_stats_provider("failure_tracker", _failure_tracker.stats)
+    return _failure_tracker
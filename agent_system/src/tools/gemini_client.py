@@ -3,10 +3,27 @@
 import os
 import asyncio
 from dataclasses import dataclass, fields
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
 from google import genai
 from google.genai import types
+from pydantic import TypeAdapter, ValidationError
 from src.config import settings
+from src.tools.rate_governor import (
+    estimate_tokens,
+    get_rate_governor,
+    is_rate_limited,
+)
+from src.tools.llm_cache import LlmCache, get_llm_cache, llm_cache_key
+from src.tools.llm_retry import EmptyResponseError, call_with_retries
+from src.tools.single_flight import get_single_flight
+from src.tools.structured_output import (
+    REPAIR_PROMPT,
+    StructuredOutputError,
+    error_summary,
+    get_structured_stats,
+    repair_json_text,
+    schema_name,
+)
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -51,39 +68,267 @@ class GeminiClient:
         return cls._instance
 
     async def generate_content(
-        self, prompt: str, use_search: bool = False, **overrides: Any
+        self,
+        prompt: str,
+        use_search: bool = False,
+        response_schema: Optional[Any] = None,
+        cache: bool = True,
+        **overrides: Any,
+    ) -> Any:
+        """Generate a response for a prompt.
+
+        Concurrent calls with the same prompt and config share one request.
+
+        Args:
+            prompt: Prompt text
+            use_search: Enable Google Search grounding (not combinable with
+                ``response_schema``)
+            response_schema: Pydantic model or ``list[Model]``; when given the
+                model is constrained to JSON matching it and the parsed,
+                validated object is returned instead of text
+            cache: Set False to bypass the response cache for this call
+            **overrides: GenerateContentConfig fields, e.g. ``temperature``
+
+        Returns:
+            Response text, or the parsed object in structured mode
+
+        Raises:
+            StructuredOutputError: If a structured response does not match
+                the schema even after the repair pass
+        """
+        if response_schema is not None:
+            return await self._generate_structured(
+                prompt, response_schema, overrides, cache
+            )
+        return await self._generate_text(prompt, use_search, overrides, cache)
+
+    async def generate_content_stream(
+        self, prompt: str, **overrides: Any
+    ) -> AsyncIterator[str]:
+        """Generate a text response, yielding its chunks as they arrive.
+
+        Calls are rate governed and retried like ``generate_content`` until
+        the first chunk arrives; after that errors are raised to the caller.
+        Streamed calls bypass the response cache and are not coalesced.
+
+        Args:
+            prompt: Prompt text
+            **overrides: GenerateContentConfig fields, e.g. ``temperature``
+
+        Yields:
+            Response text chunks
+        """
+        gen_config = self._build_config(False, overrides)
+        governor = get_rate_governor()
+        estimate = estimate_tokens(prompt, gen_config.max_output_tokens)
+
+        async def open_stream() -> Tuple[AsyncIterator[Any], str]:
+            if governor is not None:
+                await governor.acquire(estimate)
+            try:
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=self.model_name, contents=prompt, config=gen_config
+                )
+                async for chunk in stream:
+                    if chunk.text:
+                        return stream, chunk.text
+            except Exception as e:
+                if governor is not None and is_rate_limited(e):
+                    governor.record_throttled()
+                raise
+            raise EmptyResponseError("Empty response from Gemini API")
+
+        try:
+            stream, first = await call_with_retries(open_stream)
+            if governor is not None:
+                governor.record_success()
+            yield first
+            length = len(first)
+            usage = None
+            async for chunk in stream:
+                usage = chunk.usage_metadata or usage
+                if chunk.text:
+                    length += len(chunk.text)
+                    yield chunk.text
+        except Exception as e:
+            logger.error("Gemini streaming generation failed", error=str(e))
+            raise
+        if governor is not None:
+            governor.record_usage(estimate, getattr(usage, "total_token_count", None))
+        logger.info("Streamed content", prompt_len=len(prompt), response_len=length)
+
+    async def _generate_structured(
+        self,
+        prompt: str,
+        response_schema: Any,
+        overrides: Dict[str, Any],
+        cache: bool = True,
+    ) -> Any:
+        """Generate JSON constrained to a schema and parse it.
+
+        A response that fails validation is first repaired locally (code
+        fences, surrounding prose, trailing commas). Only if that fails is a
+        single repair request sent, which carries just the broken JSON and
+        the validation error, not the original prompt. Responses are only
+        cached once they validate, so a malformed one is never replayed.
+        """
+        name = schema_name(response_schema)
+        adapter = TypeAdapter(response_schema)
+        stats = get_structured_stats()
+        structured = {
+            **overrides,
+            "response_mime_type": "application/json",
+            "response_schema": response_schema,
+        }
+
+        def validates(text: str) -> bool:
+            return _validates(adapter, text)
+
+        def validates_after_repair(text: str) -> bool:
+            repaired = repair_json_text(text)
+            return validates(text) or (repaired is not None and validates(repaired))
+
+        text = await self._generate_text(
+            prompt, False, structured, cache, accept=validates_after_repair
+        )
+        try:
+            value = adapter.validate_json(text)
+            stats.record(name, "parsed")
+            return value
+        except ValidationError as e:
+            error = e
+
+        repaired = repair_json_text(text)
+        if repaired is not None:
+            try:
+                value = adapter.validate_json(repaired)
+                stats.record(name, "repaired_locally")
+                return value
+            except ValidationError as e:
+                error = e
+
+        logger.warning(
+            "Structured response invalid, requesting repair",
+            schema=name,
+            error=error_summary(error),
+        )
+        repair_prompt = REPAIR_PROMPT.format(
+            error=error_summary(error), text=repaired or text
+        )
+        text = await self._generate_text(
+            repair_prompt,
+            False,
+            {**structured, "temperature": 0.0},
+            cache,
+            accept=validates,
+        )
+        try:
+            value = adapter.validate_json(text)
+        except ValidationError as e:
+            stats.record(name, "failed")
+            raise StructuredOutputError(
+                f"Response does not match {name}: {error_summary(e)}"
+            ) from e
+        stats.record(name, "repaired_by_model")
+        return value
+
+    def _build_config(
+        self, use_search: bool, overrides: Dict[str, Any]
+    ) -> types.GenerateContentConfig:
+        """Return the effective GenerateContentConfig of a call."""
+        if use_search:
+            # Enable Google Search grounding
+            grounding_tool = types.Tool(google_search=types.GoogleSearch())
+            return types.GenerateContentConfig(
+                temperature=self.base_config.temperature,
+                max_output_tokens=self.base_config.max_output_tokens,
+                tools=[grounding_tool],
+            )
+        # Apply any overrides
+        valid = {k: v for k, v in overrides.items() if k in self._config_fields}
+        return (
+            _dataclass_replace(self.base_config, **valid) if valid else self.base_config
+        )
+
+    async def _generate_text(
+        self,
+        prompt: str,
+        use_search: bool,
+        overrides: Dict[str, Any],
+        cache: bool = True,
+        accept: Optional[Callable[[str], bool]] = None,
     ) -> str:
+        """Generate text; only responses ``accept`` approves of are cached."""
         try:
-            if use_search:
-                # Enable Google Search grounding
-                grounding_tool = types.Tool(google_search=types.GoogleSearch())
-                gen_config = types.GenerateContentConfig(
-                    temperature=self.base_config.temperature,
-                    max_output_tokens=self.base_config.max_output_tokens,
-                    tools=[grounding_tool],
-                )
-            else:
-                # Apply any overrides
-                valid = {k: v for k, v in overrides.items() if k in self._config_fields}
-                gen_config = (
-                    _dataclass_replace(self.base_config, **valid)
-                    if valid
-                    else self.base_config
-                )
+            gen_config = self._build_config(use_search, overrides)
+
+            key = llm_cache_key(self.model_name, prompt, gen_config, use_search)
+            response_cache = get_llm_cache() if cache else None
+            if response_cache is not None and not response_cache.accepts(
+                gen_config.temperature
+            ):
+                response_cache = None
+            if response_cache is not None:
+                cached = await response_cache.get(key)
+                if cached is not None:
+                    logger.info("Served content from LLM cache", prompt_len=len(prompt))
+                    return cached
 
+            # Identical concurrent calls share one request (and its retries)
+            return await get_single_flight("gemini").do(
+                (key, response_cache is not None),
+                lambda: call_with_retries(
+                    lambda: self._request(
+                        prompt, gen_config, key, response_cache, accept
+                    )
+                ),
+            )
+        except Exception as e:
+            logger.error("Gemini generation failed", error=str(e))
+            raise
+
+    async def _request(
+        self,
+        prompt: str,
+        gen_config: types.GenerateContentConfig,
+        key: str,
+        response_cache: Optional[LlmCache],
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        governor = get_rate_governor()
+        estimate = estimate_tokens(prompt, gen_config.max_output_tokens)
+        if governor is not None:
+            await governor.acquire(estimate)
+        try:
             response = await self.client.aio.models.generate_content(
                 model=self.model_name, contents=prompt, config=gen_config
             )
-            text = response.text or ""
-            if not text:
-                raise ValueError("Empty response from Gemini API")
-            logger.info(
-                "Generated content", prompt_len=len(prompt), response_len=len(text)
-            )
-            return text
         except Exception as e:
-            logger.error("Gemini generation failed", error=str(e))
+            if governor is not None and is_rate_limited(e):
+                governor.record_throttled()
             raise
+        usage = getattr(response, "usage_metadata", None)
+        tokens = getattr(usage, "total_token_count", None)
+        if governor is not None:
+            governor.record_success()
+            governor.record_usage(estimate, tokens)
+
+        text = response.text or ""
+        if not text:
+            raise EmptyResponseError("Empty response from Gemini API")
+        logger.info("Generated content", prompt_len=len(prompt), response_len=len(text))
+        if response_cache is not None and (accept is None or accept(text)):
+            await response_cache.put(key, text, tokens or 0)
+        return text
+
+
+def _validates(adapter: TypeAdapter, text: str) -> bool:
+    """Return whether JSON text matches the adapter's schema."""
+    try:
+        adapter.validate_json(text)
+    except ValidationError:
+        return False
+    return True
 
 
 def _dataclass_replace(dc_obj: Any, **kwargs: Any) -> Any:
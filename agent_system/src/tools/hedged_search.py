@@ -0,0 +1,158 @@
+"""Hedged execution of search providers: first valid result set wins."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+Posts = List[Dict[str, Any]]
+Provider = Tuple[str, Callable[[], Awaitable[Optional[Posts]]]]
+
+
+def valid_posts(posts: Optional[Posts], min_posts: int = 5) -> bool:
+    """Return whether a result set has at least ``min_posts`` posts with URLs."""
+    if not isinstance(posts, list):
+        return False
+    return sum(1 for p in posts if isinstance(p, dict) and p.get("url")) >= min_posts
+
+
+class HedgeStats:
+    """Process-wide counters of hedged searches, winners and latency saved."""
+
+    def __init__(self):
+        self._stats = {
+            "searches": 0,
+            "hedges_started": 0,
+            "no_valid_result": 0,
+            "wins": {},
+            "latency_saved_seconds": 0.0,
+        }
+
+    def record(self, winner: Optional[str], hedged: bool, saved: float) -> None:
+        self._stats["searches"] += 1
+        if hedged:
+            self._stats["hedges_started"] += 1
+        if winner is None:
+            self._stats["no_valid_result"] += 1
+        else:
+            wins = self._stats["wins"]
+            wins[winner] = wins.get(winner, 0) + 1
+        self._stats["latency_saved_seconds"] += max(0.0, saved)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "wins": dict(self._stats["wins"]),
+            "latency_saved_seconds": round(self._stats["latency_saved_seconds"], 3),
+        }
+
+
+async def hedged_search(
+    primary: Provider,
+    fallback: Provider,
+    delay: float,
+    is_valid: Callable[[Optional[Posts]], bool] = valid_posts,
+) -> Tuple[Optional[str], Optional[Posts]]:
+    """Run ``primary``, starting ``fallback`` after ``delay`` seconds.
+
+    The fallback also starts as soon as the primary finishes without a valid
+    result. The first valid result set wins and the other provider is
+    cancelled. If neither is valid, the first non-empty result set (primary
+    preferred) is returned so callers keep their previous behaviour.
+
+    The latency saved is estimated against running the providers one after
+    the other: the primary's run time (until it failed or was cancelled)
+    plus the fallback's run time, minus the time actually taken.
+
+    Args:
+        primary: (name, coroutine factory) tried first
+        fallback: (name, coroutine factory) used as the hedge
+        delay: Seconds to wait for the primary before hedging (0 = at once)
+        is_valid: Predicate deciding whether a result set can win
+
+    Returns:
+        Tuple of (winning provider name or None, posts or None)
+    """
+    start = time.monotonic()
+    names: Dict[asyncio.Task, str] = {}
+    started: Dict[str, float] = {}
+    finished: Dict[str, float] = {}
+    results: Dict[str, Optional[Posts]] = {}
+
+    def launch(provider: Provider) -> asyncio.Task:
+        name, factory = provider
+        task = asyncio.create_task(factory())
+        names[task] = name
+        started[name] = time.monotonic()
+        return task
+
+    def collect(task: asyncio.Task) -> Optional[Posts]:
+        name = names[task]
+        finished[name] = time.monotonic()
+        try:
+            results[name] = task.result()
+        except Exception as e:
+            logger.warning("Search provider failed", provider=name, error=str(e))
+            results[name] = None
+        return results[name]
+
+    winner = None
+    pending = {launch(primary)}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=max(0.0, delay))
+        for task in done:
+            if is_valid(collect(task)):
+                winner = names[task]
+        if winner is None:
+            pending.add(launch(fallback))
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if is_valid(collect(task)) and winner is None:
+                        winner = names[task]
+    finally:
+        for task in pending:
+            task.cancel()
+
+    elapsed = time.monotonic() - start
+    primary_name, fallback_name = primary[0], fallback[0]
+    hedged = fallback_name in started
+    saved = 0.0
+    if winner == fallback_name:
+        primary_time = finished.get(primary_name, start + elapsed) - start
+        fallback_time = finished[fallback_name] - started[fallback_name]
+        saved = primary_time + fallback_time - elapsed
+    get_hedge_stats().record(winner, hedged, saved)
+
+    if winner is not None:
+        logger.info(
+            "Hedged search finished",
+            winner=winner,
+            hedged=hedged,
+            elapsed=round(elapsed, 3),
+            latency_saved=round(max(0.0, saved), 3),
+        )
+        return winner, results[winner]
+    for name in (primary_name, fallback_name):
+        if results.get(name):
+            return None, results[name]
+    return None, None
+
+
+# Singleton
+_hedge_stats: Optional[HedgeStats] = None
+
+
+def get_hedge_stats() -> HedgeStats:
+    """Get the process-wide hedged search counters."""
+    global _hedge_stats
+    if _hedge_stats is None:
+        _hedge_stats = HedgeStats()
+        register_stats_provider("hedged_search", _hedge_stats.stats)
+    return _hedge_stats
@@ -0,0 +1,470 @@
+"""Persistent, content-addressed cache of fetched HTML shared across workers."""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from src.config import settings
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+# Query parameters that never change the page content: any utm_* parameter
+# plus these exact names
+_TRACKING_PREFIX = "utm_"
+_TRACKING_PARAMS = frozenset({"gclid", "fbclid", "mc_cid", "mc_eid", "ref", "ref_src"})
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url_key TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    tier TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+CREATE INDEX IF NOT EXISTS pages_digest ON pages (digest);
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cleaned_posts (
+    url_key TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    extractor TEXT NOT NULL,
+    post TEXT,
+    clean_seconds REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (url_key, digest, extractor)
+);
+CREATE INDEX IF NOT EXISTS cleaned_posts_accessed_at ON cleaned_posts (accessed_at);
+"""
+
+
+def html_digest(html: str) -> str:
+    """Return the SHA-256 hex digest identifying an HTML document."""
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name.startswith(_TRACKING_PREFIX) or name in _TRACKING_PARAMS
+
+
+def canonical_url(url: str) -> str:
+    """Normalise a URL so trivially different spellings share a cache entry.
+
+    Lower-cases scheme and host, drops default ports, fragments, tracking
+    parameters and trailing slashes, and sorts the remaining query string.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and parsed.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parsed.port}"
+    path = parsed.path.rstrip("/") or "/"
+    query = urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+            if not _is_tracking_param(k)
+        )
+    )
+    return urlunparse((scheme, host, path, "", query, ""))
+
+
+@dataclass
+class CachedPage:
+    """HTML served from the cache together with its HTTP validators."""
+
+    url: str
+    html: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    tier: Optional[str]
+    fetched_at: float
+    ttl: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.fetched_at < self.ttl
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class HtmlCache:
+    """SQLite-backed HTML cache with TTL freshness and size-bounded LRU eviction.
+
+    Pages are keyed by canonical URL and point at zlib-compressed bodies
+    stored once per SHA-256 digest, so mirrors and re-fetches of unchanged
+    pages share storage. The database runs in WAL mode, which lets every
+    uvicorn worker on the host read and write the same file concurrently.
+    Entries past ``ttl`` are still returned (``fresh`` is False) so callers
+    can revalidate them with a conditional request instead of re-rendering.
+
+    A second level stores cleaned posts keyed by (URL, HTML digest,
+    extractor id), so unchanged pages skip parsing entirely and a new
+    extractor version misses automatically. It keeps at most ``max_posts``
+    entries, evicting the least recently used.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 86400.0,
+        max_bytes: int = 512 * 1024 * 1024,
+        max_posts: int = 20000,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_posts = max_posts
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stores": 0,
+            "evictions": 0,
+            "post_hits": 0,
+            "post_misses": 0,
+            "clean_seconds_saved": 0.0,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the shared connection; callers must hold ``self._lock``."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    # Synchronous implementation, run in a worker thread by the async API
+
+    def _get(self, url: str) -> Optional[CachedPage]:
+        conn = self._connect()
+        key = canonical_url(url)
+        row = conn.execute(
+            "SELECT p.digest, p.etag, p.last_modified, p.tier, p.fetched_at, b.data "
+            "FROM pages p JOIN blobs b ON b.digest = p.digest WHERE p.url_key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            self._stats["misses"] += 1
+            return None
+
+        digest, etag, last_modified, tier, fetched_at, data = row
+        try:
+            html = zlib.decompress(data).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError) as e:
+            logger.warning("Corrupt HTML cache entry dropped", url=url, error=str(e))
+            conn.execute("DELETE FROM pages WHERE url_key = ?", (key,))
+            self._delete_orphans(conn, [digest])
+            self._stats["misses"] += 1
+            return None
+
+        conn.execute(
+            "UPDATE pages SET accessed_at = ? WHERE url_key = ?", (time.time(), key)
+        )
+        page = CachedPage(url, html, etag, last_modified, tier, fetched_at, self.ttl)
+        self._stats["hits" if page.fresh else "stale_hits"] += 1
+        return page
+
+    def _put(
+        self,
+        url: str,
+        html: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        tier: Optional[str],
+    ) -> None:
+        conn = self._connect()
+        body = html.encode("utf-8")
+        digest = html_digest(html)
+        data = zlib.compress(body, 6)
+        now = time.time()
+        key = canonical_url(url)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            previous = conn.execute(
+                "SELECT digest FROM pages WHERE url_key = ?", (key,)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR IGNORE INTO blobs (digest, data, size) VALUES (?, ?, ?)",
+                (digest, data, len(data)),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(url_key, digest, etag, last_modified, tier, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, digest, etag, last_modified, tier, now, now),
+            )
+            if previous and previous[0] != digest:
+                self._delete_orphans(conn, [previous[0]])
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._stats["stores"] += 1
+
+    def _touch(
+        self, url: str, etag: Optional[str], last_modified: Optional[str]
+    ) -> None:
+        now = time.time()
+        self._connect().execute(
+            "UPDATE pages SET fetched_at = ?, accessed_at = ?, "
+            "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+            "WHERE url_key = ?",
+            (now, now, etag, last_modified, canonical_url(url)),
+        )
+        self._stats["revalidated"] += 1
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used pages until the blobs fit in ``max_bytes``."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute(
+            "SELECT p.url_key, p.digest, b.size FROM pages p "
+            "JOIN blobs b ON b.digest = p.digest ORDER BY p.accessed_at"
+        ).fetchall()
+        evicted = []
+        for key, digest, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key, digest))
+            total -= size
+        conn.executemany(
+            "DELETE FROM pages WHERE url_key = ?", [(key,) for key, _ in evicted]
+        )
+        self._delete_orphans(conn, [digest for _, digest in evicted])
+        self._stats["evictions"] += len(evicted)
+
+    @staticmethod
+    def _delete_orphans(conn: sqlite3.Connection, digests: List[str]) -> None:
+        """Delete blobs among ``digests`` that no page references any more."""
+        conn.executemany(
+            "DELETE FROM blobs WHERE digest = ? "
+            "AND NOT EXISTS (SELECT 1 FROM pages WHERE digest = ?)",
+            [(d, d) for d in set(digests)],
+        )
+
+    def _get_post(
+        self, url: str, html: str, extractor: str
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        conn = self._connect()
+        key = (canonical_url(url), html_digest(html), extractor)
+        row = conn.execute(
+            "SELECT post, clean_seconds FROM cleaned_posts "
+            "WHERE url_key = ? AND digest = ? AND extractor = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            self._stats["post_misses"] += 1
+            return False, None
+
+        conn.execute(
+            "UPDATE cleaned_posts SET accessed_at = ? "
+            "WHERE url_key = ? AND digest = ? AND extractor = ?",
+            (time.time(), *key),
+        )
+        self._stats["post_hits"] += 1
+        self._stats["clean_seconds_saved"] += row[1]
+        post = json.loads(row[0]) if row[0] is not None else None
+        if post is not None:
+            post["url"] = url
+        return True, post
+
+    def _put_post(
+        self,
+        url: str,
+        html: str,
+        extractor: str,
+        post: Optional[Dict[str, Any]],
+        clean_seconds: float,
+    ) -> None:
+        conn = self._connect()
+        url_key = canonical_url(url)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Older content or extractor versions of this URL are never read again
+            conn.execute("DELETE FROM cleaned_posts WHERE url_key = ?", (url_key,))
+            conn.execute(
+                "INSERT INTO cleaned_posts "
+                "(url_key, digest, extractor, post, clean_seconds, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    url_key,
+                    html_digest(html),
+                    extractor,
+                    json.dumps(post) if post is not None else None,
+                    clean_seconds,
+                    time.time(),
+                ),
+            )
+            count = conn.execute("SELECT COUNT(*) FROM cleaned_posts").fetchone()[0]
+            if count > self.max_posts:
+                conn.execute(
+                    "DELETE FROM cleaned_posts WHERE rowid IN (SELECT rowid "
+                    "FROM cleaned_posts ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_posts,),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _size(self) -> Dict[str, int]:
+        conn = self._connect()
+        pages = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        blobs, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs"
+        ).fetchone()
+        posts = conn.execute("SELECT COUNT(*) FROM cleaned_posts").fetchone()[0]
+        return {"pages": pages, "blobs": blobs, "bytes": size, "cleaned_posts": posts}
+
+    def _locked(self, fn, *args):
+        with self._lock:
+            return fn(*args)
+
+    # Async API
+
+    async def get(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page for a URL (fresh or stale), or None."""
+        try:
+            return await asyncio.to_thread(self._locked, self._get, url)
+        except sqlite3.Error as e:
+            logger.warning("HTML cache read failed", url=url, error=str(e))
+            return None
+
+    async def put(
+        self,
+        url: str,
+        html: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        tier: Optional[str] = None,
+    ) -> None:
+        """Store a page and its validators, evicting old entries if over budget."""
+        try:
+            await asyncio.to_thread(
+                self._locked, self._put, url, html, etag, last_modified, tier
+            )
+        except sqlite3.Error as e:
+            logger.warning("HTML cache write failed", url=url, error=str(e))
+
+    async def touch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Mark a stale entry fresh again after a 304 Not Modified."""
+        try:
+            await asyncio.to_thread(self._locked, self._touch, url, etag, last_modified)
+        except sqlite3.Error as e:
+            logger.warning("HTML cache update failed", url=url, error=str(e))
+
+    async def get_post(
+        self, url: str, html: str, extractor: str
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Look up the cleaned post for this exact HTML and extractor.
+
+        Returns:
+            Tuple of (hit, post); a hit may carry None for pages that
+            previously failed to clean
+        """
+        try:
+            return await asyncio.to_thread(
+                self._locked, self._get_post, url, html, extractor
+            )
+        except sqlite3.Error as e:
+            logger.warning("Cleaned post cache read failed", url=url, error=str(e))
+            return False, None
+
+    async def put_post(
+        self,
+        url: str,
+        html: str,
+        extractor: str,
+        post: Optional[Dict[str, Any]],
+        clean_seconds: float = 0.0,
+    ) -> None:
+        """Store the cleaning result (None for unusable pages) for this HTML."""
+        try:
+            await asyncio.to_thread(
+                self._locked, self._put_post, url, html, extractor, post, clean_seconds
+            )
+        except sqlite3.Error as e:
+            logger.warning("Cleaned post cache write failed", url=url, error=str(e))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters for the metrics endpoint."""
+        try:
+            with self._lock:
+                size = self._size()
+        except sqlite3.Error as e:
+            size = {"error": str(e)}
+        return {
+            **self._stats,
+            **size,
+            "clean_seconds_saved": round(self._stats["clean_seconds_saved"], 3),
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Singleton
+_html_cache: Optional[HtmlCache] = None
+
+
+def get_html_cache() -> Optional[HtmlCache]:
+    """Get the process-wide HTML cache, or None if caching is disabled."""
+    global _html_cache
+    if not settings.HTML_CACHE_ENABLED:
+        return None
+    if _html_cache is None:
+        _html_cache = HtmlCache(
+            path=settings.HTML_CACHE_PATH,
+            ttl=settings.HTML_CACHE_TTL,
+            max_bytes=settings.HTML_CACHE_MAX_MB * 1024 * 1024,
+        )
+        register_stats_provider("html_cache", _html_cache.stats)
+    return _html_cache
+
+
+def close_html_cache() -> None:
+    """Close the HTML cache database (called from the app lifespan)."""
+    if _html_cache is not None:
+        _html_cache.close()
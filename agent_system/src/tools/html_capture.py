@@ -0,0 +1,117 @@
+"""Size-capped HTML capture that strips dead weight inside the browser."""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from playwright.async_api import Page
+
+from src.tools.http_fetcher import (
+    BOT_WALL_MAX_CHARS,
+    BOT_WALL_PATTERN,
+    looks_like_bot_wall,
+)
+from src.utils.metrics import register_stats_provider
+
+# Checks the untouched page for anti-bot challenge markers (which live in the
+# scripts), removes scripts, styles and comments from the live DOM, then
+# serializes it and cuts the UTF-8 encoding at ``maxBytes`` before anything
+# crosses to Python
+_CAPTURE_SCRIPT = """({maxBytes, botWallPattern, botWallMaxChars}) => {
+    const raw = document.documentElement.outerHTML;
+    const botWall = raw.length < botWallMaxChars
+        && new RegExp(botWallPattern, 'i').test(raw);
+
+    document.querySelectorAll('script, style').forEach((el) => el.remove());
+    const walker = document.createTreeWalker(document, NodeFilter.SHOW_COMMENT);
+    const comments = [];
+    while (walker.nextNode()) comments.push(walker.currentNode);
+    comments.forEach((node) => node.remove());
+
+    let html = '<!DOCTYPE html>' + document.documentElement.outerHTML;
+    let truncated = false;
+    // A UTF-16 code unit encodes to at most 3 UTF-8 bytes
+    if (maxBytes > 0 && html.length * 3 > maxBytes) {
+        const bytes = new TextEncoder().encode(html);
+        if (bytes.length > maxBytes) {
+            html = new TextDecoder().decode(bytes.subarray(0, maxBytes));
+            truncated = true;
+        }
+    }
+    return {html, truncated, botWall};
+}"""
+
+
+@dataclass
+class CapturedHtml:
+    """HTML serialized from a page.
+
+    Attributes:
+        html: Serialized page
+        truncated: Whether the HTML was cut at the size cap
+        bot_wall: Whether the page as loaded (scripts included) was an
+            anti-bot challenge
+    """
+
+    html: str
+    truncated: bool = False
+    bot_wall: bool = False
+
+
+class CaptureStats:
+    """Process-wide counters of captured pages and truncations."""
+
+    def __init__(self):
+        self._stats = {"captured": 0, "truncated": 0, "chars": 0}
+
+    def record(self, captured: CapturedHtml) -> None:
+        self._stats["captured"] += 1
+        self._stats["chars"] += len(captured.html)
+        if captured.truncated:
+            self._stats["truncated"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
+
+
+async def capture_html(page: Page, mode: str, max_bytes: int) -> CapturedHtml:
+    """Serialize a loaded page.
+
+    Args:
+        page: Loaded Playwright page (its DOM is modified in "stripped" mode)
+        mode: "stripped" removes scripts, styles and comments in the browser
+            and caps the result at ``max_bytes``; "full" returns
+            ``page.content()`` unchanged
+        max_bytes: UTF-8 size cap for "stripped" mode (0 disables the cap)
+
+    Returns:
+        CapturedHtml with the serialized page; ``bot_wall`` is checked on the
+        page before anything is stripped
+    """
+    if mode == "full":
+        html = await page.content()
+        captured = CapturedHtml(html, bot_wall=looks_like_bot_wall(html))
+    else:
+        result = await page.evaluate(
+            _CAPTURE_SCRIPT,
+            {
+                "maxBytes": max_bytes,
+                "botWallPattern": BOT_WALL_PATTERN,
+                "botWallMaxChars": BOT_WALL_MAX_CHARS,
+            },
+        )
+        captured = CapturedHtml(result["html"], result["truncated"], result["botWall"])
+    get_capture_stats().record(captured)
+    return captured
+
+
+# Singleton
+_capture_stats: Optional[CaptureStats] = None
+
+
+def get_capture_stats() -> CaptureStats:
+    """Get the process-wide capture counters."""
+    global _capture_stats
+    if _capture_stats is None:
+        _capture_stats = CaptureStats()
+        register_stats_provider("html_capture", _capture_stats.stats)
+    return _capture_stats
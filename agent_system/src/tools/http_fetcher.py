@@ -0,0 +1,262 @@
+"""Plain HTTP fetch tier used before escalating a URL to a headless browser."""
+
+import asyncio
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from src.config import settings
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+# Markers of client-side rendered pages whose static HTML has no article text
+_JS_SHELL_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r'<div[^>]+id=["\'](?:root|app|__next|__nuxt)["\'][^>]*>\s*</div>',
+        r"<app-root[^>]*>\s*</app-root>",
+        r"<noscript[^>]*>[^<]*(?:enable|requires?)\s+javascript",
+    )
+]
+# Markers of anti-bot interstitials served instead of the requested page
+# (kept JavaScript-compatible, the browser capture evaluates it too)
+BOT_WALL_PATTERN = (
+    r"cf-chl-|challenge-platform|<title>\s*(?:just a moment|attention required|"
+    r"access denied)|px-captcha|g-recaptcha|h-captcha|"
+    r"verify (?:that )?you are (?:a )?human"
+)
+_BOT_WALL_RE = re.compile(BOT_WALL_PATTERN, re.IGNORECASE)
+# Challenge pages are small; long articles may merely mention a captcha
+BOT_WALL_MAX_CHARS = 200_000
+_SCRIPT_RE = re.compile(r"<script\b", re.IGNORECASE)
+_PARAGRAPH_RE = re.compile(r"<p[\s>]", re.IGNORECASE)
+
+
+def looks_like_js_shell(html: str) -> bool:
+    """Return True if the HTML looks like an empty client-side rendered shell."""
+    if any(pattern.search(html) for pattern in _JS_SHELL_PATTERNS):
+        return True
+    # Script-heavy documents with next to no paragraphs are rendered in the browser
+    scripts = len(_SCRIPT_RE.findall(html))
+    paragraphs = len(_PARAGRAPH_RE.findall(html))
+    return scripts >= 10 and paragraphs < 3
+
+
+def looks_like_bot_wall(html: str) -> bool:
+    """Return True if the HTML is a captcha or anti-bot challenge page."""
+    return len(html) < BOT_WALL_MAX_CHARS and bool(_BOT_WALL_RE.search(html))
+
+
+def domain_of(url: str) -> str:
+    """Return the lower-cased host of a URL without a leading ``www.``."""
+    netloc = urlparse(url).netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a (possibly conditional) static GET."""
+
+    html: Optional[str] = None
+    not_modified: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class _DomainTierStats:
+    static_ok: int = 0
+    escalated: int = 0
+    skipped: int = 0
+
+
+class FetchTierPolicy:
+    """Learns per domain whether plain HTTP is worth trying before the browser.
+
+    Every URL decision is recorded. Once a domain has ``min_samples`` static
+    attempts and fewer than ``min_static_ratio`` of them produced usable
+    content, its URLs go straight to the browser. Every ``reprobe_every``-th
+    URL of such a domain still tries static first so the domain can recover.
+    """
+
+    def __init__(
+        self,
+        min_samples: int = 3,
+        min_static_ratio: float = 0.3,
+        reprobe_every: int = 10,
+        history_size: int = 200,
+    ):
+        self.min_samples = min_samples
+        self.min_static_ratio = min_static_ratio
+        self.reprobe_every = reprobe_every
+        self._domains: Dict[str, _DomainTierStats] = {}
+        self.decisions: Deque[Dict[str, str]] = deque(maxlen=history_size)
+
+    def should_try_static(self, url: str) -> bool:
+        """Decide whether to fetch the URL over plain HTTP first."""
+        stats = self._domains.get(domain_of(url))
+        if stats is None:
+            return True
+        attempts = stats.static_ok + stats.escalated
+        if attempts < self.min_samples:
+            return True
+        if stats.static_ok / attempts >= self.min_static_ratio:
+            return True
+        stats.skipped += 1
+        return bool(self.reprobe_every) and stats.skipped % self.reprobe_every == 0
+
+    def record(self, url: str, tier: str, reason: str) -> None:
+        """Record which tier served the URL and why.
+
+        Args:
+            url: Fetched URL
+            tier: "static" if plain HTTP sufficed, otherwise "browser"
+            reason: Why the tier was chosen (e.g. "ok", "js_shell", "thin_content")
+        """
+        stats = self._domains.setdefault(domain_of(url), _DomainTierStats())
+        if tier == "static":
+            stats.static_ok += 1
+        elif reason != "domain_prefers_browser":
+            stats.escalated += 1
+        self.decisions.append({"url": url, "tier": tier, "reason": reason})
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-domain tier counters for the metrics endpoint."""
+        return {
+            "domains": {
+                domain: {
+                    "static_ok": s.static_ok,
+                    "escalated": s.escalated,
+                    "skipped": s.skipped,
+                }
+                for domain, s in self._domains.items()
+            },
+            "recent_decisions": list(self.decisions)[-20:],
+        }
+
+
+class StaticFetcher:
+    """Fetches pages with a pooled keep-alive aiohttp session."""
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections: int = 50,
+        max_per_host: int = 4,
+        max_bytes: int = 5 * 1024 * 1024,
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.max_bytes = max_bytes
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def fetch(self, url: str, ua: str) -> Optional[str]:
+        """GET a URL and return its HTML, or None if it is not a usable page."""
+        return (await self.fetch_conditional(url, ua)).html
+
+    async def fetch_conditional(
+        self,
+        url: str,
+        ua: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> FetchResult:
+        """GET a URL, sending cache validators when given.
+
+        Returns:
+            FetchResult with ``not_modified`` set on a 304, otherwise the HTML
+            (None if the page is not usable) and the response's validators
+        """
+        session = self._get_session()
+        origin = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
+        headers = {
+            "User-Agent": ua,
+            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Referer": origin,
+        }
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        try:
+            async with session.get(url, headers=headers, allow_redirects=True) as resp:
+                result = FetchResult(
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                )
+                if resp.status == 304:
+                    result.not_modified = True
+                    return result
+                if resp.status >= 400:
+                    logger.debug("Static fetch HTTP error", url=url, status=resp.status)
+                    return result
+                if "html" not in resp.headers.get("Content-Type", "text/html"):
+                    logger.debug("Static fetch returned non-HTML", url=url)
+                    return result
+                body = await self._read_body(resp)
+                result.html = body.decode(resp.charset or "utf-8", errors="replace")
+                return result
+        except (aiohttp.ClientError, asyncio.TimeoutError, LookupError) as e:
+            logger.debug(
+                "Static fetch failed", url=url, error=str(e) or type(e).__name__
+            )
+            return FetchResult()
+
+    async def _read_body(self, resp: aiohttp.ClientResponse) -> bytes:
+        """Read the body chunk by chunk, stopping after ``max_bytes``."""
+        chunks = []
+        size = 0
+        async for chunk in resp.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                break
+        return b"".join(chunks)[: self.max_bytes]
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# Singletons
+_static_fetcher: Optional[StaticFetcher] = None
+_tier_policy: Optional[FetchTierPolicy] = None
+
+
+async def get_static_fetcher() -> StaticFetcher:
+    """Get the process-wide static fetcher."""
+    global _static_fetcher
+    if _static_fetcher is None:
+        _static_fetcher = StaticFetcher(timeout=settings.STATIC_FETCH_TIMEOUT)
+    return _static_fetcher
+
+
+async def get_tier_policy() -> FetchTierPolicy:
+    """Get the process-wide fetch tier policy."""
+    global _tier_policy
+    if _tier_policy is None:
+        _tier_policy = FetchTierPolicy()
+        register_stats_provider("fetch_tiers", _tier_policy.stats)
+    return _tier_policy
@@ -0,0 +1,250 @@
+"""Two-tier cache of Gemini responses keyed by model, prompt and config."""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from src.config import settings
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    text BLOB NOT NULL,
+    tokens INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at);
+"""
+
+
+def llm_cache_key(model: str, prompt: str, config: Any, use_search: bool) -> str:
+    """Hash everything that determines a response into a cache key.
+
+    Args:
+        model: Model name
+        prompt: Prompt text
+        config: Effective ``GenerateContentConfig`` of the call
+        use_search: Whether Google Search grounding is enabled
+    """
+    fields = config.model_dump(
+        mode="json", exclude_none=True, exclude={"response_schema"}
+    )
+    if config.response_schema is not None:
+        fields["response_schema"] = TypeAdapter(config.response_schema).json_schema()
+    payload = json.dumps(
+        [model, prompt, fields, use_search], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LlmCache:
+    """LRU memory cache of LLM responses with an optional SQLite disk tier.
+
+    In "deterministic" mode only calls with ``temperature`` at or below
+    ``max_temperature`` (e.g. the SEO evaluation) are cached, since sampled
+    responses are meant to differ between runs; "all" caches every call.
+    Entries expire after ``ttl`` seconds in both tiers. Disk hits are
+    promoted to memory, and the disk tier (WAL mode) is shared by every
+    worker on the host.
+    """
+
+    def __init__(
+        self,
+        mode: str = "deterministic",
+        max_temperature: float = 0.2,
+        ttl: float = 86400.0,
+        max_entries: int = 512,
+        path: Optional[str] = None,
+        max_disk_entries: int = 20000,
+    ):
+        self.mode = mode
+        self.max_temperature = max_temperature
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "skipped": 0,
+            "tokens_saved": 0,
+        }
+
+    def accepts(self, temperature: Optional[float]) -> bool:
+        """Return whether a call with this temperature may be cached."""
+        if self.mode == "all":
+            return True
+        cacheable = temperature is not None and temperature <= self.max_temperature
+        if not cacheable:
+            self._stats["skipped"] += 1
+        return cacheable
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None."""
+        entry = self._memory.get(key)
+        if entry is not None and time.time() - entry[0] < self.ttl:
+            self._memory.move_to_end(key)
+            self._hit("memory_hits", entry[2])
+            return entry[1]
+        if entry is not None:
+            del self._memory[key]
+
+        if self.path:
+            try:
+                row = await asyncio.to_thread(self._locked, self._disk_get, key)
+            except sqlite3.Error as e:
+                logger.warning("LLM cache read failed", error=str(e))
+                row = None
+            if row is not None:
+                self._remember(key, *row)
+                self._hit("disk_hits", row[2])
+                return row[1]
+
+        self._stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, text: str, tokens: int = 0) -> None:
+        """Store a response and the tokens it cost."""
+        now = time.time()
+        self._remember(key, now, text, tokens)
+        self._stats["stores"] += 1
+        if self.path:
+            try:
+                await asyncio.to_thread(
+                    self._locked, self._disk_put, key, now, text, tokens
+                )
+            except sqlite3.Error as e:
+                logger.warning("LLM cache write failed", error=str(e))
+
+    def _hit(self, counter: str, tokens: int) -> None:
+        self._stats[counter] += 1
+        self._stats["tokens_saved"] += tokens
+
+    def _remember(self, key: str, created_at: float, text: str, tokens: int) -> None:
+        self._memory[key] = (created_at, text, tokens)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # Disk tier, run in a worker thread
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the shared connection; callers must hold ``self._lock``."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, str, int]]:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT created_at, text, tokens FROM responses "
+                "WHERE key = ? AND created_at > ?",
+                (key, time.time() - self.ttl),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return row[0], zlib.decompress(row[1]).decode("utf-8"), row[2]
+
+    def _disk_put(self, key: str, created_at: float, text: str, tokens: int) -> None:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, text, tokens, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, zlib.compress(text.encode("utf-8"), 6), tokens, created_at),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE created_at <= ?",
+                (time.time() - self.ttl,),
+            )
+            count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_disk_entries:
+                conn.execute(
+                    "DELETE FROM responses WHERE rowid IN (SELECT rowid "
+                    "FROM responses ORDER BY created_at LIMIT ?)",
+                    (count - self.max_disk_entries,),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _locked(self, fn, *args):
+        with self._lock:
+            return fn(*args)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit rates and tokens saved for the metrics endpoint."""
+        hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "mode": self.mode,
+            "memory_entries": len(self._memory),
+            "disk_enabled": bool(self.path),
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Singleton
+_llm_cache: Optional[LlmCache] = None
+
+
+def get_llm_cache() -> Optional[LlmCache]:
+    """Get the process-wide LLM response cache, or None if caching is off."""
+    global _llm_cache
+    if settings.LLM_CACHE_MODE == "off":
+        return None
+    if _llm_cache is None:
+        _llm_cache = LlmCache(
+            mode=settings.LLM_CACHE_MODE,
+            max_temperature=settings.LLM_CACHE_MAX_TEMPERATURE,
+            ttl=settings.LLM_CACHE_TTL,
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            path=settings.LLM_CACHE_PATH if settings.LLM_CACHE_DISK_ENABLED else None,
+        )
+        register_stats_provider("llm_cache", _llm_cache.stats)
+    return _llm_cache
+
+
+def close_llm_cache() -> None:
+    """Close the LLM cache database (called from the app lifespan)."""
+    if _llm_cache is not None:
+        _llm_cache.close()
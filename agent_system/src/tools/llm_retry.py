@@ -0,0 +1,174 @@
+"""Classified, deadline-aware retries of LLM calls with jittered backoff."""
+
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+import httpx
+
+from src.config import settings
+from src.tools.rate_governor import is_rate_limited
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+from src.utils.run_context import current_run
+
+logger = get_logger(__name__)
+
+# Error classes
+TRANSIENT = "transient"
+RATE_LIMIT = "rate_limit"
+EMPTY_RESPONSE = "empty_response"
+HARD_FAILURE = "hard_failure"
+
+# Backoff multiplier per class; rate limits back off harder
+_BACKOFF_SCALE = {TRANSIENT: 1.0, RATE_LIMIT: 4.0, EMPTY_RESPONSE: 0.5}
+
+_TRANSPORT_ERRORS = (
+    httpx.TransportError,
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    ConnectionError,
+)
+
+
+class EmptyResponseError(ValueError):
+    """Raised when the model returns no text (e.g. a blocked or cut response)."""
+
+
+def classify_error(error: BaseException) -> str:
+    """Sort an LLM call error into a retry class.
+
+    Returns:
+        RATE_LIMIT for 429/RESOURCE_EXHAUSTED, TRANSIENT for 5xx, 408 and
+        transport errors, EMPTY_RESPONSE for empty responses, otherwise
+        HARD_FAILURE (bad request, auth, schema errors, ...)
+    """
+    if is_rate_limited(error):
+        return RATE_LIMIT
+    if isinstance(error, EmptyResponseError):
+        return EMPTY_RESPONSE
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and (code >= 500 or code == 408):
+        return TRANSIENT
+    if isinstance(error, _TRANSPORT_ERRORS):
+        return TRANSIENT
+    return HARD_FAILURE
+
+
+def backoff_delay(
+    error_class: str, retry: int, base: float, cap: float, rng=random
+) -> float:
+    """Full-jitter exponential backoff before retry number ``retry`` (0-based)."""
+    ceiling = min(cap, base * _BACKOFF_SCALE[error_class] * 2**retry)
+    return rng.uniform(0, ceiling)
+
+
+class RetryStats:
+    """Process-wide counters of LLM call failures and retries."""
+
+    def __init__(self):
+        self._stats = {
+            "errors": {TRANSIENT: 0, RATE_LIMIT: 0, EMPTY_RESPONSE: 0, HARD_FAILURE: 0},
+            "retries": 0,
+            "recovered": 0,
+            "gave_up_attempts": 0,
+            "gave_up_deadline": 0,
+            "backoff_seconds": 0.0,
+        }
+
+    def record_error(self, error_class: str) -> None:
+        self._stats["errors"][error_class] += 1
+
+    def record_retry(self, delay: float) -> None:
+        self._stats["retries"] += 1
+        self._stats["backoff_seconds"] += delay
+
+    def record(self, outcome: str) -> None:
+        self._stats[outcome] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "errors": dict(self._stats["errors"]),
+            "backoff_seconds": round(self._stats["backoff_seconds"], 3),
+        }
+
+
+async def call_with_retries(
+    fn: Callable[[], Awaitable[Any]],
+    max_retries: Optional[int] = None,
+    base_delay: Optional[float] = None,
+    max_delay: Optional[float] = None,
+) -> Any:
+    """Run ``fn``, retrying retryable errors within the run's time budget.
+
+    Hard failures are raised at once. Other errors are retried up to
+    ``max_retries`` times after a jittered exponential backoff, unless the
+    backoff would end past the current run's deadline, in which case the
+    error is raised right away so the run can fall back in time.
+
+    Args:
+        fn: Coroutine factory performing one attempt
+        max_retries: Retries after the first attempt (default from settings)
+        base_delay: Backoff of the first retry in seconds (default from settings)
+        max_delay: Cap of a single backoff in seconds (default from settings)
+    """
+    if max_retries is None:
+        max_retries = settings.GEMINI_MAX_RETRIES
+    if base_delay is None:
+        base_delay = settings.GEMINI_RETRY_BASE_DELAY
+    if max_delay is None:
+        max_delay = settings.GEMINI_RETRY_MAX_DELAY
+    stats = get_retry_stats()
+
+    retry = 0
+    while True:
+        try:
+            result = await fn()
+        except Exception as e:
+            error_class = classify_error(e)
+            stats.record_error(error_class)
+            if error_class == HARD_FAILURE:
+                raise
+            if retry >= max_retries:
+                stats.record("gave_up_attempts")
+                raise
+            delay = backoff_delay(error_class, retry, base_delay, max_delay)
+            run = current_run()
+            remaining = run.remaining() if run is not None else None
+            if remaining is not None and delay >= remaining:
+                stats.record("gave_up_deadline")
+                logger.warning(
+                    "LLM call failed, no time budget left to retry",
+                    error_class=error_class,
+                    remaining=round(remaining, 2),
+                )
+                raise
+            logger.warning(
+                "LLM call failed, retrying",
+                error_class=error_class,
+                retry=retry + 1,
+                delay=round(delay, 2),
+                error=str(e),
+            )
+            stats.record_retry(delay)
+            retry += 1
+            await asyncio.sleep(delay)
+        else:
+            if retry:
+                stats.record("recovered")
+            return result
+
+
+# Singleton
+_retry_stats: Optional[RetryStats] = None
+
+
+def get_retry_stats() -> RetryStats:
+    """Get the process-wide LLM retry counters."""
+    global _retry_stats
+    if _retry_stats is None:
+        _retry_stats = RetryStats()
+        register_stats_provider("llm_retries", _retry_stats.stats)
+    return _retry_stats
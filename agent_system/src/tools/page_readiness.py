@@ -0,0 +1,177 @@
+"""Content-based page readiness detection used instead of waiting for network idle."""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import Page
+
+from src.config import settings
+from src.tools.http_fetcher import domain_of
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+# Text length and paragraph count of the main content container
+_CONTENT_PROBE = """() => {
+    const root = document.querySelector('article')
+        || document.querySelector('main')
+        || document.body;
+    if (!root) return [0, 0];
+    return [root.innerText.length, root.querySelectorAll('p').length];
+}"""
+
+
+async def wait_for_content(
+    page: Page,
+    timeout: float,
+    poll_interval: float = 0.25,
+    min_text_length: int = 1000,
+    min_paragraphs: int = 3,
+) -> bool:
+    """Poll the page until its main content is present and stops growing.
+
+    Args:
+        page: Page navigated at least to ``domcontentloaded``
+        timeout: Maximum seconds to wait
+        poll_interval: Seconds between probes
+        min_text_length: Characters of text the content root must contain
+        min_paragraphs: Paragraphs the content root must contain
+
+    Returns:
+        True once two consecutive probes see enough content within 2% of each
+        other, False if that did not happen before the timeout (including
+        when the page kept navigating away)
+    """
+    deadline = time.monotonic() + timeout
+    previous_length = -1
+    while True:
+        try:
+            text_length, paragraphs = await page.evaluate(_CONTENT_PROBE)
+        except PlaywrightError as e:
+            # A client-side redirect destroyed the execution context; probe
+            # the new document on the next poll
+            logger.debug("Content probe failed, retrying", error=str(e))
+            text_length, paragraphs = -1, 0
+        if (
+            text_length >= min_text_length
+            and paragraphs >= min_paragraphs
+            and abs(text_length - previous_length) <= text_length * 0.02
+        ):
+            return True
+        previous_length = text_length
+        if time.monotonic() + poll_interval > deadline:
+            return False
+        await asyncio.sleep(poll_interval)
+
+
+@dataclass
+class _DomainReadiness:
+    probe_ok: int = 0
+    probe_missed: int = 0
+    skipped: int = 0
+
+
+class ReadinessPolicy:
+    """Chooses per domain between the content probe and ``networkidle``.
+
+    Every domain starts in "probe" mode. Once it has ``min_samples`` probe
+    attempts and fewer than ``min_probe_ratio`` of them found stable content,
+    its pages are loaded with ``networkidle`` instead; every
+    ``reprobe_every``-th page still uses the probe so the domain can recover.
+    Load latency is tracked per mode for tuning.
+    """
+
+    MODES = ("probe", "probe_fallback", "networkidle")
+
+    def __init__(
+        self,
+        probe_timeout: float = 5.0,
+        min_samples: int = 3,
+        min_probe_ratio: float = 0.5,
+        reprobe_every: int = 10,
+        latency_window: int = 200,
+    ):
+        self.probe_timeout = probe_timeout
+        self.min_samples = min_samples
+        self.min_probe_ratio = min_probe_ratio
+        self.reprobe_every = reprobe_every
+        self._domains: Dict[str, _DomainReadiness] = {}
+        self._latencies: Dict[str, Deque[float]] = {
+            mode: deque(maxlen=latency_window) for mode in self.MODES
+        }
+
+    def mode_for(self, url: str) -> str:
+        """Return "probe" or "networkidle" for the URL's domain."""
+        stats = self._domains.get(domain_of(url))
+        if stats is None:
+            return "probe"
+        attempts = stats.probe_ok + stats.probe_missed
+        if (
+            attempts < self.min_samples
+            or stats.probe_ok / attempts >= self.min_probe_ratio
+        ):
+            return "probe"
+        stats.skipped += 1
+        if self.reprobe_every and stats.skipped % self.reprobe_every == 0:
+            return "probe"
+        return "networkidle"
+
+    def record(self, url: str, mode: str, seconds: float) -> None:
+        """Record how a page load finished and how long it took.
+
+        Args:
+            url: Loaded URL
+            mode: "probe" (content became stable), "probe_fallback" (probe
+                gave up and ``networkidle`` was awaited) or "networkidle"
+            seconds: Time from navigation start until the page was ready
+        """
+        self._latencies[mode].append(seconds)
+        if mode == "networkidle":
+            return
+        stats = self._domains.setdefault(domain_of(url), _DomainReadiness())
+        if mode == "probe":
+            stats.probe_ok += 1
+        else:
+            stats.probe_missed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-mode latency percentiles and domains using networkidle."""
+        latency = {}
+        for mode, samples in self._latencies.items():
+            ordered = sorted(samples)
+            latency[mode] = {
+                "count": len(ordered),
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000) if ordered else None,
+                "p95_ms": (
+                    round(ordered[int(len(ordered) * 0.95)] * 1000) if ordered else None
+                ),
+            }
+        return {
+            "latency": latency,
+            "networkidle_domains": [
+                domain
+                for domain, s in self._domains.items()
+                if s.probe_ok + s.probe_missed >= self.min_samples
+                and s.probe_ok / (s.probe_ok + s.probe_missed) < self.min_probe_ratio
+            ],
+        }
+
+
+# Singleton
+_readiness_policy: Optional[ReadinessPolicy] = None
+
+
+def get_readiness_policy() -> ReadinessPolicy:
+    """Get the process-wide page readiness policy."""
+    global _readiness_policy
+    if _readiness_policy is None:
+        _readiness_policy = ReadinessPolicy(
+            probe_timeout=settings.READINESS_PROBE_TIMEOUT
+        )
+        register_stats_provider("page_readiness", _readiness_policy.stats)
+    return _readiness_policy
@@ -0,0 +1,234 @@
+"""Process-wide adaptive rate limiting of Gemini API calls."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Dict, List, Optional
+
+from src.config import settings
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+from src.utils.run_context import current_run
+
+logger = get_logger(__name__)
+
+# Queue priorities; lower is served first
+PRIORITY_IN_PROGRESS = 0
+PRIORITY_NEW = 1
+_PRIORITY_NAMES = {PRIORITY_IN_PROGRESS: "in_progress", PRIORITY_NEW: "new"}
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Return whether an API error is a 429 / RESOURCE_EXHAUSTED response."""
+    return getattr(error, "code", None) == 429 or "RESOURCE_EXHAUSTED" in str(error)
+
+
+def estimate_tokens(prompt: str, max_output_tokens: Optional[int]) -> int:
+    """Rough token cost of a call, reconciled with the real usage afterwards."""
+    # ~4 characters per token; assume a quarter of the output budget is used
+    return len(prompt) // 4 + (max_output_tokens or 0) // 4
+
+
+class RateGovernor:
+    """Token buckets for requests and tokens per minute with AIMD adaptation.
+
+    Both buckets refill continuously at ``rpm`` / ``tpm`` per minute scaled
+    by ``rate_factor``. A 429 halves the factor (at most once per
+    ``cooldown`` seconds, so one burst of rejections counts once, and never
+    below ``min_factor``); every successful call adds ``increase`` back until
+    the configured rate is reached.
+
+    Callers queue by priority and then arrival: calls of runs that already
+    got through (``RunContext.in_progress``) go before the first call of a
+    new run, so started runs finish instead of all runs slowing down. Token
+    estimates are debited up front and corrected with the reported usage.
+    """
+
+    def __init__(
+        self,
+        rpm: float,
+        tpm: float,
+        min_factor: float = 0.1,
+        increase: float = 0.05,
+        cooldown: float = 5.0,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.min_factor = min_factor
+        self.increase = increase
+        self.cooldown = cooldown
+        self.rate_factor = 1.0
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._refilled_at = time.monotonic()
+        self._last_decrease = float("-inf")
+        self._queue: List[List[Any]] = []
+        self._seq = itertools.count()
+        self._changed: Optional[asyncio.Event] = None
+        self._stats = {
+            "granted": 0,
+            "waited": 0,
+            "throttled": 0,
+            "rate_decreases": 0,
+            "wait_seconds": {name: 0.0 for name in _PRIORITY_NAMES.values()},
+            "max_wait_seconds": 0.0,
+        }
+
+    async def acquire(self, tokens: int, priority: Optional[int] = None) -> float:
+        """Wait until a call costing ``tokens`` may be sent.
+
+        Args:
+            tokens: Estimated tokens of the call
+            priority: Queue priority; derived from the current run if None
+
+        Returns:
+            Seconds spent waiting
+        """
+        if priority is None:
+            run = current_run()
+            in_progress = run is None or run.in_progress
+            priority = PRIORITY_IN_PROGRESS if in_progress else PRIORITY_NEW
+        entry = [priority, next(self._seq)]
+        heapq.heappush(self._queue, entry)
+        if self._queue[0] is entry:
+            self._notify()
+        start = time.monotonic()
+        try:
+            while True:
+                self._refill()
+                # A call larger than the whole bucket would never fit; the
+                # capacity shrinks when the rate is lowered while waiting
+                cost = min(tokens, self.tpm * self.rate_factor)
+                if self._queue[0] is entry:
+                    if self._requests >= 1 and self._tokens >= cost:
+                        break
+                    await self._sleep(self._time_until(cost))
+                else:
+                    await self._wait_for_head_change()
+        except BaseException:
+            self._remove(entry)
+            raise
+
+        heapq.heappop(self._queue)
+        self._notify()
+        self._requests -= 1
+        self._tokens -= cost
+
+        waited = time.monotonic() - start
+        self._stats["granted"] += 1
+        if waited > 0.001:
+            self._stats["waited"] += 1
+        self._stats["wait_seconds"][_PRIORITY_NAMES[priority]] += waited
+        self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+        run = current_run()
+        if run is not None:
+            run.in_progress = True
+        return waited
+
+    def record_usage(self, estimated: int, actual: Optional[int]) -> None:
+        """Correct the token bucket once the real usage is known."""
+        if actual is not None:
+            self._tokens -= actual - estimated
+
+    def record_success(self) -> None:
+        """Additive increase after a call the provider accepted."""
+        self.rate_factor = min(1.0, self.rate_factor + self.increase)
+
+    def record_throttled(self) -> None:
+        """Multiplicative decrease after a 429 from the provider."""
+        self._stats["throttled"] += 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.rate_factor = max(self.min_factor, self.rate_factor / 2)
+        self._stats["rate_decreases"] += 1
+        self._refill()
+        # Let the head of the queue re-check against the smaller buckets
+        self._notify()
+        logger.warning(
+            "Gemini rate limited, lowering request rate",
+            rate_factor=round(self.rate_factor, 3),
+            rpm=round(self.rpm * self.rate_factor, 1),
+        )
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        minutes = (now - self._refilled_at) / 60
+        self._refilled_at = now
+        rpm = self.rpm * self.rate_factor
+        tpm = self.tpm * self.rate_factor
+        # Always room for one request, however low the rate
+        self._requests = min(max(1.0, rpm), self._requests + minutes * rpm)
+        self._tokens = min(tpm, self._tokens + minutes * tpm)
+
+    def _time_until(self, tokens: float) -> float:
+        """Seconds until both buckets hold enough for the head of the queue."""
+        rpm = self.rpm * self.rate_factor
+        tpm = self.tpm * self.rate_factor
+        request_wait = max(0.0, 1 - self._requests) / rpm * 60
+        token_wait = max(0.0, tokens - self._tokens) / tpm * 60
+        return max(request_wait, token_wait, 0.01)
+
+    async def _sleep(self, seconds: float) -> None:
+        # Wake early if a higher priority call jumps the queue
+        try:
+            await asyncio.wait_for(self._wait_for_head_change(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _wait_for_head_change(self) -> None:
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        await self._changed.wait()
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    def _remove(self, entry: List[Any]) -> None:
+        if entry in self._queue:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+            self._notify()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return rates, queue depth and wait times for capacity planning."""
+        self._refill()
+        waits = self._stats["wait_seconds"]
+        granted = self._stats["granted"]
+        return {
+            **self._stats,
+            "wait_seconds": {k: round(v, 3) for k, v in waits.items()},
+            "avg_wait_seconds": (
+                round(sum(waits.values()) / granted, 3) if granted else 0.0
+            ),
+            "max_wait_seconds": round(self._stats["max_wait_seconds"], 3),
+            "queue_depth": len(self._queue),
+            "rate_factor": round(self.rate_factor, 3),
+            "effective_rpm": round(self.rpm * self.rate_factor, 1),
+            "effective_tpm": round(self.tpm * self.rate_factor),
+            "available_requests": round(self._requests, 2),
+            "available_tokens": round(self._tokens),
+        }
+
+
+# Singleton
+_rate_governor: Optional[RateGovernor] = None
+
+
+def get_rate_governor() -> Optional[RateGovernor]:
+    """Get the process-wide Gemini rate governor, or None if unlimited."""
+    global _rate_governor
+    if settings.GEMINI_RPM <= 0 or settings.GEMINI_TPM <= 0:
+        return None
+    if _rate_governor is None:
+        _rate_governor = RateGovernor(
+            rpm=settings.GEMINI_RPM,
+            tpm=settings.GEMINI_TPM,
+            min_factor=settings.GEMINI_RATE_MIN_FACTOR,
+        )
+        register_stats_provider("gemini_rate", _rate_governor.stats)
+    return _rate_governor
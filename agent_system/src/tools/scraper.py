@@ -1,17 +1,44 @@
 import asyncio
 import os
-from typing import Dict, List, Optional, Tuple, Any
+import time
+from contextlib import AsyncExitStack, nullcontext
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from playwright.async_api import (
-    async_playwright,
-    Browser,
     Page,
+    Response,
     TimeoutError as PlaywrightTimeoutError,
 )
 from urllib.parse import urlparse
+from src.config import settings
+from src.tools.browser_pool import BrowserLease, BrowserPool, get_browser_pool
+from src.tools.domain_scheduler import DomainScheduler, get_domain_scheduler
+from src.tools.failure_tracker import FailureTracker, get_failure_tracker
+from src.tools.html_capture import capture_html
+from src.tools.html_cache import CachedPage, HtmlCache, get_html_cache
+from src.tools.http_fetcher import (
+    get_static_fetcher,
+    get_tier_policy,
+    looks_like_js_shell,
+)
+from src.tools.clean_pool import clean_html_off_loop
+from src.tools.page_readiness import (
+    ReadinessPolicy,
+    get_readiness_policy,
+    wait_for_content,
+)
+from src.tools.extraction import clean_html_content
 from src.utils.logger import get_logger
-from bs4 import BeautifulSoup
-import trafilatura
 
 logger = get_logger(__name__)
 
@@ -26,59 +53,281 @@ USER_AGENTS = [
     # add more as needed…
 ]
 
+# Minimum content a cleaned post needs to be used as reference material
+MIN_QUALITY_WORD_COUNT = 300
+MIN_QUALITY_PARAGRAPHS = 3
+
+
+def is_quality_post(post: Optional[Dict[str, Any]]) -> bool:
+    """Return True if cleaned content is substantial enough to use as a source."""
+    return bool(
+        post
+        and post["word_count"] >= MIN_QUALITY_WORD_COUNT
+        and len(post["paragraphs"]) >= MIN_QUALITY_PARAGRAPHS
+        and post["title"].strip()
+    )
+
 
 class PlaywrightScraper:
     def __init__(
         self,
         max_concurrent: int = 5,
         navigation_timeout: int = 15_000,  # 15s
-        headless: bool = True,
+        pool: Optional[BrowserPool] = None,
+        static_fetch: bool = True,
+        html_cache: Optional[HtmlCache] = None,
+        scheduler: Optional[DomainScheduler] = None,
+        failures: Optional[FailureTracker] = None,
+        readiness: Optional[ReadinessPolicy] = None,
+        capture_mode: str = "full",
+        capture_max_bytes: int = 0,
     ):
         self.semaphore = asyncio.Semaphore(max_concurrent)
         self.navigation_timeout = navigation_timeout
-        self.headless = headless
+        self.pool = pool
+        self.static_fetch = static_fetch
+        self.html_cache = html_cache
+        self.scheduler = scheduler
+        self.failures = failures
+        self.readiness = readiness
+        self.capture_mode = capture_mode
+        self.capture_max_bytes = capture_max_bytes
+        self._truncated: Set[str] = set()
+        # ETag / Last-Modified of the last response per URL, stored with the page
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    async def _fetch_cached(
+        self,
+        get_browser: Callable[[], Awaitable[BrowserLease]],
+        url: str,
+        ua: str,
+    ) -> Tuple[str, Optional[str], str]:
+        """Serve a URL from the HTML cache, revalidating or re-fetching as needed.
+
+        Fresh entries are returned as is. Stale entries with validators are
+        revalidated with a conditional GET: a 304 keeps the cached HTML, even
+        when it was originally rendered by the browser. Anything else goes
+        through the tiered fetch and the result is stored. Network work runs
+        inside the scheduler's per-domain slot; cache hits never wait for one.
+
+        Returns:
+            Tuple of (url, html or None, tier that produced the result)
+        """
+        cache = self.html_cache
+        cached = await cache.get(url) if cache is not None else None
+        if cached is not None and cached.fresh:
+            logger.debug("Served from HTML cache", url=url)
+            return url, cached.html, "cache"
+
+        slot = self.scheduler.slot(url) if self.scheduler else nullcontext()
+        async with slot:
+            if cache is None:
+                result = await self._fetch_tiered(get_browser, url, ua)
+            else:
+                result = await self._refresh(get_browser, url, ua, cached)
+        if result[1] and self.failures is not None:
+            self.failures.record_success(url)
+        return result
+
+    async def _refresh(
+        self,
+        get_browser: Callable[[], Awaitable[BrowserLease]],
+        url: str,
+        ua: str,
+        cached: Optional[CachedPage],
+    ) -> Tuple[str, Optional[str], str]:
+        """Revalidate a stale cache entry or fetch the page, storing the result."""
+        cache = self.html_cache
+        if cached is not None and cached.revalidatable:
+            fetcher = await get_static_fetcher()
+            result = await fetcher.fetch_conditional(
+                url, ua, etag=cached.etag, last_modified=cached.last_modified
+            )
+            if result.not_modified:
+                await cache.touch(url, result.etag, result.last_modified)
+                logger.debug("Revalidated cached page", url=url)
+                return url, cached.html, "cache"
+            # The conditional GET already returned the page; only go to the
+            # browser if that body is not usable
+            policy = await get_tier_policy()
+            reason = await self._static_rejection(result.html, url)
+            if reason is None:
+                policy.record(url, "static", "ok")
+                await cache.put(
+                    url, result.html, result.etag, result.last_modified, "static"
+                )
+                return url, result.html, "static"
+            policy.record(url, "browser", reason)
+            url, html, tier = await self._fetch_browser(get_browser, url, ua)
+        else:
+            url, html, tier = await self._fetch_tiered(get_browser, url, ua)
+        etag, last_modified = self._validators.pop(url, (None, None))
+        if html:
+            await cache.put(url, html, etag, last_modified, tier)
+        return url, html, tier
+
+    def _record_failure(self, url: str, kind: str) -> None:
+        if self.failures is not None:
+            self.failures.record_failure(url, kind)
+
+    def _remember_validators(
+        self, url: str, etag: Optional[str], last_modified: Optional[str]
+    ) -> None:
+        if self.html_cache is not None:
+            self._validators[url] = (etag, last_modified)
+
+    async def _fetch_tiered(
+        self,
+        get_browser: Callable[[], Awaitable[BrowserLease]],
+        url: str,
+        ua: str,
+    ) -> Tuple[str, Optional[str], str]:
+        """Fetch a page over plain HTTP, escalating to Playwright only when needed.
+
+        Returns:
+            Tuple of (url, html or None, tier that produced the result)
+        """
+        policy = await get_tier_policy()
+        if not self.static_fetch:
+            reason = "static_disabled"
+        elif policy.should_try_static(url):
+            fetcher = await get_static_fetcher()
+            result = await fetcher.fetch_conditional(url, ua)
+            html = result.html
+            reason = await self._static_rejection(html, url)
+            if reason is None:
+                self._remember_validators(url, result.etag, result.last_modified)
+                policy.record(url, "static", "ok")
+                logger.debug("Served by static fetch", url=url, length=len(html))
+                return url, html, "static"
+        else:
+            reason = "domain_prefers_browser"
+
+        if self.static_fetch:
+            policy.record(url, "browser", reason)
+        logger.debug("Escalating to browser", url=url, reason=reason)
+        return await self._fetch_browser(get_browser, url, ua)
+
+    async def _fetch_browser(
+        self,
+        get_browser: Callable[[], Awaitable[BrowserLease]],
+        url: str,
+        ua: str,
+    ) -> Tuple[str, Optional[str], str]:
+        """Fetch a page with Playwright, leasing a browser only now."""
+        try:
+            browser = await get_browser()
+        except Exception as e:
+            logger.warning("Browser unavailable", url=url, error=str(e))
+            return url, None, "browser"
+
+        _, html = await self._fetch(browser, url, ua)
+        return url, html, "browser"
+
+    async def _static_rejection(self, html: Optional[str], url: str) -> Optional[str]:
+        """Return why statically fetched HTML needs the browser, or None if usable."""
+        if not html:
+            return "fetch_failed"
+        if looks_like_js_shell(html):
+            return "js_shell"
+        if not is_quality_post(await clean_html_off_loop(html, url)):
+            return "thin_content"
+        return None
 
     async def _fetch(
-        self, browser: Browser, url: str, ua: str
+        self, browser: BrowserLease, url: str, ua: str
     ) -> Tuple[str, Optional[str]]:
         """Load a page in Playwright and return its HTML or None."""
         async with self.semaphore:
-            page: Page = await browser.new_page(
-                user_agent=ua,
-                viewport={"width": 1280, "height": 800},
-            )
-            # Optionally block images/fonts/css to speed up
-            await page.route(
-                "**/*",
-                lambda route: (
-                    route.continue_()
-                    if route.request.resource_type
-                    not in ("image", "font", "stylesheet")
-                    else route.abort()
-                ),
-            )
+            # Shared per-UA context with the request blocklist preinstalled
+            page: Page = await browser.new_context_page(ua)
             # Set a Referer header
             origin = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
             await page.set_extra_http_headers({"Referer": origin})
 
             try:
-                await page.goto(
-                    url, wait_until="networkidle", timeout=self.navigation_timeout
+                response = await self._navigate(page, url)
+                if response is not None and response.status >= 400:
+                    logger.warning(
+                        "HTTP error loading page", url=url, status=response.status
+                    )
+                    self._record_failure(url, f"http_{response.status}")
+                    return url, None
+                captured = await capture_html(
+                    page, self.capture_mode, self.capture_max_bytes
                 )
-                html = await page.content()
+                html = captured.html
+                if captured.truncated:
+                    logger.info(
+                        "Captured HTML truncated",
+                        url=url,
+                        max_bytes=self.capture_max_bytes,
+                    )
+                    self._truncated.add(url)
+                if captured.bot_wall:
+                    logger.warning("Bot wall served instead of page", url=url)
+                    self._record_failure(url, "bot_wall")
+                    return url, None
+                if response is not None:
+                    self._remember_validators(
+                        url,
+                        response.headers.get("etag"),
+                        response.headers.get("last-modified"),
+                    )
                 logger.debug("Scraped successfully", url=url, length=len(html))
                 return url, html
             except PlaywrightTimeoutError:
                 logger.warning("Timeout loading page", url=url)
+                self._record_failure(url, "timeout")
             except Exception as e:
                 logger.warning("Error loading page", url=url, error=str(e))
+                self._record_failure(url, "error")
             finally:
                 await page.close()
 
             return url, None
 
+    async def _navigate(self, page: Page, url: str) -> Optional[Response]:
+        """Navigate to the URL and wait until its content is ready to capture.
+
+        Without a readiness policy this waits for ``networkidle``. With one,
+        the page is loaded to ``domcontentloaded`` and the content probe is
+        polled; if the content never settles, ``networkidle`` is awaited for
+        the rest of the navigation budget and the page is captured either way.
+        """
+        mode = self.readiness.mode_for(url) if self.readiness else "networkidle"
+        started = time.monotonic()
+        if mode == "networkidle":
+            response = await page.goto(
+                url, wait_until="networkidle", timeout=self.navigation_timeout
+            )
+        else:
+            response = await page.goto(
+                url, wait_until="domcontentloaded", timeout=self.navigation_timeout
+            )
+            if response is not None and response.status >= 400:
+                return response
+
+            budget = self.navigation_timeout / 1000
+            remaining = budget - (time.monotonic() - started)
+            probe_timeout = min(self.readiness.probe_timeout, remaining)
+            if probe_timeout <= 0 or not await wait_for_content(page, probe_timeout):
+                mode = "probe_fallback"
+                remaining = budget - (time.monotonic() - started)
+                if remaining > 0:
+                    try:
+                        await page.wait_for_load_state(
+                            "networkidle", timeout=remaining * 1000
+                        )
+                    except PlaywrightTimeoutError:
+                        logger.debug("Network never idle, capturing as is", url=url)
+
+        if self.readiness is not None:
+            self.readiness.record(url, mode, time.monotonic() - started)
+        return response
+
     def clean_html_content(self, html: str, url: str) -> Optional[Dict[str, Any]]:
-        """Clean and extract content from HTML.
+        """Clean and extract content from HTML (runs on the calling thread).
 
         Args:
             html: Raw HTML content
@@ -87,106 +336,81 @@ class PlaywrightScraper:
         Returns:
             Cleaned content dictionary or None if extraction fails
         """
-        try:
-            # Try BeautifulSoup first
-            soup = BeautifulSoup(html, "html.parser")
-
-            # Remove unwanted elements
-            for element in soup(
-                ["script", "style", "nav", "footer", "aside", "header"]
-            ):
-                element.decompose()
-
-            # Extract title
-            title = ""
-            title_tag = soup.find("title")
-            if title_tag:
-                title = title_tag.get_text().strip()
-
-            # Extract meta description
-            meta_desc = ""
-            meta_tag = soup.find("meta", attrs={"name": "description"})
-            if meta_tag and meta_tag.get("content"):
-                meta_desc = meta_tag.get("content").strip()
-
-            # Extract headings
-            headings = []
-            for heading in soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"]):
-                text = heading.get_text().strip()
-                if text:
-                    headings.append(text)
-
-            # Extract paragraphs
-            paragraphs = []
-            for p in soup.find_all("p"):
-                text = p.get_text().strip()
-                if text and len(text) > 20:  # Filter out short paragraphs
-                    paragraphs.append(text)
-
-            # If BeautifulSoup didn't get enough content, try trafilatura
-            if len(paragraphs) < 3:
-                extracted_text = trafilatura.extract(html)
-                if extracted_text:
-                    paragraphs = [
-                        p.strip() for p in extracted_text.split("\n\n") if p.strip()
-                    ]
-
-            # Calculate word count
-            all_text = " ".join(paragraphs)
-            word_count = len(all_text.split())
-
-            if word_count < 100:  # Skip articles that are too short
-                logger.warning("Article too short", url=url, word_count=word_count)
-                return None
-
-            cleaned_content = {
-                "url": url,
-                "title": title,
-                "meta_description": meta_desc,
-                "headings": headings,
-                "paragraphs": paragraphs,
-                "word_count": word_count,
-            }
-
-            logger.debug(
-                "Content cleaned successfully",
-                url=url,
-                word_count=word_count,
-                paragraphs=len(paragraphs),
-                headings=len(headings),
-            )
+        return clean_html_content(html, url, settings.EXTRACTION_ENGINE)
 
-            return cleaned_content
+    async def scrape_stream(
+        self, urls: List[str]
+    ) -> AsyncIterator[Tuple[str, Optional[str]]]:
+        """Yield (url, html) pairs as soon as each fetch finishes.
 
-        except Exception as e:
-            logger.error("Failed to clean HTML content", url=url, error=str(e))
-            return None
+        URLs whose source is in failure cool-down are yielded first with no
+        HTML and never fetched. Fetches still in flight are cancelled when the
+        consumer stops iterating, so wrap the generator in
+        ``contextlib.aclosing`` when breaking out early.
+        """
+        skipped: Dict[str, str] = {}
+        to_fetch = list(urls)
+        if self.failures is not None:
+            to_fetch, skipped = self.failures.triage(to_fetch)
+
+        async with AsyncExitStack() as stack:
+            lease: Optional[BrowserLease] = None
+            lease_lock = asyncio.Lock()
+
+            async def get_browser() -> BrowserLease:
+                nonlocal lease
+                async with lease_lock:
+                    if lease is None:
+                        pool = self.pool or await get_browser_pool()
+                        lease = await stack.enter_async_context(pool.lease())
+                return lease
+
+            tasks = [
+                asyncio.create_task(
+                    self._fetch_cached(
+                        get_browser, url, USER_AGENTS[idx % len(USER_AGENTS)]
+                    )
+                )
+                for idx, url in enumerate(to_fetch)
+            ]
+            tiers: Dict[str, int] = {"cache": 0, "static": 0, "browser": 0}
+            success = 0
+            try:
+                for url in skipped:
+                    yield url, None
+                for next_done in asyncio.as_completed(tasks):
+                    url, html, tier = await next_done
+                    if html:
+                        success += 1
+                        tiers[tier] += 1
+                    yield url, html
+            finally:
+                pending = [task for task in tasks if not task.done()]
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+                # Log summary
+                total = len(urls)
+                completed = len(tasks) - len(pending)
+                rate = success / total * 100 if total else 0.0
+                logger.info(
+                    "Playwright scraping completed",
+                    total=total,
+                    success=success,
+                    failed=completed - success,
+                    skipped=len(skipped),
+                    cancelled=len(pending),
+                    truncated=sum(1 for url in to_fetch if url in self._truncated),
+                    success_rate=f"{rate:.1f}%",
+                    **tiers,
+                )
 
     async def scrape_multiple(self, urls: List[str]) -> Dict[str, Optional[str]]:
-        """Scrape a list of URLs using a single browser instance."""
-        async with async_playwright() as pw:
-            browser = await pw.chromium.launch(headless=self.headless)
-            tasks = []
-            for idx, url in enumerate(urls):
-                ua = USER_AGENTS[idx % len(USER_AGENTS)]
-                tasks.append(self._fetch(browser, url, ua))
-
-            results = await asyncio.gather(*tasks)
-            await browser.close()
-
-        scraped = {url: html for url, html in results}
-        # Log summary
-        total = len(urls)
-        success = sum(1 for html in scraped.values() if html)
-        rate = success / total * 100
-        logger.info(
-            "Playwright scraping completed",
-            total=total,
-            success=success,
-            failed=total - success,
-            success_rate=f"{rate:.1f}%",
-        )
-
+        """Scrape a list of URLs, leasing a pooled browser only if one is needed."""
+        scraped = {}
+        async for url, html in self.scrape_stream(urls):
+            scraped[url] = html
         return scraped
 
 
@@ -194,10 +418,17 @@ class PlaywrightScraper:
 def create_scraper() -> PlaywrightScraper:
     max_conc = int(os.getenv("MAX_CONCURRENT_REQUESTS", "5"))
     timeout = int(os.getenv("MAX_SCRAPE_TIMEOUT", "15")) * 1000
-    headless = os.getenv("PLAYWRIGHT_HEADLESS", "true").lower() == "true"
 
     return PlaywrightScraper(
-        max_concurrent=max_conc, navigation_timeout=timeout, headless=headless
+        max_concurrent=max_conc,
+        navigation_timeout=timeout,
+        static_fetch=settings.STATIC_FETCH_ENABLED,
+        html_cache=get_html_cache(),
+        scheduler=get_domain_scheduler(),
+        failures=get_failure_tracker(),
+        readiness=get_readiness_policy() if settings.READINESS_PROBE_ENABLED else None,
+        capture_mode=settings.HTML_CAPTURE_MODE,
+        capture_max_bytes=settings.HTML_CAPTURE_MAX_BYTES,
     )
 
 
@@ -0,0 +1,143 @@
+"""Keyword-level cache of search results with stale-while-revalidate."""
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+Posts = List[Dict[str, Any]]
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Collapse whitespace like ``validate_keyword`` and case-fold the keyword."""
+    return re.sub(r"\s+", " ", keyword.strip()).casefold()
+
+
+class SearchCache:
+    """Caches the top posts found for a keyword.
+
+    Results younger than ``ttl`` seconds are served directly. Older ones,
+    up to ``ttl + stale_ttl``, are still served immediately while a single
+    background task per keyword refreshes them from the upstream providers.
+    Only successful searches are cached; a failed refresh keeps the stale
+    entry. At most ``max_entries`` keywords are kept, least recently used
+    first out.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 6 * 3600.0,
+        stale_ttl: float = 7 * 86400.0,
+        max_entries: int = 2000,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Posts]]" = OrderedDict()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_failures": 0,
+        }
+
+    async def get_or_fetch(
+        self, keyword: str, fetch: Callable[[], Awaitable[Optional[Posts]]]
+    ) -> Optional[Posts]:
+        """Return cached posts for the keyword, calling ``fetch`` on a miss.
+
+        Args:
+            keyword: Search keyword (normalized for the cache key)
+            fetch: Upstream search returning posts, or None/empty on failure
+
+        Returns:
+            Cached or freshly fetched posts, or None if the search failed
+        """
+        key = normalize_keyword(keyword)
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[1]
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                self._refresh_in_background(key, fetch)
+                logger.info("Serving stale search results", keyword=key, age=round(age))
+                return entry[1]
+
+        self._stats["misses"] += 1
+        posts = await fetch()
+        if posts:
+            self._store(key, posts)
+        return posts
+
+    def _store(self, key: str, posts: Posts) -> None:
+        self._entries[key] = (time.monotonic(), posts)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _refresh_in_background(
+        self, key: str, fetch: Callable[[], Awaitable[Optional[Posts]]]
+    ) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                posts = await fetch()
+                if posts:
+                    self._store(key, posts)
+                    self._stats["refreshes"] += 1
+                else:
+                    self._stats["refresh_failures"] += 1
+            except Exception as e:
+                self._stats["refresh_failures"] += 1
+                logger.warning("Search refresh failed", keyword=key, error=str(e))
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit ratio and upstream calls avoided for the metrics endpoint."""
+        served = self._stats["hits"] + self._stats["stale_hits"]
+        lookups = served + self._stats["misses"]
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "refreshing": len(self._refreshing),
+            "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+            # Stale hits still refresh upstream, but off the request path
+            "upstream_calls_avoided": self._stats["hits"],
+        }
+
+
+# Singleton
+_search_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Get the process-wide search cache, or None if caching is disabled."""
+    global _search_cache
+    if not settings.SEARCH_CACHE_ENABLED:
+        return None
+    if _search_cache is None:
+        _search_cache = SearchCache(
+            ttl=settings.SEARCH_CACHE_TTL,
+            stale_ttl=settings.SEARCH_CACHE_STALE_TTL,
+        )
+        register_stats_provider("search_cache", _search_cache.stats)
+    return _search_cache
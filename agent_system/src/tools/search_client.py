@@ -1,10 +1,12 @@
-# requirements.txt
-# google-custom-search[async]>=3.0.0  (# not working : DEBUGGING REQUIRED)
+"""Google Custom Search JSON API client with a pooled keep-alive session."""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import aiohttp
 
-import os, asyncio
-from typing import List, Dict, Any
-import google_custom_search
 from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
 from src.config import settings
 
 logger = get_logger(__name__)
@@ -12,46 +14,146 @@ logger = get_logger(__name__)
 GOOGLE_API_KEY = settings.GOOGLE_API_KEY
 GOOGLE_SEARCH_ENGINE_ID = settings.GOOGLE_SEARCH_ENGINE_ID
 
+CUSTOM_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+
 
 class SearchError(Exception):
     pass
 
 
 class SearchClient:
-    def __init__(self, api_key: str, cx: str):
-        self.client = google_custom_search.CustomSearch(
-            token=api_key, engine_id=cx, image=False
-        )
-        logger.info("SearchClient initialized (async)")
+    """Process-wide Custom Search client.
+
+    One aiohttp session with a keep-alive connection pool is shared by every
+    search, so fallback searches reuse warm TLS connections to
+    googleapis.com. At most ``max_concurrency`` searches are in flight at
+    once. The session is closed by the app lifespan via
+    ``close_search_client()``.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        cx: str,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+        max_concurrency: int = 5,
+    ):
+        self.api_key = api_key
+        self.cx = cx
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._stats = {"requests": 0, "errors": 0, "waited_for_slot": 0}
+        logger.info("SearchClient initialized (async, pooled)")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
 
     async def search_top_posts(
         self, keyword: str, num_results: int = 10
     ) -> List[Dict[str, str]]:
-        try:
-            results = await self.client.search_async(keyword)
-            output = []
-            for idx, r in enumerate(results[:num_results]):
-                output.append({"url": r.url, "title": r.title, "snippet": r.snippet})
-            logger.info("Async search completed", keyword=keyword, count=len(output))
-            return output
-        except Exception as e:
-            logger.error("Custom Search API error", keyword=keyword, error=str(e))
-            raise SearchError(str(e))
-        finally:
-            await self.client.close()
+        params = {
+            "key": self.api_key,
+            "cx": self.cx,
+            "q": keyword,
+            # The API returns at most 10 results per request
+            "num": max(1, min(num_results, 10)),
+        }
+        if self._semaphore.locked():
+            self._stats["waited_for_slot"] += 1
+        async with self._semaphore:
+            self._stats["requests"] += 1
+            try:
+                async with self._get_session().get(
+                    CUSTOM_SEARCH_URL, params=params
+                ) as resp:
+                    data = await resp.json(content_type=None)
+                    if resp.status >= 400 or "error" in data:
+                        message = data.get("error", {}).get("message", resp.reason)
+                        raise SearchError(f"HTTP {resp.status}: {message}")
+            except SearchError as e:
+                self._stats["errors"] += 1
+                logger.error("Custom Search API error", keyword=keyword, error=str(e))
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                self._stats["errors"] += 1
+                logger.error("Custom Search API error", keyword=keyword, error=str(e))
+                raise SearchError(str(e)) from e
+
+        output = [
+            {
+                "url": item["link"],
+                "title": item.get("title", ""),
+                "snippet": item.get("snippet", ""),
+            }
+            for item in data.get("items", [])[:num_results]
+            if item.get("link")
+        ]
+        logger.info("Async search completed", keyword=keyword, count=len(output))
+        return output
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request counters and pool state for the metrics endpoint."""
+        return {
+            **self._stats,
+            "session_open": self._session is not None and not self._session.closed,
+        }
+
+
+# Singleton
+_search_client: Optional[SearchClient] = None
 
 
 def create_search_client() -> SearchClient:
+    """Get the process-wide search client, creating it on first use."""
+    global _search_client
     if not GOOGLE_API_KEY or not GOOGLE_SEARCH_ENGINE_ID:
         raise ValueError("GOOGLE_API_KEY and GOOGLE_SEARCH_ENGINE_ID must be set")
-    return SearchClient(GOOGLE_API_KEY, GOOGLE_SEARCH_ENGINE_ID)
+    if _search_client is None:
+        _search_client = SearchClient(
+            GOOGLE_API_KEY,
+            GOOGLE_SEARCH_ENGINE_ID,
+            timeout=settings.SEARCH_TIMEOUT,
+            max_concurrency=settings.SEARCH_MAX_CONCURRENCY,
+        )
+        register_stats_provider("search_client", _search_client.stats)
+    return _search_client
+
+
+async def close_search_client() -> None:
+    """Close the search client's session (called from the app lifespan)."""
+    if _search_client is not None:
+        await _search_client.close()
 
 
 # Example usage
 async def main():
     client = create_search_client()
-    results = await client.search_top_posts("python asyncio tutorial", num_results=10)
-    print(results)
+    try:
+        results = await client.search_top_posts(
+            "python asyncio tutorial", num_results=10
+        )
+        print(results)
+    finally:
+        await close_search_client()
 
 
 if __name__ == "__main__":
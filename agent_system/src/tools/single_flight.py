@@ -0,0 +1,104 @@
+"""Coalescing of identical in-flight calls (single-flight)."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one operation per key at a time.
+
+    Callers that arrive while an operation for their key is in flight await
+    that operation instead of starting another one, and all of them get its
+    result or exception. The operation runs in its own task, shielded from
+    its callers: if the caller that started it is cancelled (e.g. the client
+    disconnected) the others keep waiting on it, and it is only cancelled
+    once no caller is left. Nothing is kept after the operation finishes;
+    caching results is left to the caller.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "abandoned": 0,
+        }
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of ``fn()``, sharing it with concurrent callers.
+
+        Args:
+            key: Identity of the operation; equal keys are coalesced
+            fn: Coroutine factory, only called if no operation is in flight
+
+        Returns:
+            The result of the (possibly shared) operation
+        """
+        self._stats["calls"] += 1
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.create_task(fn()))
+            call.task.add_done_callback(lambda task: self._finished(key, call))
+            self._calls[key] = call
+            self._stats["executions"] += 1
+        else:
+            self._stats["coalesced"] += 1
+            logger.debug("Joined in-flight call", group=self.name)
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every caller gave up; stop the work and let the next caller
+                # start afresh instead of joining a cancelled task.
+                self._stats["abandoned"] += 1
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+
+    def _finished(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.task.cancelled():
+            # Mark the exception retrieved when every caller has left
+            call.task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return execution and coalescing counters."""
+        return {**self._stats, "in_flight": len(self._calls)}
+
+
+# Singletons, one group per kind of operation
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Get the process-wide single-flight group for ``name``."""
+    group = _groups.get(name)
+    if group is None:
+        if not _groups:
+            register_stats_provider("single_flight", single_flight_stats)
+        group = _groups[name] = SingleFlight(name)
+    return group
+
+
+def single_flight_stats() -> Dict[str, Any]:
+    """Return the counters of every group for the metrics endpoint."""
+    return {name: group.stats() for name, group in _groups.items()}
@@ -0,0 +1,120 @@
+"""Parsing and repair of schema-constrained JSON responses from Gemini."""
+
+import json
+import re
+from typing import Any, Dict, Optional
+
+from pydantic import ValidationError
+
+from src.utils.logger import get_logger
+from src.utils.metrics import register_stats_provider
+
+logger = get_logger(__name__)
+
+REPAIR_PROMPT = """
+The JSON below does not match the required schema.
+
+Validation error:
+{error}
+
+JSON:
+{text}
+
+Return only the corrected JSON, keeping every value that is already valid.
+""".strip()
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([\]}])")
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a response still does not match its schema after repair."""
+
+
+def schema_name(schema: Any) -> str:
+    """Return a readable name for a response schema, e.g. ``list[SEOEvaluation]``."""
+    args = getattr(schema, "__args__", None)
+    if args:
+        inner = ", ".join(schema_name(arg) for arg in args)
+        return f"{getattr(schema, '__name__', 'list')}[{inner}]"
+    return getattr(schema, "__name__", str(schema))
+
+
+def repair_json_text(text: str) -> Optional[str]:
+    """Cheaply fix common wrapping mistakes without another model call.
+
+    Strips Markdown code fences, cuts the outermost JSON array or object out
+    of surrounding prose and removes trailing commas.
+
+    Returns:
+        The repaired text, or None if it is unchanged or contains no JSON
+    """
+    repaired = text.strip()
+    fenced = _FENCE.match(repaired)
+    if fenced:
+        repaired = fenced.group(1)
+    starts = [i for i in (repaired.find("["), repaired.find("{")) if i >= 0]
+    if not starts:
+        return None
+    start = min(starts)
+    end = repaired.rfind("]" if repaired[start] == "[" else "}")
+    if end <= start:
+        return None
+    repaired = _TRAILING_COMMA.sub(r"\1", repaired[start : end + 1])
+    return repaired if repaired != text else None
+
+
+class StructuredOutputStats:
+    """Per-schema counters of how structured responses were parsed."""
+
+    OUTCOMES = ("parsed", "repaired_locally", "repaired_by_model", "failed")
+
+    def __init__(self):
+        self._schemas: Dict[str, Dict[str, int]] = {}
+
+    def record(self, schema: str, outcome: str) -> None:
+        counts = self._schemas.setdefault(schema, {name: 0 for name in self.OUTCOMES})
+        counts[outcome] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return outcome counts and parse failure rates per schema."""
+        result = {}
+        for schema, counts in self._schemas.items():
+            calls = sum(counts.values())
+            result[schema] = {
+                **counts,
+                "calls": calls,
+                # Share of responses that did not validate as returned
+                "parse_failure_rate": (
+                    round((calls - counts["parsed"]) / calls, 3) if calls else 0.0
+                ),
+                "repair_calls": counts["repaired_by_model"] + counts["failed"],
+            }
+        return result
+
+
+def error_summary(error: Exception, limit: int = 500) -> str:
+    """Shorten a validation or decode error for logs and repair prompts."""
+    if isinstance(error, ValidationError):
+        message = json.dumps(
+            [
+                {"loc": list(e["loc"]), "msg": e["msg"]}
+                for e in error.errors(include_url=False)[:10]
+            ]
+        )
+    else:
+        message = str(error)
+    return message[:limit]
+
+
+# Singleton
+_structured_stats: Optional[StructuredOutputStats] = None
+
+
+def get_structured_stats() -> StructuredOutputStats:
+    """Get the process-wide structured output counters."""
+    global _structured_stats
+    if _structured_stats is None:
+        _structured_stats = StructuredOutputStats()
+        register_stats_provider("structured_output", _structured_stats.stats)
+    return _structured_stats
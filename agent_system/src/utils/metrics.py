@@ -0,0 +1,30 @@
+"""Registry of component statistics exposed by the metrics endpoint."""
+
+from typing import Any, Callable, Dict
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+StatsProvider = Callable[[], Dict[str, Any]]
+
+_providers: Dict[str, StatsProvider] = {}
+
+
+def register_stats_provider(name: str, provider: StatsProvider) -> None:
+    """Register a callable returning a component's current statistics."""
+    _providers[name] = provider
+
+
+def collect_stats() -> Dict[str, Any]:
+    """Collect statistics from every registered component."""
+    stats = {}
+    for name, provider in _providers.items():
+        try:
+            stats[name] = provider()
+        except Exception as e:
+            logger.warning(
+                "Failed to collect component stats", component=name, error=str(e)
+            )
+            stats[name] = {"error": str(e)}
+    return stats
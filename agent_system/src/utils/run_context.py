@@ -0,0 +1,68 @@
+"""Per-run context visible to every node and tool of a blog generation run."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass
+class RunContext:
+    """State of the current run that tools need but the graph state lacks.
+
+    Attributes:
+        run_id: Thread ID of the run
+        in_progress: Whether the run already got an LLM call through (or was
+            resumed); such runs are served before new ones
+        deadline: ``time.monotonic()`` by which the run should finish, or None
+        stream_tokens: Whether nodes should stream LLM output to the client
+    """
+
+    run_id: str
+    in_progress: bool = False
+    deadline: Optional[float] = None
+    stream_tokens: bool = False
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the deadline (never negative), or None."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+
+_current_run: ContextVar[Optional[RunContext]] = ContextVar("current_run", default=None)
+
+
+def current_run() -> Optional[RunContext]:
+    """Return the context of the run executing this task, if any."""
+    return _current_run.get()
+
+
+@contextmanager
+def run_scope(
+    run_id: str,
+    in_progress: bool = False,
+    time_budget: Optional[float] = None,
+    stream_tokens: bool = False,
+) -> Iterator[RunContext]:
+    """Make a run's context current; tasks created inside inherit it.
+
+    Args:
+        run_id: Thread ID of the run
+        in_progress: Whether the run is resumed rather than new
+        time_budget: Seconds the run may take from now, or None for no deadline
+        stream_tokens: Whether nodes should stream LLM output to the client
+    """
+    deadline = time.monotonic() + time_budget if time_budget else None
+    run = RunContext(
+        run_id=run_id,
+        in_progress=in_progress,
+        deadline=deadline,
+        stream_tokens=stream_tokens,
+    )
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
@@ -158,6 +158,36 @@ def sample_blog_content():
     """
 
 
+@pytest.fixture(autouse=True)
+def disable_html_cache(monkeypatch):
+    """Keep tests from writing the on-disk HTML cache in the working directory."""
+    monkeypatch.setattr("src.config.settings.HTML_CACHE_ENABLED", False)
+
+
+@pytest.fixture(autouse=True)
+def disable_search_cache(monkeypatch):
+    """Keep cached search results from leaking between tests."""
+    monkeypatch.setattr("src.config.settings.SEARCH_CACHE_ENABLED", False)
+
+
+@pytest.fixture(autouse=True)
+def disable_llm_cache(monkeypatch):
+    """Keep tests from sharing cached Gemini responses or writing them to disk."""
+    monkeypatch.setattr("src.config.settings.LLM_CACHE_MODE", "off")
+
+
+@pytest.fixture(autouse=True)
+def unlimited_gemini_rate(monkeypatch):
+    """Keep the process-wide Gemini rate governor out of unit tests."""
+    monkeypatch.setattr("src.config.settings.GEMINI_RPM", 0)
+
+
+@pytest.fixture(autouse=True)
+def in_memory_checkpointer(monkeypatch):
+    """Keep tests from writing the checkpoint database in the working directory."""
+    monkeypatch.setattr("src.config.settings.CHECKPOINT_BACKEND", "memory")
+
+
 # Environment variable overrides for testing
 @pytest.fixture(autouse=True)
 def mock_env_vars(monkeypatch):
@@ -130,6 +130,50 @@ class TestBlogGenerationEndpoint:
         assert response.status_code in [200, 500]
 
 
+class TestStreamEndpoint:
+    """Test cases for the Server-Sent Events generation endpoint."""
+
+    def test_stream_emits_progress_then_scores(self, client: TestClient, monkeypatch):
+        """Node and token events are followed by a closing event with the scores."""
+        from unittest.mock import AsyncMock
+        from src.schemas.llm import SEOEvaluation
+
+        class FakeGraph:
+            async def run_blog_generation(self, on_event, **kwargs):
+                on_event("node", {"node": "generate", "status": "started"})
+                on_event("token", {"text": "<h1>Hi</h1>", "attempt": 1})
+                on_event("node", {"node": "generate", "status": "completed"})
+                return {
+                    "success": True,
+                    "final_blog": "<h1>Hi</h1>",
+                    "seo_scores": {name: 82.0 for name in SEOEvaluation.model_fields},
+                    "final_score": 82.0,
+                    "attempts": 1,
+                }
+
+        monkeypatch.setattr(
+            "src.api.routes.blog.get_blog_generation_graph",
+            AsyncMock(return_value=FakeGraph()),
+        )
+
+        response = client.post(
+            "/api/v1/generate-blog/stream",
+            json={"keyword": "test keyword"},
+            headers={"Authorization": "Bearer test-key"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            line.split(": ", 1)[1]
+            for line in response.text.splitlines()
+            if line.startswith("event: ")
+        ]
+        assert events == ["run", "node", "token", "node", "complete"]
+        closing = response.text.strip().splitlines()[-1]
+        assert '"final_score": 82.0' in closing
+
+
 class TestErrorHandling:
     """Test cases for error handling."""
     
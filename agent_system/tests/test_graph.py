@@ -1,15 +1,24 @@
 """Test cases for LangGraph workflow - Fixed version."""
 
+import asyncio
+import time
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 
+from src.config import settings
+
 from src.schemas.state import GraphState
+from src.schemas.llm import SEOEvaluation
 from src.agents.nodes.search_top_posts import search_top_posts
 from src.agents.nodes.scrape_posts import scrape_posts
 from src.agents.nodes.clean_validate import clean_validate
 from src.agents.nodes.generate_blog import generate_blog
 from src.agents.nodes.evaluate_seo import evaluate_seo
 from src.agents.nodes.react_agent import react_agent, decide_next_action
+from src.memory.checkpointer import EnhancedMemorySaver
+from src.memory.raw_html_store import get_raw_html_store
+from src.tools.clean_pool import CleanPool
+from src.tools.scraper import PlaywrightScraper
 
 
 class TestGraphState:
@@ -29,7 +38,7 @@ class TestGraphState:
         assert state.max_attempts == 3
         assert state.seo_threshold == 75.0  # Default value
         assert state.final_blog == ""
-        assert state.raw_html_content == {}
+        assert state.raw_html_ref is None
     
     def test_graph_state_with_custom_values(self):
         """Test GraphState creation with custom values."""
@@ -120,9 +129,43 @@ class TestScrapePostsNode:
             
             result = await scrape_posts(sample_graph_state)
             
-            assert "raw_html_content" in result
-            assert len(result["raw_html_content"]) == 2
+            assert len(get_raw_html_store().pop(result["raw_html_ref"])) == 2
     
+    @pytest.mark.asyncio
+    async def test_scrape_posts_quorum_cancels_slow_fetches(
+        self, sample_graph_state, monkeypatch
+    ):
+        """Scraping stops once enough quality posts are cleaned."""
+        urls = [f"https://example.com/post-{i}" for i in range(3)]
+        sample_graph_state.top_posts = [{"url": url} for url in urls]
+        article = (
+            "<html><head><title>Guide</title></head><body>"
+            + "".join("<p>" + " ".join(["content"] * 80) + "</p>" for _ in range(5))
+            + "</body></html>"
+        )
+        cancelled = []
+
+        async def fake_fetch_tiered(get_browser, url, ua):
+            if url.endswith("2"):
+                try:
+                    await asyncio.sleep(30)
+                except asyncio.CancelledError:
+                    cancelled.append(url)
+                    raise
+            return url, article, "static"
+
+        scraper = PlaywrightScraper()
+        scraper._fetch_tiered = fake_fetch_tiered
+        monkeypatch.setattr(settings, "SCRAPE_QUORUM", 2)
+
+        with patch(
+            "src.agents.nodes.scrape_posts.create_scraper", return_value=scraper
+        ):
+            result = await asyncio.wait_for(scrape_posts(sample_graph_state), timeout=5)
+
+        assert len(result["cleaned_posts"]) == 2
+        assert cancelled == [urls[2]]
+
     @pytest.mark.asyncio
     async def test_scrape_posts_empty_posts(self, sample_graph_state):
         """Test scraping with no posts."""
@@ -130,7 +173,64 @@ class TestScrapePostsNode:
         
         result = await scrape_posts(sample_graph_state)
         
-        assert result["raw_html_content"] == {}
+        assert result["raw_html_ref"] is None
+
+
+class TestCleanValidateNode:
+    """Test cases for clean_validate node."""
+
+    @pytest.mark.asyncio
+    async def test_clean_validate_releases_raw_html(
+        self, sample_graph_state, monkeypatch
+    ):
+        """Raw HTML is read from the side store and released after cleaning."""
+        monkeypatch.setattr(settings, "CLEAN_POOL_MODE", "inline")
+        monkeypatch.setattr("src.tools.clean_pool._clean_pool", None)
+        article = (
+            "<html><head><title>Guide</title></head><body>"
+            + "".join("<p>" + " ".join(["content"] * 80) + "</p>" for _ in range(5))
+            + "</body></html>"
+        )
+        store = get_raw_html_store()
+        sample_graph_state.raw_html_ref = store.put({"https://example.com/a": article})
+
+        result = await clean_validate(sample_graph_state)
+
+        assert len(result["cleaned_posts"]) == 1
+        assert result["raw_html_ref"] is None
+        assert store.pop(sample_graph_state.raw_html_ref) == {}
+
+    @pytest.mark.asyncio
+    async def test_clean_validate_keeps_empty_scrape_result(
+        self, sample_graph_state, monkeypatch
+    ):
+        """Pages the scrape cleaned and rejected are not cleaned a second time."""
+        urls = [f"https://example.com/thin-{i}" for i in range(2)]
+        sample_graph_state.top_posts = [{"url": url} for url in urls]
+        thin = "<html><head><title>Thin</title></head><body><p>Too short.</p></body></html>"
+        pool = CleanPool(mode="inline")
+        pool.clean = AsyncMock(wraps=pool.clean)
+        monkeypatch.setattr("src.tools.clean_pool.get_clean_pool", lambda: pool)
+
+        async def fake_fetch_tiered(get_browser, url, ua):
+            return url, thin, "static"
+
+        scraper = PlaywrightScraper()
+        scraper._fetch_tiered = fake_fetch_tiered
+        with patch(
+            "src.agents.nodes.scrape_posts.create_scraper", return_value=scraper
+        ):
+            sample_graph_state = sample_graph_state.model_copy(
+                update=await scrape_posts(sample_graph_state)
+            )
+        assert sample_graph_state.cleaned_posts == []
+        assert pool.clean.await_count == 2
+
+        result = await clean_validate(sample_graph_state)
+
+        assert result == {"cleaned_posts": [], "raw_html_ref": None}
+        assert pool.clean.await_count == 2
+        assert get_raw_html_store().pop(sample_graph_state.raw_html_ref) == {}
 
 
 class TestReactAgentNode:
@@ -206,21 +306,16 @@ class TestEvaluateSEONode:
         """Test SEO evaluation with valid content."""
         sample_graph_state.draft_blog = sample_blog_content
         
-        mock_evaluation = """
-        ```json
-        {
-            "title_score": 85,
-            "meta_description_score": 80,
-            "keyword_optimization_score": 90,
-            "content_structure_score": 88,
-            "readability_score": 82,
-            "content_quality_score": 87,
-            "technical_seo_score": 85,
-            "final_score": 85.0,
-            "feedback": "Good content overall"
-        }
-        ```
-        """
+        mock_evaluation = SEOEvaluation(
+            title_score=85,
+            meta_description_score=80,
+            keyword_optimization_score=90,
+            content_structure_score=88,
+            readability_score=82,
+            content_quality_score=87,
+            technical_seo_score=85,
+            final_score=85.0,
+        )
         
         with patch('src.agents.nodes.evaluate_seo.get_gemini_client') as mock_gemini, \
              patch('builtins.open', mock_open_read_text("Evaluate: {blog_content}")):
@@ -249,4 +344,801 @@ class TestEvaluateSEONode:
 def mock_open_read_text(content):
     """Helper function to mock file reading."""
     from unittest.mock import mock_open
-    return mock_open(read_data=content)
\ No newline at end of file
+    return mock_open(read_data=content)
+
+
+class TestCheckpointer:
+    """Test cases for the bounded checkpointer."""
+
+    @staticmethod
+    def compile_echo_graph(saver):
+        from typing import TypedDict
+        from langgraph.graph import StateGraph, END
+
+        class EchoState(TypedDict):
+            text: str
+
+        workflow = StateGraph(EchoState)
+        workflow.add_node("echo", lambda state: {"text": state["text"] * 2})
+        workflow.set_entry_point("echo")
+        workflow.add_edge("echo", END)
+        return workflow.compile(checkpointer=saver)
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_threads_evicted_over_size(self):
+        """Old runs are evicted once the total checkpoint size exceeds the cap."""
+        saver = EnhancedMemorySaver(max_bytes=50_000)
+        app = self.compile_echo_graph(saver)
+
+        for i in range(5):
+            config = {"configurable": {"thread_id": f"run-{i}"}}
+            await app.ainvoke({"text": "x" * 3000}, config=config)
+
+        stats = saver.stats()
+        assert stats["bytes"] <= 50_000
+        assert stats["evictions"]["size"] > 0
+        assert "run-4" in saver.storage
+        assert "run-0" not in saver.storage
+
+    @pytest.mark.asyncio
+    async def test_idle_threads_expire(self, monkeypatch):
+        """Threads idle past the TTL are dropped on the next write."""
+        now = [1000.0]
+        monkeypatch.setattr("src.memory.checkpointer.time.monotonic", lambda: now[0])
+        saver = EnhancedMemorySaver(ttl=60)
+        app = self.compile_echo_graph(saver)
+
+        await app.ainvoke({"text": "a"}, config={"configurable": {"thread_id": "old"}})
+        now[0] += 61
+        await app.ainvoke({"text": "b"}, config={"configurable": {"thread_id": "new"}})
+
+        assert list(saver.storage) == ["new"]
+        assert saver.stats()["threads"] == 1
+        assert saver.stats()["evictions"]["ttl"] == 1
+
+
+class TestSqliteCheckpointer:
+    """Test cases for the durable SQLite checkpointer."""
+
+    @staticmethod
+    def compile_two_step_graph(saver, calls):
+        from typing import TypedDict
+        from langgraph.graph import StateGraph, END
+
+        class StepState(TypedDict):
+            text: str
+
+        def expensive(state):
+            calls.append("expensive")
+            return {"text": state["text"] * 2}
+
+        def flaky(state):
+            calls.append("flaky")
+            if calls.count("flaky") == 1:
+                raise RuntimeError("worker died")
+            return {"text": state["text"] + "!"}
+
+        workflow = StateGraph(StepState)
+        workflow.add_node("expensive", expensive)
+        workflow.add_node("flaky", flaky)
+        workflow.set_entry_point("expensive")
+        workflow.add_edge("expensive", "flaky")
+        workflow.add_edge("flaky", END)
+        return workflow.compile(checkpointer=saver)
+
+    @pytest.mark.asyncio
+    async def test_resume_after_restart_skips_completed_nodes(self, tmp_path):
+        """A new saver on the same file resumes the run after its last node."""
+        from src.memory.sqlite_checkpointer import SqliteCheckpointSaver
+
+        path = str(tmp_path / "checkpoints.sqlite3")
+        config = {"configurable": {"thread_id": "run-1"}}
+        calls = []
+
+        saver = SqliteCheckpointSaver(path)
+        app = self.compile_two_step_graph(saver, calls)
+        with pytest.raises(RuntimeError):
+            await app.ainvoke({"text": "x" * 2000}, config=config)
+        saver.close()
+
+        restarted = SqliteCheckpointSaver(path)
+        app = self.compile_two_step_graph(restarted, calls)
+        snapshot = await app.aget_state(config)
+        assert snapshot.next == ("flaky",)
+
+        result = await app.ainvoke(None, config=config)
+
+        assert result["text"] == "x" * 4000 + "!"
+        assert calls == ["expensive", "flaky", "flaky"]
+        assert restarted.stats()["threads"] == 1
+
+        await restarted.adelete_thread("run-1")
+        assert await restarted.aget_tuple(config) is None
+        restarted.close()
+
+
+class TestResumeOnFailure:
+    """Test cases for resuming failed runs from their last checkpoint."""
+
+    @pytest.mark.asyncio
+    async def test_failed_node_retried_without_rerunning_earlier_nodes(self):
+        """Only the failing node runs again, and the retry is reported."""
+        from src.agents.graph import BlogGenerationGraph
+
+        calls = []
+        graph = BlogGenerationGraph()
+        graph.app = TestSqliteCheckpointer.compile_two_step_graph(
+            EnhancedMemorySaver(), calls
+        )
+        retried = {}
+
+        result = await graph._invoke_with_resume(
+            {"text": "ab"}, {"configurable": {"thread_id": "run-1"}}, retried
+        )
+
+        assert result["text"] == "abab!"
+        assert calls == ["expensive", "flaky", "flaky"]
+        assert retried == {"flaky": 1}
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_node_retry_limit(self, monkeypatch):
+        """A node that keeps failing is retried up to its limit, then raises."""
+        from src.agents.graph import BlogGenerationGraph
+
+        monkeypatch.setattr("src.agents.graph.DEFAULT_NODE_RETRY_LIMIT", 0)
+        graph = BlogGenerationGraph()
+        graph.app = TestSqliteCheckpointer.compile_two_step_graph(
+            EnhancedMemorySaver(), []
+        )
+        retried = {}
+
+        with pytest.raises(RuntimeError):
+            await graph._invoke_with_resume(
+                {"text": "ab"}, {"configurable": {"thread_id": "run-2"}}, retried
+            )
+        assert retried == {}
+
+    @pytest.mark.asyncio
+    async def test_no_retry_after_run_deadline(self):
+        """A node failing after the run's deadline is not retried."""
+        from src.agents.graph import BlogGenerationGraph
+        from src.utils.run_context import run_scope
+
+        calls = []
+        graph = BlogGenerationGraph()
+        graph.app = TestSqliteCheckpointer.compile_two_step_graph(
+            EnhancedMemorySaver(), calls
+        )
+        retried = {}
+
+        with run_scope("run-3", time_budget=60) as run:
+            run.deadline = time.monotonic() - 1
+            with pytest.raises(RuntimeError):
+                await graph._invoke_with_resume(
+                    {"text": "ab"}, {"configurable": {"thread_id": "run-3"}}, retried
+                )
+        assert calls == ["expensive", "flaky"]
+        assert retried == {}
+
+
+class TestSearchCache:
+    """Test cases for the keyword search result cache."""
+
+    @pytest.mark.asyncio
+    async def test_normalized_keyword_hits_without_upstream_call(self):
+        """Spacing and case variants of a keyword share one upstream search."""
+        from src.tools.search_cache import SearchCache
+
+        cache = SearchCache(ttl=60)
+        fetch = AsyncMock(return_value=[{"url": "https://a.example"}])
+
+        await cache.get_or_fetch("FastAPI  tutorial", fetch)
+        posts = await cache.get_or_fetch(" fastapi tutorial ", fetch)
+
+        assert posts == [{"url": "https://a.example"}]
+        assert fetch.await_count == 1
+        stats = cache.stats()
+        assert stats["hit_ratio"] == 0.5
+        assert stats["upstream_calls_avoided"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_results_served_while_refreshing(self, monkeypatch):
+        """Expired results are returned at once and refreshed in the background."""
+        from src.tools.search_cache import SearchCache
+
+        now = [1000.0]
+        monkeypatch.setattr("src.tools.search_cache.time.monotonic", lambda: now[0])
+        cache = SearchCache(ttl=60, stale_ttl=600)
+        await cache.get_or_fetch("kw", AsyncMock(return_value=[{"url": "old"}]))
+        now[0] += 61
+
+        fetch = AsyncMock(return_value=[{"url": "new"}])
+        assert await cache.get_or_fetch("kw", fetch) == [{"url": "old"}]
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert fetch.await_count == 1
+        assert await cache.get_or_fetch("kw", fetch) == [{"url": "new"}]
+        assert cache.stats()["refreshes"] == 1
+
+
+class TestHedgedSearch:
+    """Test cases for racing the search providers."""
+
+    POSTS = [{"url": f"https://blog.example/{i}"} for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_fallback_wins_and_slow_primary_is_cancelled(self):
+        """A valid fallback result wins and the primary is cancelled."""
+        from src.tools.hedged_search import hedged_search
+
+        cancelled = asyncio.Event()
+
+        async def slow_primary():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def fallback():
+            return self.POSTS
+
+        winner, posts = await hedged_search(
+            ("gemini_grounding", slow_primary), ("custom_search", fallback), delay=0.01
+        )
+        await asyncio.sleep(0)
+
+        assert winner == "custom_search"
+        assert posts == self.POSTS
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_fast_valid_primary_never_starts_fallback(self):
+        """The fallback is not started when the primary wins within the delay."""
+        from src.tools.hedged_search import hedged_search
+
+        fallback = AsyncMock(return_value=self.POSTS)
+
+        async def primary():
+            return self.POSTS
+
+        winner, _ = await hedged_search(
+            ("gemini_grounding", primary), ("custom_search", fallback), delay=1.0
+        )
+
+        assert winner == "gemini_grounding"
+        fallback.assert_not_called()
+
+
+class TestSearchClient:
+    """Test cases for the pooled Custom Search client."""
+
+    @pytest.mark.asyncio
+    async def test_searches_share_one_session(self, monkeypatch):
+        """Consecutive searches reuse the pooled session until it is closed."""
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+        from src.tools.search_client import SearchClient
+
+        async def handler(request):
+            assert request.query["q"] == "fastapi"
+            return web.json_response(
+                {"items": [{"link": "https://a.example", "title": "A", "snippet": "s"}]}
+            )
+
+        api = web.Application()
+        api.router.add_get("/customsearch/v1", handler)
+        async with TestServer(api) as server:
+            monkeypatch.setattr(
+                "src.tools.search_client.CUSTOM_SEARCH_URL",
+                str(server.make_url("/customsearch/v1")),
+            )
+            client = SearchClient("key", "cx")
+            first = await client.search_top_posts("fastapi")
+            session = client._session
+            await client.search_top_posts("fastapi")
+
+            assert client._session is session
+            assert first == [{"url": "https://a.example", "title": "A", "snippet": "s"}]
+            assert client.stats()["requests"] == 2
+            await client.close()
+            assert not client.stats()["session_open"]
+
+
+class TestStructuredOutput:
+    """Test cases for schema-constrained Gemini responses."""
+
+    @staticmethod
+    def client_returning(*responses):
+        from src.tools.gemini_client import GeminiClient
+
+        client = GeminiClient.__new__(GeminiClient)
+        client._generate_text = AsyncMock(side_effect=list(responses))
+        return client
+
+    @pytest.mark.asyncio
+    async def test_fenced_json_repaired_without_second_call(self):
+        """Wrapping mistakes are fixed locally instead of re-asking the model."""
+        from src.schemas.llm import SearchResultItem
+
+        client = self.client_returning(
+            'Sure:\n```json\n[{"url": "https://a.example", "title": "A", '
+            '"snippet": "s"},]\n```'
+        )
+
+        posts = await client.generate_content(
+            "prompt", response_schema=list[SearchResultItem]
+        )
+
+        assert posts[0].url == "https://a.example"
+        assert client._generate_text.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_single_model_repair_then_error(self):
+        """An invalid response gets one repair call, then raises."""
+        from src.tools.structured_output import (
+            StructuredOutputError,
+            get_structured_stats,
+        )
+
+        client = self.client_returning('{"final_score": "high"}', '{"oops": 1}')
+
+        with pytest.raises(StructuredOutputError):
+            await client.generate_content("prompt", response_schema=SEOEvaluation)
+
+        assert client._generate_text.await_count == 2
+        repair_prompt = client._generate_text.await_args_list[1].args[0]
+        assert "final_score" in repair_prompt and "prompt" not in repair_prompt
+        stats = get_structured_stats().stats()["SEOEvaluation"]
+        assert stats["failed"] >= 1
+        assert stats["parse_failure_rate"] > 0
+
+
+class TestLlmCache:
+    """Test cases for the Gemini response cache."""
+
+    @staticmethod
+    def client_with_api(text="cached text"):
+        from google.genai import types
+        from src.tools.gemini_client import GeminiClient
+
+        client = GeminiClient.__new__(GeminiClient)
+        client.model_name = "gemini-test"
+        client.base_config = types.GenerateContentConfig(
+            temperature=0.7, max_output_tokens=256
+        )
+        client._config_fields = set(types.GenerateContentConfig.model_fields)
+        response = MagicMock(text=text)
+        response.usage_metadata.total_token_count = 42
+        client.client = MagicMock()
+        client.client.aio.models.generate_content = AsyncMock(return_value=response)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_deterministic_calls_hit_memory_then_disk(
+        self, tmp_path, monkeypatch
+    ):
+        """Low-temperature calls hit memory, then disk after a restart."""
+        from src.tools import llm_cache
+
+        db = str(tmp_path / "llm.sqlite3")
+        monkeypatch.setattr(
+            llm_cache, "_llm_cache", llm_cache.LlmCache(path=db, max_temperature=0.2)
+        )
+        monkeypatch.setattr(settings, "LLM_CACHE_MODE", "deterministic")
+        client = self.client_with_api()
+        api = client.client.aio.models.generate_content
+
+        for _ in range(2):
+            assert await client.generate_content("p", temperature=0.1) == "cached text"
+        assert api.await_count == 1
+
+        llm_cache._llm_cache.close()
+        monkeypatch.setattr(llm_cache, "_llm_cache", llm_cache.LlmCache(path=db))
+        assert await client.generate_content("p", temperature=0.1) == "cached text"
+        assert api.await_count == 1
+        stats = llm_cache._llm_cache.stats()
+        assert stats["disk_hits"] == 1 and stats["tokens_saved"] == 42
+        llm_cache._llm_cache.close()
+
+    @pytest.mark.asyncio
+    async def test_sampled_and_opted_out_calls_bypass_cache(self, monkeypatch):
+        """High-temperature calls and cache=False always reach the API."""
+        from src.tools import llm_cache
+
+        monkeypatch.setattr(llm_cache, "_llm_cache", llm_cache.LlmCache())
+        monkeypatch.setattr(settings, "LLM_CACHE_MODE", "deterministic")
+        client = self.client_with_api()
+        api = client.client.aio.models.generate_content
+
+        await client.generate_content("p")
+        await client.generate_content("p")
+        await client.generate_content("q", temperature=0.0, cache=False)
+        await client.generate_content("q", temperature=0.0, cache=False)
+
+        assert api.await_count == 4
+        assert llm_cache._llm_cache.stats()["stores"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalid_structured_response_not_cached(self, monkeypatch):
+        """A response failing validation is asked for again, not replayed."""
+        from src.tools import llm_cache
+        from src.tools.structured_output import StructuredOutputError
+
+        monkeypatch.setattr(llm_cache, "_llm_cache", llm_cache.LlmCache())
+        monkeypatch.setattr(settings, "LLM_CACHE_MODE", "deterministic")
+        valid = SEOEvaluation(
+            title_score=85,
+            meta_description_score=80,
+            keyword_optimization_score=90,
+            content_structure_score=88,
+            readability_score=82,
+            content_quality_score=87,
+            technical_seo_score=85,
+            final_score=85.0,
+        )
+        client = self.client_with_api()
+        api = client.client.aio.models.generate_content
+        api.side_effect = [
+            MagicMock(text='{"final_score": "high"}'),
+            MagicMock(text='{"oops": 1}'),
+            MagicMock(text=valid.model_dump_json()),
+        ]
+
+        with pytest.raises(StructuredOutputError):
+            await client.generate_content(
+                "p", response_schema=SEOEvaluation, temperature=0.0
+            )
+        result = await client.generate_content(
+            "p", response_schema=SEOEvaluation, temperature=0.0
+        )
+
+        assert result == valid
+        assert api.await_count == 3
+        # The valid response is cached
+        await client.generate_content(
+            "p", response_schema=SEOEvaluation, temperature=0.0
+        )
+        assert api.await_count == 3
+
+    def test_key_covers_prompt_and_config(self):
+        """Any change to the prompt, config or schema yields a new key."""
+        from google.genai import types
+        from src.tools.llm_cache import llm_cache_key
+
+        base = types.GenerateContentConfig(temperature=0.0)
+        key = llm_cache_key("m", "p", base, False)
+
+        same = types.GenerateContentConfig(temperature=0.0)
+        assert key == llm_cache_key("m", "p", same, False)
+        assert key != llm_cache_key("m", "p2", base, False)
+        assert key != llm_cache_key("m", "p", base, True)
+        longer = types.GenerateContentConfig(temperature=0.0, max_output_tokens=9)
+        assert key != llm_cache_key("m", "p", longer, False)
+        schema_config = types.GenerateContentConfig(
+            temperature=0.0, response_schema=SEOEvaluation
+        )
+        assert key != llm_cache_key("m", "p", schema_config, False)
+
+
+class TestSingleFlight:
+    """Test cases for coalescing identical in-flight calls."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        """Same-key callers await one operation and get its result."""
+        from src.tools.single_flight import SingleFlight
+
+        group = SingleFlight("test")
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return ["post"]
+
+        results = await asyncio.gather(*(group.do("k", fetch) for _ in range(5)))
+
+        assert results == [["post"]] * 5
+        assert len(calls) == 1
+        assert group.stats()["coalesced"] == 4
+        assert group.stats()["in_flight"] == 0
+
+        await group.do("k", fetch)
+        assert len(calls) == 2  # Results are not cached after completion
+
+    @pytest.mark.asyncio
+    async def test_leader_cancellation_does_not_cancel_followers(self):
+        """The shared call survives its starter's cancellation while others wait."""
+        from src.tools.single_flight import SingleFlight
+
+        group = SingleFlight("test")
+        finished = asyncio.Event()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            finished.set()
+            return "done"
+
+        leader = asyncio.create_task(group.do("k", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(group.do("k", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "done"
+        assert finished.is_set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    @pytest.mark.asyncio
+    async def test_abandoned_call_is_cancelled(self):
+        """Once every caller is gone the operation is cancelled."""
+        from src.tools.single_flight import SingleFlight
+
+        group = SingleFlight("test")
+        cancelled = asyncio.Event()
+
+        async def fetch():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.create_task(group.do("k", fetch))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0.01)
+
+        assert cancelled.is_set()
+        assert group.stats() == {
+            "calls": 1,
+            "executions": 1,
+            "coalesced": 0,
+            "abandoned": 1,
+            "in_flight": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_share_a_search(self, sample_keyword):
+        """Two runs searching one keyword make a single upstream search."""
+        posts = [{"url": f"https://example.com/{i}"} for i in range(5)]
+
+        async def slow_search(keyword):
+            await asyncio.sleep(0.05)
+            return posts
+
+        with patch(
+            "src.agents.nodes.search_top_posts._search_upstream",
+            side_effect=slow_search,
+        ) as upstream:
+            results = await asyncio.gather(
+                search_top_posts(GraphState(keyword=sample_keyword)),
+                search_top_posts(GraphState(keyword=sample_keyword.upper())),
+            )
+
+        assert upstream.call_count == 1
+        assert results[0]["top_posts"] == results[1]["top_posts"] == posts
+
+
+class TestRateGovernor:
+    """Test cases for the Gemini rate governor."""
+
+    @pytest.mark.asyncio
+    async def test_requests_wait_for_refill(self):
+        """Calls beyond the bucket wait for it to refill and the wait is exported."""
+        from src.tools.rate_governor import RateGovernor
+
+        governor = RateGovernor(rpm=600, tpm=1_000_000)  # 10 per second
+        governor._requests = 1.0
+
+        assert await governor.acquire(10) < 0.01
+        waited = await governor.acquire(10)
+
+        assert 0.05 < waited < 0.5
+        stats = governor.stats()
+        assert stats["granted"] == 2 and stats["waited"] == 1
+        assert stats["max_wait_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_in_progress_runs_go_first(self):
+        """Queued calls of started runs are granted before new runs' calls."""
+        from src.tools.rate_governor import (
+            PRIORITY_IN_PROGRESS,
+            PRIORITY_NEW,
+            RateGovernor,
+        )
+
+        governor = RateGovernor(rpm=600, tpm=1_000_000)
+        governor._requests = 0.0
+        order = []
+
+        async def call(name, priority):
+            await governor.acquire(1, priority)
+            order.append(name)
+
+        new = asyncio.create_task(call("new", PRIORITY_NEW))
+        await asyncio.sleep(0)
+        started = asyncio.create_task(call("started", PRIORITY_IN_PROGRESS))
+        await asyncio.gather(new, started)
+
+        assert order == ["started", "new"]
+
+    @pytest.mark.asyncio
+    async def test_rate_lowered_while_waiting_does_not_block_queue(self):
+        """A waiting call is clamped to the capacity left after a decrease."""
+        from src.tools.rate_governor import RateGovernor
+
+        governor = RateGovernor(rpm=600, tpm=6000, min_factor=0.5)
+        governor._tokens = 3000.0
+        waiting = asyncio.create_task(governor.acquire(6000))  # ~30s to refill
+        await asyncio.sleep(0.01)
+        governor.record_throttled()  # Bucket capacity is now 3000 tokens
+
+        await asyncio.wait_for(waiting, timeout=1.0)
+        assert governor.stats()["queue_depth"] == 0
+
+    def test_aimd_on_rate_limit(self):
+        """A burst of 429s halves the rate once; successes restore it slowly."""
+        from src.tools.rate_governor import RateGovernor, is_rate_limited
+
+        governor = RateGovernor(rpm=100, tpm=1000, increase=0.1)
+        for _ in range(3):
+            governor.record_throttled()
+        assert governor.rate_factor == 0.5
+        assert governor.stats()["throttled"] == 3
+
+        governor.record_success()
+        assert governor.rate_factor == pytest.approx(0.6)
+        assert is_rate_limited(Exception("429 RESOURCE_EXHAUSTED. quota"))
+        assert not is_rate_limited(Exception("503 UNAVAILABLE"))
+
+
+class TestLlmRetry:
+    """Test cases for classified, deadline-aware LLM retries."""
+
+    @staticmethod
+    def api_error(code, status):
+        from google.genai import errors
+
+        cls = errors.ServerError if code >= 500 else errors.ClientError
+        return cls(code, {"error": {"code": code, "message": "x", "status": status}})
+
+    def test_classify_error(self):
+        """Errors are sorted into rate limit, transient, empty and hard classes."""
+        import httpx
+        from src.tools import llm_retry
+
+        classify = llm_retry.classify_error
+        assert classify(self.api_error(429, "RESOURCE_EXHAUSTED")) == "rate_limit"
+        assert classify(self.api_error(503, "UNAVAILABLE")) == "transient"
+        assert classify(httpx.ConnectError("reset")) == "transient"
+        assert classify(llm_retry.EmptyResponseError("empty")) == "empty_response"
+        assert classify(self.api_error(400, "INVALID_ARGUMENT")) == "hard_failure"
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self):
+        """A 503 followed by success returns the result."""
+        from src.tools.llm_retry import call_with_retries
+
+        attempt = AsyncMock(side_effect=[self.api_error(503, "UNAVAILABLE"), "ok"])
+
+        assert await call_with_retries(attempt, base_delay=0.001) == "ok"
+        assert attempt.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_hard_failures_are_not_retried(self):
+        """A 400 is raised after a single attempt."""
+        from google.genai import errors
+        from src.tools.llm_retry import call_with_retries
+
+        attempt = AsyncMock(side_effect=self.api_error(400, "INVALID_ARGUMENT"))
+
+        with pytest.raises(errors.ClientError):
+            await call_with_retries(attempt, base_delay=0.001)
+        assert attempt.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_no_retry_past_run_deadline(self):
+        """A backoff longer than the run's remaining budget is not waited."""
+        from src.tools.llm_retry import (
+            EmptyResponseError,
+            call_with_retries,
+            get_retry_stats,
+        )
+        from src.utils.run_context import run_scope
+
+        attempt = AsyncMock(side_effect=EmptyResponseError("empty"))
+        gave_up = get_retry_stats().stats()["gave_up_deadline"]
+
+        with run_scope("run", time_budget=0.05), patch(
+            "src.tools.llm_retry.backoff_delay", return_value=5.0
+        ):
+            with pytest.raises(EmptyResponseError):
+                await call_with_retries(attempt)
+
+        assert attempt.await_count == 1
+        assert get_retry_stats().stats()["gave_up_deadline"] == gave_up + 1
+
+
+class TestStreaming:
+    """Test cases for streamed generation."""
+
+    @staticmethod
+    def chunk(text, tokens=None):
+        chunk = MagicMock(text=text)
+        chunk.usage_metadata = MagicMock(total_token_count=tokens) if tokens else None
+        return chunk
+
+    @pytest.mark.asyncio
+    async def test_stream_retries_before_first_chunk(self):
+        """A 503 before any chunk is retried; chunks are yielded in order."""
+        from google.genai import errors, types
+        from src.tools.gemini_client import GeminiClient
+
+        async def chunks():
+            for part in ["", "Hello", " world"]:
+                yield self.chunk(part)
+
+        client = GeminiClient.__new__(GeminiClient)
+        client.model_name = "gemini-test"
+        client.base_config = types.GenerateContentConfig(temperature=0.7)
+        client._config_fields = set(types.GenerateContentConfig.model_fields)
+        client.client = MagicMock()
+        client.client.aio.models.generate_content_stream = AsyncMock(
+            side_effect=[
+                errors.ServerError(503, {"error": {"status": "UNAVAILABLE"}}),
+                chunks(),
+            ]
+        )
+
+        with patch("src.tools.llm_retry.backoff_delay", return_value=0.0):
+            parts = [text async for text in client.generate_content_stream("p")]
+
+        assert parts == ["Hello", " world"]
+
+    @pytest.mark.asyncio
+    async def test_streamed_run_reports_nodes_and_tokens(self):
+        """Streamed runs emit node transitions and the generate node's tokens."""
+        from typing import TypedDict
+        from langgraph.graph import StateGraph, END
+        from src.agents.graph import BlogGenerationGraph
+        from src.agents.nodes.generate_blog import _generate_draft
+        from src.utils.run_context import run_scope
+
+        class DraftState(TypedDict):
+            draft_blog: str
+
+        async def stream(prompt, **overrides):
+            for text in ["<h1>", "Title", "</h1>"]:
+                yield text
+
+        gemini = MagicMock()
+        gemini.generate_content_stream = stream
+
+        async def generate(state):
+            return {"draft_blog": await _generate_draft(gemini, "prompt", 1)}
+
+        workflow = StateGraph(DraftState)
+        workflow.add_node("generate", generate)
+        workflow.set_entry_point("generate")
+        workflow.add_edge("generate", END)
+        graph = BlogGenerationGraph()
+        graph.app = workflow.compile(checkpointer=EnhancedMemorySaver())
+        events = []
+
+        with run_scope("run-stream", stream_tokens=True):
+            result = await graph._invoke_with_resume(
+                {"draft_blog": ""},
+                {"configurable": {"thread_id": "run-stream"}},
+                {},
+                lambda name, data: events.append((name, data)),
+            )
+
+        assert result["draft_blog"] == "<h1>Title</h1>"
+        assert events[0] == ("node", {"node": "generate", "status": "started"})
+        tokens = [data["text"] for name, data in events if name == "token"]
+        assert tokens == ["<h1>", "Title", "</h1>"]
+        assert events[-1] == ("node", {"node": "generate", "status": "completed"})
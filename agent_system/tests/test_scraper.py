@@ -0,0 +1,781 @@
+"""Test cases for the scraping tools."""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from playwright.async_api import Error as PlaywrightError
+
+import src.tools.clean_pool as clean_pool_module
+import src.tools.extraction as extraction_module
+import src.tools.scraper as scraper_module
+from src.tools.browser_pool import BrowserPool
+from src.tools.clean_pool import CleanPool, clean_html_off_loop
+from src.tools.domain_scheduler import DomainScheduler
+from src.tools.failure_tracker import FailureTracker
+from src.tools.page_readiness import ReadinessPolicy
+from src.tools.request_blocking import (
+    CHROMIUM_BLOCKING_ARGS,
+    RequestBlocker,
+    build_block_pattern,
+)
+from src.tools.extraction import clean_html_content
+from src.tools.html_cache import HtmlCache, canonical_url
+from src.tools.html_capture import capture_html, get_capture_stats
+from src.tools.http_fetcher import (
+    BOT_WALL_PATTERN,
+    FetchResult,
+    FetchTierPolicy,
+    looks_like_js_shell,
+)
+from src.tools.scraper import PlaywrightScraper
+
+
+class FakeContext:
+    """Minimal stand-in for a Playwright BrowserContext."""
+
+    def __init__(self, user_agent):
+        self.user_agent = user_agent
+        self.routes = []
+        self.pages = 0
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def new_page(self):
+        self.pages += 1
+        return object()
+
+
+class FakeBrowser:
+    """Minimal stand-in for a Playwright Browser."""
+
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.pages = 0
+        self.contexts = []
+
+    async def new_context(self, user_agent, viewport):
+        context = FakeContext(user_agent)
+        self.contexts.append(context)
+        return context
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_page(self, **kwargs):
+        self.pages += 1
+        return object()
+
+    async def close(self):
+        self.closed = True
+        self.connected = False
+
+
+class FakePlaywright:
+    """Fake Playwright driver whose chromium launches FakeBrowsers."""
+
+    def __init__(self):
+        self.launched = []
+        self.chromium = self
+
+    async def launch(self, headless=True, args=None):
+        self.args = args
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+    async def stop(self):
+        pass
+
+
+@pytest.fixture
+def fake_pool():
+    pool = BrowserPool(max_pages=2, health_check_interval=0)
+    pool._playwright = FakePlaywright()
+    return pool
+
+
+class TestBrowserPool:
+    """Test cases for the shared browser pool."""
+
+    @pytest.mark.asyncio
+    async def test_browser_reused_across_leases(self, fake_pool):
+        """Consecutive runs share one warm browser."""
+        async with fake_pool.lease() as lease:
+            await lease.new_page()
+        async with fake_pool.lease() as lease:
+            pass
+
+        assert len(fake_pool._playwright.launched) == 1
+        assert fake_pool.stats()["leases"] == 2
+
+    @pytest.mark.asyncio
+    async def test_browser_recycled_after_max_pages(self, fake_pool):
+        """A browser past max_pages is closed once its lease is returned."""
+        async with fake_pool.lease() as lease:
+            await lease.new_page()
+            await lease.new_page()
+            first = lease.browser
+            assert not first.closed
+
+        assert first.closed
+        async with fake_pool.lease() as lease:
+            assert lease.browser is not first
+        assert fake_pool.stats()["recycle_reasons"] == {"max_pages": 1}
+
+    @pytest.mark.asyncio
+    async def test_disconnected_browser_relaunched(self, fake_pool):
+        """A crashed browser is replaced on the next lease."""
+        async with fake_pool.lease() as lease:
+            first = lease.browser
+        first.connected = False
+
+        async with fake_pool.lease() as lease:
+            assert lease.browser is not first
+        assert len(fake_pool._playwright.launched) == 2
+
+    @pytest.mark.asyncio
+    async def test_contexts_shared_per_user_agent(self, fake_pool):
+        """Pages reuse one context per user agent with blocking installed once."""
+        fake_pool.blocker = RequestBlocker()
+        fake_pool.max_pages = 10
+        async with fake_pool.lease() as lease:
+            await lease.new_context_page("ua-1")
+            await lease.new_context_page("ua-1")
+            await lease.new_context_page("ua-2")
+            contexts = lease.browser.contexts
+
+        assert [c.user_agent for c in contexts] == ["ua-1", "ua-2"]
+        assert [len(c.routes) for c in contexts] == [1, 1]
+        assert fake_pool._playwright.args == list(CHROMIUM_BLOCKING_ARGS)
+        assert contexts[0].pages == 2
+        assert fake_pool.stats()["pages_served"] == 3
+
+    @pytest.mark.asyncio
+    async def test_stop_closes_browsers(self, fake_pool):
+        """Stopping the pool closes the current browser."""
+        async with fake_pool.lease() as lease:
+            browser = lease.browser
+        await fake_pool.stop()
+
+        assert browser.closed
+        assert not fake_pool.started
+
+
+def article_html(paragraphs: int = 6, words_per_paragraph: int = 60) -> str:
+    """Build a server-rendered article page."""
+    body = "".join(
+        "<p>" + " ".join(f"word{i}_{j}" for j in range(words_per_paragraph)) + "</p>"
+        for i in range(paragraphs)
+    )
+    return (
+        "<html><head><title>Server Rendered Article</title></head>"
+        f"<body><h1>Heading</h1>{body}</body></html>"
+    )
+
+
+class TestTieredFetch:
+    """Test cases for the static-first fetch tier."""
+
+    def test_js_shell_detection(self):
+        """Empty SPA mount points are detected, articles are not."""
+        shell = '<html><body><div id="root"></div><script src="app.js"></script></body></html>'
+        assert looks_like_js_shell(shell)
+        assert not looks_like_js_shell(article_html())
+
+    def test_policy_learns_browser_first_domains(self):
+        """Domains whose static pages keep failing skip the static tier."""
+        policy = FetchTierPolicy(min_samples=2, reprobe_every=3)
+        url = "https://www.spa.example/post"
+        policy.record(url, "browser", "js_shell")
+        policy.record(url, "browser", "js_shell")
+
+        decisions = [policy.should_try_static(url) for _ in range(3)]
+        assert decisions == [False, False, True]
+        assert policy.should_try_static("https://blog.example/post")
+
+    @pytest.mark.asyncio
+    async def test_static_page_skips_browser(self, monkeypatch):
+        """Server-rendered pages never lease a browser."""
+        fetcher = AsyncMock()
+        fetcher.fetch_conditional.return_value = FetchResult(html=article_html())
+        monkeypatch.setattr(
+            scraper_module, "get_static_fetcher", AsyncMock(return_value=fetcher)
+        )
+        monkeypatch.setattr(
+            scraper_module, "get_tier_policy", AsyncMock(return_value=FetchTierPolicy())
+        )
+        get_browser = AsyncMock()
+
+        scraper = PlaywrightScraper()
+        url, html, tier = await scraper._fetch_tiered(
+            get_browser, "https://blog.example/a", "ua"
+        )
+
+        assert tier == "static"
+        assert html == article_html()
+        get_browser.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_js_shell_escalates_to_browser(self, monkeypatch):
+        """JS shells are re-fetched with Playwright and the decision recorded."""
+        fetcher = AsyncMock()
+        fetcher.fetch_conditional.return_value = FetchResult(
+            html='<html><body><div id="__next"></div></body></html>'
+        )
+        policy = FetchTierPolicy()
+        monkeypatch.setattr(
+            scraper_module, "get_static_fetcher", AsyncMock(return_value=fetcher)
+        )
+        monkeypatch.setattr(
+            scraper_module, "get_tier_policy", AsyncMock(return_value=policy)
+        )
+
+        scraper = PlaywrightScraper()
+        scraper._fetch = AsyncMock(
+            return_value=("https://spa.example/a", "<html>rendered</html>")
+        )
+        url, html, tier = await scraper._fetch_tiered(
+            AsyncMock(), "https://spa.example/a", "ua"
+        )
+
+        assert tier == "browser"
+        assert html == "<html>rendered</html>"
+        assert policy.decisions[-1]["reason"] == "js_shell"
+
+    @pytest.mark.asyncio
+    async def test_chunked_page_read_in_full(self):
+        """Chunked bodies larger than one read buffer are not cut off."""
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+        from src.tools.http_fetcher import StaticFetcher
+
+        page = article_html() + "<!--" + "x" * 100_000 + "-->"
+
+        async def handler(request):
+            resp = web.StreamResponse(headers={"Content-Type": "text/html"})
+            resp.enable_chunked_encoding()
+            await resp.prepare(request)
+            for i in range(0, len(page), 5000):
+                await resp.write(page[i : i + 5000].encode())
+                await asyncio.sleep(0)
+            await resp.write_eof()
+            return resp
+
+        app = web.Application()
+        app.router.add_get("/post", handler)
+        async with TestServer(app) as server:
+            fetcher = StaticFetcher()
+            full = await fetcher.fetch(str(server.make_url("/post")), "ua")
+            fetcher.max_bytes = 1000
+            capped = await fetcher.fetch(str(server.make_url("/post")), "ua")
+            await fetcher.close()
+
+        assert full == page
+        assert len(capped) == 1000
+
+
+class TestDomainScheduler:
+    """Test cases for per-domain politeness limits."""
+
+    @pytest.mark.asyncio
+    async def test_domain_concurrency_capped_other_domains_parallel(self):
+        """A busy domain queues while other domains are fetched immediately."""
+        scheduler = DomainScheduler(max_per_domain=1, min_interval=0)
+        release = asyncio.Event()
+        active = []
+        peak = 0
+
+        async def fetch(url):
+            nonlocal peak
+            async with scheduler.slot(url):
+                if "busy" in url:
+                    active.append(url)
+                    peak = max(peak, len(active))
+                    await release.wait()
+                    active.remove(url)
+
+        busy = [
+            asyncio.create_task(fetch(f"https://busy.example/{i}")) for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()["domains"]["busy.example"]["queued"] == 2
+
+        await asyncio.wait_for(fetch("https://other.example/a"), timeout=1)
+        release.set()
+        await asyncio.gather(*busy)
+        assert peak == 1
+        assert scheduler.stats()["queued_total"] == 0
+
+    @pytest.mark.asyncio
+    async def test_min_interval_spaces_same_domain_requests(self):
+        """Fetch starts on one domain are at least min_interval apart."""
+        scheduler = DomainScheduler(max_per_domain=5, min_interval=0.05)
+        starts = []
+
+        async def fetch(url):
+            async with scheduler.slot(url):
+                starts.append(time.monotonic())
+
+        await asyncio.gather(
+            *(fetch(f"https://www.blog.example/{i}") for i in range(3))
+        )
+
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert all(gap >= 0.045 for gap in gaps)
+        assert scheduler.stats()["domains"]["blog.example"]["fetches"] == 3
+
+
+class TestFailureTracker:
+    """Test cases for the failure negative cache and domain breaker."""
+
+    def test_failing_domain_skipped_with_exponential_cooldown(self, monkeypatch):
+        """A domain trips after repeated failures and cools down exponentially."""
+        now = [1000.0]
+        monkeypatch.setattr("src.tools.failure_tracker.time.monotonic", lambda: now[0])
+        tracker = FailureTracker(base_cooldown=10, domain_threshold=2)
+
+        tracker.record_failure("https://slow.example/a", "timeout")
+        assert tracker.skip_reason("https://slow.example/a") == "url_cooldown:timeout"
+        assert tracker.skip_reason("https://slow.example/b") is None
+
+        tracker.record_failure("https://slow.example/b", "http_503")
+        to_fetch, skipped = tracker.triage(
+            ["https://slow.example/c", "https://ok.example/a"]
+        )
+        assert to_fetch == ["https://ok.example/a"]
+        assert skipped == {"https://slow.example/c": "domain_cooldown:http_503"}
+
+        now[0] += 11
+        assert tracker.skip_reason("https://slow.example/c") is None
+        tracker.record_failure("https://slow.example/c", "timeout")
+        now[0] += 11
+        assert tracker.skip_reason("https://slow.example/d") is not None
+
+        tracker.record_success("https://slow.example/d")
+        assert tracker.skip_reason("https://slow.example/d") is None
+
+    def test_domains_with_failures_deprioritized(self):
+        """URLs on domains with recent failures are fetched after healthy ones."""
+        tracker = FailureTracker(base_cooldown=10, domain_threshold=5)
+        tracker.record_failure("https://flaky.example/a", "timeout")
+
+        to_fetch, skipped = tracker.triage(
+            ["https://flaky.example/b", "https://ok.example/a", "https://ok.example/b"]
+        )
+        assert to_fetch == [
+            "https://ok.example/a",
+            "https://ok.example/b",
+            "https://flaky.example/b",
+        ]
+        assert skipped == {}
+
+    @pytest.mark.asyncio
+    async def test_cooling_down_urls_not_fetched(self):
+        """Skipped URLs are reported without HTML and never reach the fetcher."""
+        tracker = FailureTracker(domain_threshold=1)
+        tracker.record_failure("https://down.example/a", "timeout")
+        scraper = PlaywrightScraper(failures=tracker)
+        scraper._fetch_tiered = AsyncMock(
+            return_value=("https://up.example/a", "<html></html>", "static")
+        )
+
+        result = await scraper.scrape_multiple(
+            ["https://down.example/b", "https://up.example/a"]
+        )
+
+        assert result == {
+            "https://down.example/b": None,
+            "https://up.example/a": "<html></html>",
+        }
+        scraper._fetch_tiered.assert_awaited_once()
+
+
+class FakePage:
+    """Page whose content probe reports a fixed text length and paragraph count."""
+
+    def __init__(self, probe=(2000, 6), navigations=0):
+        self.probe = probe
+        self.navigations = navigations
+        self.goto_wait_until = []
+        self.load_states = []
+
+    async def goto(self, url, wait_until, timeout):
+        self.goto_wait_until.append(wait_until)
+        return None
+
+    async def evaluate(self, script):
+        if self.navigations:
+            self.navigations -= 1
+            raise PlaywrightError(
+                "Execution context was destroyed, most likely because of a navigation"
+            )
+        return list(self.probe)
+
+    async def wait_for_load_state(self, state, timeout):
+        self.load_states.append(state)
+
+
+class TestHtmlCapture:
+    """Test cases for size-capped HTML capture."""
+
+    @pytest.mark.asyncio
+    async def test_stripped_capture_reports_truncation(self):
+        """Stripped capture serializes in the page and counts truncated pages."""
+        page = AsyncMock()
+        page.evaluate.return_value = {
+            "html": "<html>cut",
+            "truncated": True,
+            "botWall": False,
+        }
+        before = get_capture_stats().stats()["truncated"]
+
+        captured = await capture_html(page, "stripped", 1024)
+
+        assert (captured.html, captured.truncated) == ("<html>cut", True)
+        assert page.evaluate.await_args.args[1]["maxBytes"] == 1024
+        page.content.assert_not_called()
+        assert get_capture_stats().stats()["truncated"] == before + 1
+
+    @pytest.mark.asyncio
+    async def test_bot_wall_detected_before_scripts_are_stripped(self):
+        """JS challenges are caught on the page as loaded, in both modes."""
+        challenge = (
+            "<html><head><title>Checking your browser</title></head><body>"
+            '<script src="/cdn-cgi/challenge-platform/h/b/orchestrate/v1"></script>'
+            "</body></html>"
+        )
+        page = AsyncMock()
+        page.content.return_value = challenge
+        page.evaluate.return_value = {
+            "html": "<html><head><title>Checking your browser</title></head></html>",
+            "truncated": False,
+            "botWall": True,
+        }
+
+        stripped = await capture_html(page, "stripped", 1024)
+        full = await capture_html(page, "full", 1024)
+
+        assert stripped.bot_wall and full.bot_wall
+        assert page.evaluate.await_args.args[1]["botWallPattern"] == BOT_WALL_PATTERN
+
+        scraper = PlaywrightScraper()
+        scraper._navigate = AsyncMock(return_value=None)
+        scraper._record_failure = Mock()
+        browser = AsyncMock()
+        browser.new_context_page.return_value = page
+
+        url = "https://protected.example/a"
+        assert await scraper._fetch(browser, url, "ua") == (url, None)
+        scraper._record_failure.assert_called_once_with(url, "bot_wall")
+
+
+class FakeRoute:
+    """Intercepted request that records whether it was aborted."""
+
+    class _Frame:
+        parent_frame = None
+
+    def __init__(self, resource_type, url="https://www.googletagmanager.com/gtm.js"):
+        self.request = type(
+            "Request",
+            (),
+            {"resource_type": resource_type, "url": url, "frame": self._Frame()},
+        )()
+        self.outcome = None
+
+    async def abort(self, error_code=None):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+class TestRequestBlocking:
+    """Test cases for the precompiled request blocklist."""
+
+    def test_pattern_matches_ads_trackers_and_media_only(self):
+        """Ad, tracker and media URLs match; article resources do not."""
+        pattern = build_block_pattern()
+        blocked = [
+            "https://securepubads.g.doubleclick.net/tag/js/gpt.js",
+            "https://www.googletagmanager.com/gtm.js?id=GTM-1",
+            "https://blog.example/images/hero.JPG?w=800",
+            "https://fonts.example/inter.woff2",
+            "https://blog.example/static/site.css",
+        ]
+        allowed = [
+            "https://blog.example/2024/fastapi-tutorial",
+            "https://blog.example/static/app.js",
+            "https://notdoubleclick.net.example/post",
+            "https://blog.example/css-tricks-guide",
+        ]
+        assert all(pattern.search(url) for url in blocked)
+        assert not any(pattern.search(url) for url in allowed)
+
+        # Web font providers are blocked by domain; images, fonts and media
+        # without an extension are turned off inside Chromium
+        assert pattern.search("https://fonts.googleapis.com/css2?family=Inter")
+        assert not pattern.search("https://cdn.example/images/hero?w=800&fm=auto")
+        assert "--blink-settings=imagesEnabled=false" in CHROMIUM_BLOCKING_ARGS
+        assert "--disable-remote-fonts" in CHROMIUM_BLOCKING_ARGS
+
+    @pytest.mark.asyncio
+    async def test_allowed_requests_never_reach_python(self):
+        """Only URLs matching the blocklist are routed to the Python handler."""
+        blocker = RequestBlocker()
+        context = FakeContext("ua")
+
+        await blocker.install(context)
+
+        assert context.routes == [(blocker.pattern, blocker._abort)]
+        matcher = context.routes[0][0]
+        for url in (
+            "https://blog.example/2024/fastapi-tutorial",
+            "https://blog.example/static/app.js",
+            "https://cdn.example/images/hero?w=800&fm=auto",
+        ):
+            assert not matcher.search(url)
+
+    @pytest.mark.asyncio
+    async def test_blocked_requests_counted_main_document_allowed(self):
+        """Sub-resources are aborted and counted; the scraped page never is."""
+        blocker = RequestBlocker()
+        script, document = FakeRoute("script"), FakeRoute("document")
+
+        await blocker._abort(script)
+        await blocker._abort(document)
+
+        assert (script.outcome, document.outcome) == ("aborted", "continued")
+        assert blocker.stats() == {
+            "blocked_total": 1,
+            "blocked_by_type": {"script": 1},
+        }
+
+
+class TestPageReadiness:
+    """Test cases for content-based page readiness."""
+
+    @pytest.mark.asyncio
+    async def test_stable_content_skips_networkidle(self):
+        """Pages whose content settles are captured without waiting for idle."""
+        policy = ReadinessPolicy()
+        scraper = PlaywrightScraper(readiness=policy)
+        page = FakePage()
+
+        await scraper._navigate(page, "https://blog.example/a")
+
+        assert page.goto_wait_until == ["domcontentloaded"]
+        assert page.load_states == []
+        assert policy.stats()["latency"]["probe"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_domain_falls_back_to_networkidle(self):
+        """Domains whose content never settles switch to networkidle."""
+        policy = ReadinessPolicy(probe_timeout=0.01, min_samples=2)
+        scraper = PlaywrightScraper(readiness=policy)
+        pages = [FakePage(probe=(100, 1)) for _ in range(3)]
+
+        for i, page in enumerate(pages):
+            await scraper._navigate(page, f"https://spa.example/{i}")
+
+        assert pages[0].load_states == ["networkidle"]
+        assert pages[2].goto_wait_until == ["networkidle"]
+        assert policy.stats()["networkidle_domains"] == ["spa.example"]
+        assert policy.stats()["latency"]["probe_fallback"]["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_client_side_redirect_keeps_probing(self):
+        """A navigation during the probe neither fails the fetch nor the probe."""
+        redirected = FakePage(navigations=1)
+        looping = FakePage(navigations=1000)
+
+        scraper = PlaywrightScraper(readiness=ReadinessPolicy(probe_timeout=2.0))
+        await scraper._navigate(redirected, "https://blog.example/a")
+        scraper = PlaywrightScraper(readiness=ReadinessPolicy(probe_timeout=0.05))
+        await scraper._navigate(looping, "https://blog.example/b")
+
+        assert redirected.load_states == []
+        assert looping.load_states == ["networkidle"]
+
+
+class TestHtmlCache:
+    """Test cases for the on-disk HTML cache."""
+
+    @pytest.mark.asyncio
+    async def test_roundtrip_by_canonical_url(self, tmp_path):
+        """Pages are found again under trivially different URLs."""
+        cache = HtmlCache(str(tmp_path / "cache.db"))
+        await cache.put("https://Blog.example/a/?utm_source=x", "<p>a</p>", etag='"v1"')
+
+        page = await cache.get("https://blog.example/a#top")
+        assert page.html == "<p>a</p>"
+        assert page.etag == '"v1"'
+        assert page.fresh
+        assert canonical_url("https://blog.example:443/a?b=2&a=1") == (
+            "https://blog.example/a?a=1&b=2"
+        )
+        assert canonical_url(
+            "https://blog.example/a?ref=hn&utm_medium=x&reference=7&refid=3&region=eu"
+        ) == ("https://blog.example/a?reference=7&refid=3&region=eu")
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_keeps_recent_pages(self, tmp_path):
+        """Least recently used pages are evicted once over the size budget."""
+        pages = {f"https://blog.example/{i}": os.urandom(600).hex() for i in range(3)}
+        cache = HtmlCache(str(tmp_path / "cache.db"), max_bytes=2000)
+        for url, html in list(pages.items())[:2]:
+            await cache.put(url, html)
+        await cache.get("https://blog.example/0")
+        await cache.put("https://blog.example/2", pages["https://blog.example/2"])
+
+        assert await cache.get("https://blog.example/1") is None
+        assert (await cache.get("https://blog.example/0")).html == pages[
+            "https://blog.example/0"
+        ]
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_page_revalidated_without_browser(self, tmp_path, monkeypatch):
+        """A 304 on a stale browser-rendered page reuses the cached HTML."""
+        cache = HtmlCache(str(tmp_path / "cache.db"), ttl=0)
+        await cache.put(
+            "https://spa.example/a",
+            "<html>rendered</html>",
+            etag='"v1"',
+            tier="browser",
+        )
+        fetcher = AsyncMock()
+        fetcher.fetch_conditional.return_value = FetchResult(not_modified=True)
+        monkeypatch.setattr(
+            scraper_module, "get_static_fetcher", AsyncMock(return_value=fetcher)
+        )
+
+        scraper = PlaywrightScraper(html_cache=cache)
+        scraper._fetch_tiered = AsyncMock()
+        url, html, tier = await scraper._fetch_cached(
+            AsyncMock(), "https://spa.example/a", "ua"
+        )
+
+        assert (html, tier) == ("<html>rendered</html>", "cache")
+        fetcher.fetch_conditional.assert_awaited_once_with(
+            "https://spa.example/a", "ua", etag='"v1"', last_modified=None
+        )
+        scraper._fetch_tiered.assert_not_called()
+        assert cache.stats()["revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_page_refetched_with_one_request(self, tmp_path, monkeypatch):
+        """A 200 on revalidation is used as is, a thin one goes to the browser."""
+        cache = HtmlCache(str(tmp_path / "cache.db"), ttl=0)
+        for url in ("https://blog.example/a", "https://spa.example/b"):
+            await cache.put(url, "<html>old</html>", etag='"v1"', tier="browser")
+        fetcher = AsyncMock()
+        fetcher.fetch_conditional.side_effect = [
+            FetchResult(html=article_html(), etag='"v2"'),
+            FetchResult(html='<html><body><div id="root"></div></body></html>'),
+        ]
+        monkeypatch.setattr(
+            scraper_module, "get_static_fetcher", AsyncMock(return_value=fetcher)
+        )
+
+        scraper = PlaywrightScraper(html_cache=cache)
+        scraper._fetch = AsyncMock(
+            return_value=("https://spa.example/b", "<html>rendered</html>")
+        )
+        _, html, tier = await scraper._fetch_cached(
+            AsyncMock(), "https://blog.example/a", "ua"
+        )
+        assert (html, tier) == (article_html(), "static")
+        assert (await cache.get("https://blog.example/a")).etag == '"v2"'
+        scraper._fetch.assert_not_called()
+
+        _, html, tier = await scraper._fetch_cached(
+            AsyncMock(), "https://spa.example/b", "ua"
+        )
+        assert (html, tier) == ("<html>rendered</html>", "browser")
+        assert fetcher.fetch_conditional.await_count == 2
+
+
+class TestCleanPool:
+    """Test cases for off-loop HTML cleaning."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["process", "thread"])
+    async def test_pool_matches_inline_cleaning(self, mode):
+        """Cleaning in workers yields exactly the inline result."""
+        html = article_html()
+        pool = CleanPool(mode=mode, workers=1)
+        try:
+            result = await pool.clean(html, "https://blog.example/a")
+        finally:
+            pool.shutdown()
+
+        assert result == clean_html_content(html, "https://blog.example/a")
+        assert pool.stats()["submitted"] == 1
+
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "html"
+FIXTURE_HTML = sorted(FIXTURE_DIR.glob("*.html"))
+
+
+class TestExtractionEngines:
+    """Test cases for the lxml extraction engine."""
+
+    @pytest.mark.parametrize("path", FIXTURE_HTML, ids=lambda p: p.stem)
+    def test_lxml_matches_bs4(self, path):
+        """Both engines extract identical content from the fixture corpus."""
+        html = path.read_text(encoding="utf-8")
+        url = f"https://blog.example/{path.stem}"
+
+        assert clean_html_content(html, url, "lxml") == clean_html_content(
+            html, url, "bs4"
+        )
+
+    @pytest.mark.parametrize(
+        "name, single_parse",
+        [
+            ("static_blog", True),
+            ("unclosed_paragraphs", False),
+            ("block_in_paragraph", False),
+        ],
+    )
+    def test_lxml_reparses_only_malformed_nesting(
+        self, name, single_parse, monkeypatch
+    ):
+        """Only pages libxml2 would nest differently go through html.parser."""
+        reference = Mock(wraps=extraction_module._extract_bs4)
+        monkeypatch.setattr(extraction_module, "_extract_bs4", reference)
+        html = (FIXTURE_DIR / f"{name}.html").read_text(encoding="utf-8")
+
+        clean_html_content(html, f"https://blog.example/{name}", "lxml")
+
+        assert reference.called is not single_parse
+
+    @pytest.mark.asyncio
+    async def test_cleaned_posts_cached_per_extractor_version(
+        self, tmp_path, monkeypatch
+    ):
+        """Unchanged pages are not re-parsed until the extractor version changes."""
+        cache = HtmlCache(str(tmp_path / "cache.db"))
+        pool = CleanPool(mode="inline")
+        pool.clean = AsyncMock(wraps=pool.clean)
+        monkeypatch.setattr(clean_pool_module, "get_html_cache", lambda: cache)
+        monkeypatch.setattr(clean_pool_module, "get_clean_pool", lambda: pool)
+        html, url = article_html(), "https://blog.example/a"
+
+        first = await clean_html_off_loop(html, url)
+        second = await clean_html_off_loop(html, url)
+        assert first == second == clean_html_content(html, url)
+        assert pool.clean.await_count == 1
+
+        monkeypatch.setattr(extraction_module, "EXTRACTOR_VERSION", 999)
+        await clean_html_off_loop(html, url)
+        assert pool.clean.await_count == 2
+        assert cache.stats()["post_hits"] == 1
+        assert cache.stats()["post_misses"] == 2